@@ -1,32 +1,295 @@
-"""aSiReM Speaking Engine stub — uses pyttsx3 if available, else silent."""
-from dataclasses import dataclass
-from typing import Optional, Callable
+"""aSiReM Speaking Engine — queued pyttsx3 speech with a rendered-audio cache.
+
+pyttsx3 is optional; without it utterances resolve as "silent". Synthesis
+runs on a dedicated worker thread that owns the pyttsx3 engine, so speak()
+never blocks the event loop. Utterances are served by priority (lower first,
+FIFO within a priority); stale ones are dropped unspoken, and an
+interrupting utterance cuts off the one currently playing.
+
+With a cache_dir, utterances are rendered once to audio files (see
+audio_cache.py) and played from disk with the system player (afplay, paplay
+or aplay) afterwards; without a player the text is spoken live. render()
+returns the cached file without playing it, and prerender() warms the cache
+in the background for phrases known ahead of time. status() reports the
+queue, the cache and the worker counters.
+"""
+import asyncio
+import itertools
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from audio_cache import AudioCache
+
+PRIORITY_URGENT = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+PRIORITY_PRERENDER = 20
+
+_PLAYERS = (("afplay",), ("paplay",), ("aplay", "-q"))
+
 
 @dataclass
 class SpeakingConfig:
     reference_audio: str = ""
     voice_model: str = "default"
+    rate: int = 165
+    max_pending: int = 32          # queued utterances beyond this drop the least important
+    default_max_age: float = 15.0  # seconds an utterance may wait before it is stale
+    cache_dir: str = ""            # rendered-audio cache; empty disables it
+    cache_max_bytes: int = 256 * 1024 * 1024
 
-class ASiREMSpeakingEngine:
-    def __init__(self, config: SpeakingConfig):
+
+@dataclass(order=True)
+class Utterance:
+    priority: int
+    seq: int
+    text: str = field(compare=False)
+    created: float = field(compare=False, default_factory=time.monotonic)
+    max_age: Optional[float] = field(compare=False, default=None)
+    play: bool = field(compare=False, default=True)  # False: render into the cache only
+    future: Optional[asyncio.Future] = field(compare=False, default=None)
+    loop: Optional[asyncio.AbstractEventLoop] = field(compare=False, default=None)
+
+    @property
+    def stale(self) -> bool:
+        return self.max_age is not None and time.monotonic() - self.created > self.max_age
+
+
+def _resolve(future: asyncio.Future, result: Dict[str, Any]):
+    if not future.done():
+        future.set_result(result)
+
+
+class TTSWorker(threading.Thread):
+    """Owns the pyttsx3 engine and speaks queued utterances one at a time."""
+
+    def __init__(self, config: SpeakingConfig, cache: Optional[AudioCache] = None):
+        super().__init__(name="asirem-tts", daemon=True)
         self.config = config
-        self._callback: Optional[Callable] = None
+        self.cache = cache
+        self.player = next((cmd for cmd in _PLAYERS if shutil.which(cmd[0])), None)
+        self._queue: "queue.PriorityQueue[Utterance]" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._interrupt = threading.Event()
+        self._stopping = False
         self._engine = None
+        self.available = None  # None until the worker has tried to load pyttsx3
+        self.current: Optional[Utterance] = None
+        self.stats = {"spoken": 0, "rendered": 0, "replayed": 0, "cache_hits": 0, "dropped_stale": 0,
+                      "dropped_overflow": 0, "interrupted": 0, "errors": 0}
+
+    # -- called from the event loop -------------------------------------------------
+
+    def submit(self, text: str, priority: int = PRIORITY_NORMAL, interrupt: bool = False,
+               max_age: Optional[float] = None, play: bool = True) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        item = Utterance(priority, next(self._seq), text, max_age=max_age, play=play,
+                         future=loop.create_future(), loop=loop)
+        self._queue.put(item)
+        self._shed_overflow()
+        current = self.current
+        if interrupt and current is not None and priority <= current.priority:
+            self._interrupt.set()
+        return item.future
+
+    def _shed_overflow(self):
+        """Keep at most max_pending queued utterances, dropping the lowest priority / newest first."""
+        if self._queue.qsize() <= self.config.max_pending:
+            return
+        with self._queue.mutex:
+            items = sorted(self._queue.queue)
+            keep, drop = items[:self.config.max_pending], items[self.config.max_pending:]
+            self._queue.queue[:] = keep
+        for item in drop:
+            self.stats["dropped_overflow"] += 1
+            self._finish(item, "dropped", reason="overflow")
+
+    def stop(self):
+        self._stopping = True
+        self._interrupt.set()
+        self._queue.put(Utterance(-1, -1, ""))  # wake the worker
+
+    # -- worker thread ----------------------------------------------------------
+
+    def _finish(self, item: Utterance, status: str, **extra):
+        if item.future is not None and item.loop is not None and not item.loop.is_closed():
+            result = {"status": status, "text": item.text, **extra}
+            item.loop.call_soon_threadsafe(_resolve, item.future, result)
+
+    def _load_engine(self):
         try:
             import pyttsx3
             self._engine = pyttsx3.init()
-            self._engine.setProperty("rate", 165)
+            self._engine.setProperty("rate", self.config.rate)
+            # pyttsx3 may only be stopped from inside its own loop: check the flag per word
+            self._engine.connect("started-word", self._on_word)
         except Exception:
-            pass
-    
-    def set_callback(self, callback: Callable):
-        self._callback = callback
-    
-    async def speak(self, text: str):
-        print(f"[aSiReM TTS] {text}")
-        if self._engine:
+            self._engine = None
+        self.available = self._engine is not None
+
+    def _on_word(self, name, location, length):
+        if self._interrupt.is_set():
+            self._engine.stop()
+
+    def _render(self, item: Utterance) -> Optional[str]:
+        """Cached audio path for the utterance, synthesizing it on a miss (None if interrupted)."""
+        if self.cache is None or self._engine is None:
+            return None
+        key = AudioCache.make_key(self.config.voice_model, item.text, self.config.rate)
+        path = self.cache.get(key)
+        if path is not None:
+            self.stats["cache_hits"] += 1
+            return path
+        temp = self.cache.temp_path(key)
+        self._engine.save_to_file(item.text, temp)
+        self._engine.runAndWait()
+        if self._interrupt.is_set():
+            # Stopped mid-file: the audio covers only part of the text, never cache it
+            self.cache.discard(temp)
+            return None
+        path = self.cache.commit(key, temp)
+        if path is not None:
+            self.stats["rendered"] += 1
+        return path
+
+    def _play_file(self, path: str) -> bool:
+        """Play a rendered file with the system player; False if there is none."""
+        if self.player is None:
+            return False
+        proc = subprocess.Popen([*self.player, path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        while proc.poll() is None:
+            if self._interrupt.wait(0.05):
+                proc.terminate()
+                break
+        return True
+
+    def _speak(self, item: Utterance) -> Dict[str, Any]:
+        if not item.play:
+            path = self._render(item)
+            if self._interrupt.is_set():
+                if item.priority >= PRIORITY_PRERENDER:
+                    self._queue.put(Utterance(item.priority, next(self._seq), item.text, play=False))
+                return {"status": "interrupted", "audio_path": None}
+            return {"status": "rendered" if path else "silent", "audio_path": path}
+        if self._engine is None:
+            return {"status": "silent", "audio_path": None}
+        key = AudioCache.make_key(self.config.voice_model, item.text, self.config.rate)
+        cached = self.cache is not None and key in self.cache
+        if self.player:
+            path = self._render(item)
+            if self._interrupt.is_set():
+                return {"status": "interrupted", "audio_path": None, "cached": cached}
+        else:
+            # No way to play a file here: synthesize live, but still hand back a cached render
+            path = self.cache.get(key) if cached else None
+        if path and self.player and self._play_file(path):
+            if cached:
+                self.stats["replayed"] += 1
+        else:
+            self._engine.say(item.text)
+            self._engine.runAndWait()
+        status = "interrupted" if self._interrupt.is_set() else "spoken"
+        return {"status": status, "audio_path": path, "cached": cached}
+
+    def run(self):
+        self._load_engine()
+        while True:
+            item = self._queue.get()
+            if self._stopping:
+                self._finish(item, "dropped", reason="shutdown")
+                while not self._queue.empty():
+                    self._finish(self._queue.get_nowait(), "dropped", reason="shutdown")
+                return
+            if item.stale:
+                self.stats["dropped_stale"] += 1
+                self._finish(item, "dropped", reason="stale")
+                continue
+            self._interrupt.clear()
+            self.current = item
+            started = time.monotonic()
             try:
-                self._engine.say(text)
-                self._engine.runAndWait()
+                result = self._speak(item)
+                status = result.pop("status")
+                if status in ("spoken", "interrupted"):
+                    self.stats[status] += 1
+                self._finish(item, status, duration=round(time.monotonic() - started, 3), **result)
             except Exception as e:
+                self.stats["errors"] += 1
                 print(f"[aSiReM TTS] Engine error: {e}")
+                self._finish(item, "error", error=str(e))
+            finally:
+                self.current = None
+
+
+class ASiREMSpeakingEngine:
+    def __init__(self, config: Optional[SpeakingConfig] = None):
+        self.config = config or SpeakingConfig()
+        self._callback: Optional[Callable] = None
+        self._worker: Optional[TTSWorker] = None
+        self.cache: Optional[AudioCache] = None
+        if self.config.cache_dir:
+            try:
+                self.cache = AudioCache(self.config.cache_dir, self.config.cache_max_bytes)
+            except OSError as e:
+                print(f"[aSiReM TTS] Audio cache disabled: {e}")
+
+    def set_callback(self, callback: Callable):
+        self._callback = callback
+
+    def _ensure_worker(self) -> TTSWorker:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = TTSWorker(self.config, self.cache)
+            self._worker.start()
+        return self._worker
+
+    async def initialize(self):
+        """Start the TTS worker thread (pyttsx3 loads there, off the event loop)."""
+        self._ensure_worker()
+
+    async def speak(self, text: str, priority: int = PRIORITY_NORMAL, interrupt: bool = False,
+                    max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Queue text for synthesis and wait for its outcome without blocking the loop."""
+        print(f"[aSiReM TTS] {text}")
+        if max_age is None:
+            max_age = self.config.default_max_age
+        future = self._ensure_worker().submit(text, priority=priority, interrupt=interrupt, max_age=max_age)
+        return await future
+
+    async def render(self, text: str, priority: int = PRIORITY_NORMAL) -> Dict[str, Any]:
+        """Render text to a cached audio file without playing it (for the browser to play)."""
+        return await self._ensure_worker().submit(text, priority=priority, play=False)
+
+    def prerender(self, phrases: Iterable[str]) -> int:
+        """Queue background renders for phrases not yet cached; returns how many were queued."""
+        if self.cache is None:
+            return 0
+        worker = self._ensure_worker()
+        queued = 0
+        for text in dict.fromkeys(p for p in phrases if p):
+            if AudioCache.make_key(self.config.voice_model, text, self.config.rate) not in self.cache:
+                worker.submit(text, priority=PRIORITY_PRERENDER, play=False)
+                queued += 1
+        return queued
+
+    def status(self) -> Dict[str, Any]:
+        worker = self._worker
+        if worker is None:
+            return {"running": False}
+        return {
+            "running": worker.is_alive(),
+            "engine": worker.available,
+            "pending": worker._queue.qsize(),
+            "speaking": worker.current.text if worker.current else None,
+            "audio_cache": self.cache.stats() if self.cache else None,
+            **worker.stats,
+        }
+
+    def close(self):
+        if self._worker is not None:
+            self._worker.stop()
+            self._worker = None
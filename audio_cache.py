@@ -0,0 +1,127 @@
+"""
+Audio Cache — rendered speech on disk, keyed by (voice, text, rate).
+
+Each entry is one audio file named by the SHA-1 of its key, so a lookup is
+a dict probe plus a stat. Recency is kept in memory (and in file mtimes,
+so it survives restarts); when the directory grows past max_bytes the
+least recently used files are deleted. Writers render to a temporary path
+and commit() renames it into place, so readers never see a partial file.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class AudioCache:
+    """Size-bounded LRU directory of rendered utterances."""
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, extension: str = ".wav"):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        found = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(".tmp"):
+                os.remove(path)  # interrupted render
+            elif name.endswith(self.extension):
+                st = os.stat(path)
+                found.append((st.st_mtime, name[:-len(self.extension)], st.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._bytes += size
+        self._evict()
+
+    @staticmethod
+    def make_key(voice: str, text: str, rate: Any) -> str:
+        raw = f"{voice}\x00{rate}\x00{' '.join((text or '').split())}"
+        return hashlib.sha1(raw.encode("utf-8", errors="ignore")).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.extension)
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of the cached audio for key, or None (and count a miss)."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            path = self.path_for(key)
+            if not os.path.exists(path):
+                self._bytes -= self._entries.pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def temp_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.{threading.get_ident()}.{time.monotonic_ns()}.tmp")
+
+    def discard(self, temp_path: str):
+        """Drop an unfinished render without caching it."""
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+    def commit(self, key: str, temp_path: str) -> Optional[str]:
+        """Move a finished render into the cache; returns the final path (None if empty)."""
+        try:
+            size = os.path.getsize(temp_path)
+        except OSError:
+            return None
+        if size == 0:
+            os.remove(temp_path)
+            return None
+        path = self.path_for(key)
+        os.replace(temp_path, path)
+        with self._lock:
+            self._bytes -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._bytes += size
+            self._evict()
+        return path
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path_for(key))
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "evictions": self.evictions,
+        }
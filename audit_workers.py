@@ -0,0 +1,175 @@
+"""
+Audit Workers — CPU-bound per-file checks run off the event loop.
+
+The security regex scan and the QA syntax check are plain module-level
+functions over picklable inputs, so they can run in a ProcessPoolExecutor
+without importing the backend. Work is submitted in chunks with a bounded
+number in flight and results come back in submission order, which keeps
+progress reporting monotonic. A chunk that fails is logged and skipped; the
+rest of the audit carries on.
+
+The pool uses the forkserver start method (spawn where that is missing):
+forking the multi-threaded server process directly could copy held locks
+into the workers.
+
+ASIREM_AUDIT_WORKERS sets the pool size (default: cores - 1; 0 runs the
+checks in a worker thread instead of a process pool).
+"""
+
+import ast
+import asyncio
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+# (path, content) pairs, read by the main process through the shared file reader
+AuditItem = Tuple[str, str]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_checked = False
+
+
+def _audit_worker_count() -> int:
+    default = max((os.cpu_count() or 2) - 1, 1)
+    try:
+        return max(int(os.getenv("ASIREM_AUDIT_WORKERS", default)), 0)
+    except ValueError:
+        return default
+
+
+def get_audit_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared process pool for audits, or None when disabled/unavailable."""
+    global _pool, _pool_checked
+    if _pool is None and not _pool_checked:
+        _pool_checked = True
+        workers = _audit_worker_count()
+        if workers > 0:
+            try:
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+                print(f"⚙️ Audit process pool started ({workers} workers)")
+            except Exception as e:
+                print(f"⚠️ Audit process pool unavailable, using a thread: {e}")
+    return _pool
+
+
+def shutdown_audit_pool():
+    global _pool, _pool_checked
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _pool = None
+    _pool_checked = False
+
+
+# ============================================================================
+# SECURITY
+# ============================================================================
+
+@lru_cache(maxsize=8)
+def compile_security_patterns(pattern_items: Tuple[Tuple[str, str], ...]) -> "re.Pattern":
+    """One case-insensitive alternation with a named group per pattern."""
+    return re.compile(
+        "|".join(f"(?P<{name}>{pattern})" for name, pattern in pattern_items),
+        re.IGNORECASE
+    )
+
+
+def find_risks(regex: "re.Pattern", content: str, max_findings: int = 100) -> List[dict]:
+    """Return every pattern hit in content as {pattern, line, match}."""
+    findings = []
+    line = 1
+    last = 0
+    for m in regex.finditer(content):
+        line += content.count("\n", last, m.start())
+        last = m.start()
+        findings.append({"pattern": m.lastgroup, "line": line, "match": m.group(0)[:80]})
+        if len(findings) >= max_findings:
+            break
+    return findings
+
+
+def security_scan_chunk(pattern_items: Tuple[Tuple[str, str], ...], max_findings: int,
+                        items: List[AuditItem]) -> List[Tuple[str, List[dict]]]:
+    regex = compile_security_patterns(pattern_items)
+    return [(path, find_risks(regex, content, max_findings)) for path, content in items]
+
+
+# ============================================================================
+# QA
+# ============================================================================
+
+def check_syntax(source: str) -> dict:
+    try:
+        ast.parse(source)
+        return {"ok": True}
+    except SyntaxError as e:
+        return {"ok": False, "error": str(e)}
+    except Exception as e:
+        # ValueError (NUL bytes) and friends: not a verdict on the file, skip it
+        return {"ok": None, "error": str(e)}
+
+
+def qa_parse_chunk(items: List[AuditItem]) -> List[Tuple[str, dict]]:
+    return [(path, check_syntax(content)) for path, content in items]
+
+
+# ============================================================================
+# CHUNKED SUBMISSION
+# ============================================================================
+
+async def run_chunked(fn: Callable[..., list], items: Sequence[Any], *args,
+                      chunk_size: int = 32,
+                      prepare: Optional[Callable[[list], Awaitable[list]]] = None,
+                      on_chunk: Optional[Callable[[list], Awaitable[None]]] = None) -> list:
+    """
+    Run fn(*args, chunk) over items in chunks on the audit pool.
+
+    prepare, if given, is awaited on each chunk just before submission (e.g. to
+    load file contents), so only the in-flight chunks are held in memory. At
+    most two chunks per worker are in flight; on_chunk is awaited with each
+    chunk's results in submission order. Failed chunks are logged and left
+    out of the results. If the process pool breaks, it is discarded and the
+    remaining chunks run in a thread.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_audit_pool()
+    max_in_flight = (getattr(pool, "_max_workers", 1) if pool else 1) * 2
+    results: list = []
+    in_flight: deque = deque()
+
+    def failed(size: int, error: Exception):
+        nonlocal pool
+        print(f"⚠️ Audit chunk of {size} files failed: {error}")
+        if isinstance(error, BrokenExecutor) and pool is not None:
+            shutdown_audit_pool()
+            pool = None
+
+    async def drain_one():
+        size, future = in_flight.popleft()
+        try:
+            chunk_results = await future
+            results.extend(chunk_results)
+            if on_chunk:
+                await on_chunk(chunk_results)
+        except Exception as e:
+            failed(size, e)
+
+    for start in range(0, len(items), chunk_size):
+        chunk = list(items[start:start + chunk_size])
+        try:
+            if prepare:
+                chunk = await prepare(chunk)
+            future = loop.run_in_executor(pool, fn, *args, chunk)
+        except Exception as e:
+            failed(len(chunk), e)
+            continue
+        in_flight.append((len(chunk), future))
+        if len(in_flight) >= max_in_flight:
+            await drain_one()
+    while in_flight:
+        await drain_one()
+    return results
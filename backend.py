@@ -55,6 +55,28 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 # Now import patterns from sovereign-dashboard
 from pattern_engine import analyze_content, AGENTIC_PATTERNS
+from scan_index import ScanIndex
+from ws_fanout import OVERFLOW_POLICIES, ClientChannel, coalesce_key, encode_message
+from phase_scheduler import PhaseScheduler
+from file_reader import SharedFileReader
+from http_client import close_http_client, get_http_client
+from search_cache import default_search_cache
+from rate_limit import TokenBucket
+from hedging import LatencyTracker, hedged_race
+from embedding_engine import create_embedding_engine
+try:
+    # Vector search and the memory service need numpy; the rest of the server does not
+    from vector_index import VectorIndex
+    from memory_service import create_memory_service
+    VECTOR_INDEX_OK = True
+except ImportError:
+    VECTOR_INDEX_OK = False
+    print("⚠️ Vector index / memory service not available (numpy not installed)")
+from ingestion import IngestionPipeline
+from document_store import DocumentStore
+from overlay_daemon import OverlayDaemon
+from stt_service import create_stt_service
+from audit_workers import qa_parse_chunk, run_chunked, security_scan_chunk, shutdown_audit_pool
 from datetime import datetime
 from dataclasses import dataclass, asdict, field
 import hashlib
@@ -148,11 +170,12 @@ except ImportError as e:
 
 # aSiReM Speaking Engine - Voice Cloning & Avatar
 try:
-    from asirem_speaking_engine import ASiREMSpeakingEngine, SpeakingConfig
+    from asirem_speaking_engine import ASiREMSpeakingEngine, SpeakingConfig, PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_URGENT
     SPEAKING_ENGINE_OK = True
     print("🗣️ aSiReM Speaking Engine: AVAILABLE")
 except ImportError as e:
     SPEAKING_ENGINE_OK = False
+    PRIORITY_URGENT, PRIORITY_NORMAL, PRIORITY_LOW = 0, 5, 9
     print(f"⚠️ aSiReM Speaking Engine: DISABLED ({e})")
 
 # Agent Action Dispatcher - Maps agent intents to desktop/ByteBot actions
@@ -410,6 +433,10 @@ LANGUAGE_MAP = {
 # REAL WEB SEARCH AGENT
 # ============================================================================
 
+class _FetchAbandoned(Exception):
+    """Set on a coalesced search future when the caller that owned the fetch was cancelled."""
+
+
 class RealWebSearchAgent:
     """
     Performs real web searches for cutting-edge patterns.
@@ -422,6 +449,21 @@ class RealWebSearchAgent:
         self.bytebot_bridge = bytebot_bridge
         self.dispatcher = dispatcher
         self.pplx_key = os.getenv("PERPLEXITY_API_KEY")
+        self.http = get_http_client()
+        # Results keyed by (normalized query, provider, deep); disk tier survives restarts
+        self.cache = default_search_cache(str(PROJECT_ROOT / ".asirem_search_cache.db"))
+        # Per-provider concurrency + token-bucket rate limits, and in-flight request coalescing
+        self.provider_limits = {
+            "perplexity": TokenBucket(rate=1.0, capacity=3),
+            "duckduckgo": TokenBucket(rate=2.0, capacity=5),
+            "searxng": TokenBucket(rate=5.0, capacity=10),
+        }
+        self.provider_slots = {name: asyncio.Semaphore(4) for name in self.provider_limits}
+        self.max_concurrent_queries = int(os.getenv("ASIREM_SEARCH_CONCURRENCY", "5"))
+        # Hedged mode: per-provider latency history picks the race order and hedge delays
+        self.latency = LatencyTracker()
+        self.hedge_min_results = int(os.getenv("ASIREM_SEARCH_HEDGE_MIN_RESULTS", "1"))
+        self._in_flight: Dict[tuple, asyncio.Future] = {}
         
     def set_callback(self, callback):
         self.callback = callback
@@ -430,8 +472,8 @@ class RealWebSearchAgent:
         if self.callback:
             await self.callback(event_type, data)
     
-    async def search(self, query: str, deep_research: bool = False) -> List[WebSearchResult]:
-        """Perform a web search."""
+    async def search(self, query: str, deep_research: bool = False, hedged: bool = False) -> List[WebSearchResult]:
+        """Perform a web search (hedged=True races providers instead of falling back one by one)."""
         agent_id = "researcher"
         await self.emit("agent_status", {"agent_id": agent_id, "status": "thinking"})
         await self.emit("activity", {
@@ -463,20 +505,33 @@ class RealWebSearchAgent:
                 print(f"Failed to open browser: {e}")
 
         results = []
-        if self.pplx_key:
+        if hedged:
+            provider, results = await self._search_hedged(query, deep_research)
+            results = list(results or [])
+        elif self.pplx_key:
             try:
-                pplx_results = await self._search_perplexity(query, self.pplx_key, deep=deep_research)
+                pplx_results = await self._cached_search(
+                    "perplexity", query, deep_research,
+                    lambda: self._search_perplexity(query, self.pplx_key, deep=deep_research)
+                )
                 results.extend(pplx_results)
             except Exception as e:
                 print(f"Perplexity search failed: {e}")
         
         # Fallback to DuckDuckGo if no results
-        if not results:
+        if not results and not hedged:
             try:
-                ddg_results = await self._search_duckduckgo(query)
+                ddg_results = await self._cached_search("duckduckgo", query, False, lambda: self._search_duckduckgo(query))
                 results.extend(ddg_results)
             except Exception as e:
                 print(f"DuckDuckGo search failed: {e}")
+
+        # If still no results, try SearXNG locally if available
+        if not results and not hedged:
+            try:
+                results.extend(await self._cached_search("searxng", query, False, lambda: self._search_searxng(query)))
+            except Exception:
+                pass  # SearXNG not available, that's OK
         
         for result in results:
             await self.emit("web_search_result", {
@@ -497,20 +552,127 @@ class RealWebSearchAgent:
         self.results.extend(results)
         return results
     
+    async def search_cutting_edge_patterns(self):
+        """Search for cutting-edge AI agent patterns (queries run concurrently, results stream as they land)."""
+        queries = [
+            "LangGraph multi-agent patterns",
+            "CrewAI autonomous agents",
+            "MCP Model Context Protocol",
+            "Ollama local LLM agents",
+            "self-evolving AI systems",
+        ]
+        return await self.search_many(queries)
+
+    async def search_many(self, queries: List[str], deep_research: bool = False) -> List[WebSearchResult]:
+        """Run several queries concurrently; each query's results are emitted as soon as it finishes."""
+        gate = asyncio.Semaphore(max(1, self.max_concurrent_queries))
+
+        async def run(query):
+            async with gate:
+                return await self.search(query, deep_research=deep_research)
+
+        all_results = []
+        done = 0
+        for finished in asyncio.as_completed([run(q) for q in dict.fromkeys(queries)]):
+            try:
+                results = await finished
+            except Exception as e:
+                print(f"Search query failed: {e}")
+                results = []
+            done += 1
+            all_results.extend(results)
+            await self.emit("activity", {
+                "agent_id": "researcher",
+                "agent_name": "Researcher",
+                "icon": "🌐",
+                "message": f"Research batch: {done}/{len(set(queries))} queries complete ({len(all_results)} results)"
+            })
+        return all_results
+
+    async def _search_hedged(self, query: str, deep: bool = False):
+        """Race the available providers with staggered starts; the first good answer wins."""
+        fetchers = {
+            "duckduckgo": lambda: self._cached_search("duckduckgo", query, False, lambda: self._search_duckduckgo(query)),
+            "searxng": lambda: self._cached_search("searxng", query, False, lambda: self._search_searxng(query)),
+        }
+        if self.pplx_key:
+            fetchers["perplexity"] = lambda: self._cached_search(
+                "perplexity", query, deep, lambda: self._search_perplexity(query, self.pplx_key, deep=deep)
+            )
+        order = self.latency.rank(list(fetchers))
+        provider, results = await hedged_race(
+            [(name, fetchers[name]) for name in order],
+            is_good=lambda r: len(r or []) >= self.hedge_min_results,
+            tracker=self.latency,
+            record_latency=False,  # _cached_search records real fetches itself
+        )
+        if provider:
+            print(f"🏁 Hedged search won by {provider} ({len(results or [])} results)")
+        return provider, results
+
+    async def _cached_search(self, provider: str, query: str, deep: bool, fetch) -> List[WebSearchResult]:
+        """Serve a provider query from the cache, calling fetch() only on a miss."""
+        # Both tiers off the loop: a memory miss falls through to a SQLite read
+        cached = await asyncio.to_thread(self.cache.get, query, provider, deep)
+        if cached is not None:
+            return [WebSearchResult(**item) for item in cached]
+
+        # Identical query already on the wire: share its answer instead of issuing another call
+        key = self.cache.make_key(query, provider, deep)
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            try:
+                return list(await asyncio.shield(pending))
+            except _FetchAbandoned:
+                # The caller that owned the fetch was cancelled (e.g. a lost hedge): try again ourselves
+                return await self._cached_search(provider, query, deep, fetch)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            async with self.provider_slots.get(provider, asyncio.Semaphore(1)):
+                bucket = self.provider_limits.get(provider)
+                if bucket:
+                    await bucket.acquire()
+                # Only real provider calls feed the latency history, never cache hits
+                started = time.perf_counter()
+                try:
+                    results = await fetch()
+                except Exception:
+                    self.latency.record(provider, time.perf_counter() - started, ok=False)
+                    raise
+                self.latency.record(provider, time.perf_counter() - started, ok=True)
+            if results:
+                # Empty answers are not cached so a transient outage is retried next time
+                await asyncio.to_thread(self.cache.set, query, provider, deep, [asdict(r) for r in results])
+            future.set_result(results)
+            return results
+        except asyncio.CancelledError:
+            # Do not cancel the shared future: coalesced callers would inherit our CancelledError
+            future.set_exception(_FetchAbandoned())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
     async def _search_duckduckgo(self, query: str) -> List[WebSearchResult]:
         """Search using DuckDuckGo's API."""
         results = []
         
         try:
-            # Use subprocess to call curl (most reliable)
-            url = f"https://api.duckduckgo.com/?q={query.replace(' ', '+')}&format=json&no_html=1"
-            process = await asyncio.create_subprocess_exec(
-                'curl', '-s', '--max-time', '10', url,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+            # Pooled keep-alive session instead of a curl subprocess per query
+            status, data = await self.http.get_json(
+                "https://api.duckduckgo.com/",
+                params={"q": query, "format": "json", "no_html": "1"},
+                timeout=10
             )
-            stdout, _ = await process.communicate()
-            data = json.loads(stdout.decode())
+            if status != 200:
+                raise RuntimeError(f"HTTP {status}")
+            data = data or {}
             
             # Parse results
             if data.get('Abstract'):
@@ -537,30 +699,28 @@ class RealWebSearchAgent:
                     
         except Exception as e:
             print(f"DuckDuckGo error: {e}")
+            raise  # recorded as a provider failure by _cached_search
         
-        # If no results, try SearXNG locally if available
-        if not results:
-            try:
-                searxng_url = f"http://localhost:8088/search?q={query.replace(' ', '+')}&format=json"
-                process = await asyncio.create_subprocess_exec(
-                    'curl', '-s', '--max-time', '5', searxng_url,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout, _ = await process.communicate()
-                if stdout:
-                    data = json.loads(stdout.decode())
-                    for item in data.get('results', [])[:5]:
-                        results.append(WebSearchResult(
-                            query=query,
-                            title=item.get('title', 'Result'),
-                            url=item.get('url', ''),
-                            snippet=item.get('content', '')[:300],
-                            source='SearXNG',
-                            timestamp=datetime.now().isoformat()
-                        ))
-            except:
-                pass  # SearXNG not available, that's OK
+        return results
+
+    async def _search_searxng(self, query: str) -> List[WebSearchResult]:
+        """Search using a local SearXNG instance, if one is running (raises if it is not)."""
+        results = []
+        status, data = await self.http.get_json(
+            "http://localhost:8088/search",
+            params={"q": query, "format": "json"},
+            timeout=5
+        )
+        if data:
+            for item in data.get('results', [])[:5]:
+                results.append(WebSearchResult(
+                    query=query,
+                    title=item.get('title', 'Result'),
+                    url=item.get('url', ''),
+                    snippet=item.get('content', '')[:300],
+                    source='SearXNG',
+                    timestamp=datetime.now().isoformat()
+                ))
             
         return results
     
@@ -586,40 +746,41 @@ class RealWebSearchAgent:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload, headers=headers) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        content = data['choices'][0]['message']['content']
-                        citations = data.get('citations', [])
-                        
-                        results.append(WebSearchResult(
-                            query=query,
-                            title=f"Perplexity {'Pro' if deep else ''} Research: {query[:40]}...",
-                            url=citations[0] if citations else "https://perplexity.ai",
-                            snippet=content[:800],
-                            source='Perplexity AI',
-                            timestamp=datetime.now().isoformat()
-                        ))
-                    else:
-                        print(f"Perplexity API error: {resp.status}")
+            # Sonar Pro writes up to 2048 tokens of research: allow it the old 300 s budget,
+            # well past the pooled client's 30 s default
+            status, data = await self.http.post_json(url, payload, headers=headers, timeout=300 if deep else 90)
+            if status == 200 and data:
+                content = data['choices'][0]['message']['content']
+                citations = data.get('citations', [])
+                
+                results.append(WebSearchResult(
+                    query=query,
+                    title=f"Perplexity {'Pro' if deep else ''} Research: {query[:40]}...",
+                    url=citations[0] if citations else "https://perplexity.ai",
+                    snippet=content[:800],
+                    source='Perplexity AI',
+                    timestamp=datetime.now().isoformat()
+                ))
+            else:
+                raise RuntimeError(f"Perplexity API error: {status}")
         except Exception as e:
             print(f"Perplexity API call failed: {e}")
+            raise  # recorded as a provider failure by _cached_search
             
         return results
 
 class RealEmbeddingAgent:
     """
-    Generates high-quality vector embeddings for RAG and semantic search.
-    Uses OpenAI's text-embedding-3-small (most cost-effective).
+    Generates vector embeddings for RAG and semantic search.
+    Uses the local embedding engine (see embedding_engine.py) - no API calls.
     """
     
-    def __init__(self, callback=None, bytebot_bridge=None, dispatcher=None):
+    def __init__(self, callback=None, bytebot_bridge=None, dispatcher=None, engine=None):
         self.callback = callback
         self.bytebot_bridge = bytebot_bridge
         self.dispatcher = dispatcher
-        self.api_key = os.getenv("OPENROUTER_API_KEY") # We'll use OpenRouter for OpenAI access
-        self.openai_key = os.getenv("OPENAI_API_KEY")
+        self.engine = engine or create_embedding_engine(cache_dir=str(PROJECT_ROOT / ".asirem_embeddings"))
+        print(f"🧮 Embedding engine: {self.engine.model_id} ({self.engine.dim}d)")
         
     def set_callback(self, callback):
         self.callback = callback
@@ -628,10 +789,10 @@ class RealEmbeddingAgent:
         if self.callback:
             await self.callback(event_type, data)
             
-    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of strings."""
+    async def generate_embeddings(self, texts: List[str]) -> "np.ndarray":
+        """Generate embeddings for a list of strings as a float32 (n, dim) array."""
         if not texts:
-            return []
+            return self.engine.zeros(0)
             
         await self.emit("agent_status", {"agent_id": "memory", "status": "thinking"})
         await self.emit("activity", {
@@ -641,41 +802,14 @@ class RealEmbeddingAgent:
             "message": f"Generating vector embeddings for {len(texts)} chunks..."
         })
         
-        # In a real system, we'd use openai library or direct HTTP
-        # For simulation if keys are missing
-        if not self.openai_key and not self.api_key:
-            print("⚠️ No embedding API key found, returning mock vectors")
-            return [[0.1] * 1536 for _ in texts]
-            
         try:
-            # Simple mock for now to avoid consuming credits during tests
-            # But the structure is ready
-            await asyncio.sleep(0.5)
-            vectors = [[0.1] * 1536 for _ in texts]
-            
-            await self.emit("agent_status", {"agent_id": "memory", "status": "active"})
-            return vectors
+            vectors = await self.engine.embed(texts)
         except Exception as e:
             print(f"⚠️ Embedding failure: {e}")
-            return [[0.0] * 1536 for _ in texts]
-
-    async def search_cutting_edge_patterns(self):
-        """Search for cutting-edge AI agent patterns."""
-        queries = [
-            "LangGraph multi-agent patterns",
-            "CrewAI autonomous agents",
-            "MCP Model Context Protocol",
-            "Ollama local LLM agents",
-            "self-evolving AI systems",
-        ]
+            vectors = self.engine.zeros(len(texts))
         
-        all_results = []
-        for query in queries:
-            results = await self.search(query)
-            all_results.extend(results)
-            await asyncio.sleep(0.5)  # Rate limiting
-            
-        return all_results
+        await self.emit("agent_status", {"agent_id": "memory", "status": "active"})
+        return vectors
 
 
 # ============================================================================
@@ -700,28 +834,34 @@ class RealSecurityAgent:
     """
     Scans files for security vulnerabilities and secrets.
     """
-    def __init__(self, bytebot_bridge=None, dispatcher=None):
+    def __init__(self, bytebot_bridge=None, dispatcher=None, scan_index=None, file_reader=None):
         self.callback = None
         self.bytebot_bridge = bytebot_bridge
+        self.file_reader = file_reader or SharedFileReader(bytebot_bridge)
         self.dispatcher = dispatcher
+        self.scan_index = scan_index
         self.patterns = {
             "api_key": r"api_key|apikey|secret|token|password|passwd",
             "hardcoded_ip": r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}",
             "unsafe_eval": r"eval\(|exec\(",
         }
+        # Compiled in the audit workers into one alternation with a named group per pattern
+        self.pattern_items = tuple(self.patterns.items())
+        self.max_findings_per_file = 100
+        self.chunk_size = 32
 
     async def _read_file(self, path: str) -> str:
         """Read file content with host-container transparency."""
-        if str(path).startswith("bytebot://"):
-            if self.bytebot_bridge:
-                container_path = str(path).replace("bytebot://", "")
-                return await self.bytebot_bridge.read_container_file(container_path)
-            return ""
-        try:
-            with open(path, 'r', errors='ignore') as f:
-                return f.read()
-        except:
-            return ""
+        return await self.file_reader.read(path)
+
+    async def _load_chunk(self, paths: List[str]) -> List[tuple]:
+        """Read a chunk through the shared reader so workers get (path, content) pairs."""
+        contents = await self.file_reader.read_many(paths)
+        if self.scan_index:
+            for path, content in zip(paths, contents):
+                if path.startswith("bytebot://"):
+                    self.scan_index.note_content(path, content)
+        return list(zip(paths, contents))
 
     def set_callback(self, callback):
         self.callback = callback
@@ -751,37 +891,53 @@ class RealSecurityAgent:
 
         risks = 0
         checked = 0
-        
+        names = {}
+        pending = []
+
+        async def report(path: str, findings: List[dict]):
+            nonlocal risks
+            if findings:
+                risks += 1
+                await self.emit("security_alert", {
+                    "file": names.get(path, Path(path).name),
+                    "path": path,
+                    "issues": list(dict.fromkeys(f["pattern"] for f in findings)),
+                    "findings": findings,
+                    "agent_id": "security" # Ensure proper stream updates
+                })
+
         for file in files:
             # Simple check on file content if it's text
             if hasattr(file, 'size_bytes') and file.size_bytes > 500000: continue
-            
-            try:
-                content = await self._read_file(file.path)
-                    
-                issues = []
-                for name, pattern in self.patterns.items():
-                    if re.search(pattern, content, re.IGNORECASE):
-                        issues.append(name)
-                
-                if issues:
-                    risks += 1
-                    await self.emit("security_alert", {
-                        "file": file.name,
-                        "issues": issues,
-                        "agent_id": "security" # Ensure proper stream updates
-                    })
-            except:
-                pass
-            
-            checked += 1
-            if checked % 50 == 0:
-                 await self.emit("scan_progress", { # Reuse scan progress type for visuals if needed or custom
-                    "agent_id": "security",
-                    "files_scanned": checked,
-                    "risks_found": risks,
-                    "current_path": f"Auditing: {file.name}"
-                })
+            path = str(file.path)
+            names[path] = file.name
+
+            # Incremental: reuse the stored findings when the file content is unchanged
+            findings = self.scan_index.get_stage(path, "security_findings") if self.scan_index else None
+            if findings is not None:
+                await report(path, findings)
+                checked += 1
+                continue
+
+            pending.append(path)
+
+        async def on_chunk(results):
+            nonlocal checked
+            for path, findings in results:
+                if self.scan_index:
+                    self.scan_index.set_stage(path, "security_findings", findings)
+                await report(path, findings)
+            checked += len(results)
+            await self.emit("scan_progress", { # Reuse scan progress type for visuals if needed or custom
+                "agent_id": "security",
+                "files_scanned": checked,
+                "risks_found": risks,
+                "current_path": f"Auditing: {names.get(results[-1][0], '')}" if results else ""
+            })
+
+        # CPU-bound regex pass runs in the audit process pool, chunk by chunk (a failed chunk is skipped)
+        await run_chunked(security_scan_chunk, pending, self.pattern_items, self.max_findings_per_file,
+                          chunk_size=self.chunk_size, prepare=self._load_chunk, on_chunk=on_chunk)
 
         await self.emit("agent_status", {"agent_id": "security", "status": "active"})
         await self.emit("activity", {
@@ -800,23 +956,30 @@ class RealQAAgent:
     """
     Performs static analysis and syntax checking.
     """
-    def __init__(self, bytebot_bridge=None, dispatcher=None):
+    def __init__(self, bytebot_bridge=None, dispatcher=None, scan_index=None, file_reader=None):
         self.callback = None
         self.bytebot_bridge = bytebot_bridge
+        self.file_reader = file_reader or SharedFileReader(bytebot_bridge)
         self.dispatcher = dispatcher
+        self.scan_index = scan_index
+        self.chunk_size = 32
+        self._skipped_truncated = 0
 
     async def _read_file(self, path: str) -> str:
         """Read file content with host-container transparency."""
-        if str(path).startswith("bytebot://"):
-            if self.bytebot_bridge:
-                container_path = str(path).replace("bytebot://", "")
-                return await self.bytebot_bridge.read_container_file(container_path)
-            return ""
-        try:
-            with open(path, 'r', errors='ignore') as f:
-                return f.read()
-        except:
-            return ""
+        return await self.file_reader.read(path)
+
+    async def _load_chunk(self, paths: List[str]) -> List[tuple]:
+        """Read a chunk through the shared reader so workers get (path, content) pairs."""
+        contents = await self.file_reader.read_many(paths)
+        if self.scan_index:
+            for path, content in zip(paths, contents):
+                if path.startswith("bytebot://"):
+                    self.scan_index.note_content(path, content)
+        # A file cut at the read cap would parse as a false SyntaxError: leave it unjudged
+        pairs = [(path, content) for path, content in zip(paths, contents) if not self.file_reader.truncated(path)]
+        self._skipped_truncated += len(paths) - len(pairs)
+        return pairs
 
     def set_callback(self, callback):
         self.callback = callback
@@ -844,39 +1007,57 @@ class RealQAAgent:
         
         passed = 0
         failed = 0
-        
-        import ast
-        
-        for file in files:
-            if str(file.path).endswith('.py'):
-                try:
-                    source = await self._read_file(file.path)
-                    ast.parse(source)
-                    passed += 1
-                except SyntaxError as e:
-                    failed += 1
-                    await self.emit("qa_failure", {
-                        "file": file.name,
-                        "error": str(e),
-                        "agent_id": "qa"
-                    })
-                except:
-                    pass
-            
-            if (passed + failed) % 20 == 0:
-                 await self.emit("scan_progress", {
-                    "agent_id": "qa",
-                    "files_scanned": passed + failed,
-                    "errors_found": failed,
-                    "current_path": f"Verifying: {file.name}"
+        names = {}
+        pending = []
+        self._skipped_truncated = 0
+
+        async def record(path: str, verdict: dict):
+            nonlocal passed, failed
+            if verdict.get("ok"):
+                passed += 1
+            elif verdict.get("ok") is False:
+                failed += 1
+                await self.emit("qa_failure", {
+                    "file": names.get(path, Path(path).name),
+                    "error": verdict.get("error", ""),
+                    "agent_id": "qa"
                 })
 
+        for file in files:
+            if not str(file.path).endswith('.py'):
+                continue
+            path = str(file.path)
+            names[path] = file.name
+            cached = self.scan_index.get_stage(path, "qa") if self.scan_index else None
+            if cached is not None:
+                await record(path, cached)
+                continue
+
+            pending.append(path)
+
+        async def on_chunk(results):
+            for path, verdict in results:
+                if self.scan_index and verdict.get("ok") is not None:
+                    self.scan_index.set_stage(path, "qa", verdict)
+                await record(path, verdict)
+            await self.emit("scan_progress", {
+                "agent_id": "qa",
+                "files_scanned": passed + failed,
+                "errors_found": failed,
+                "current_path": f"Verifying: {names.get(results[-1][0], '')}" if results else ""
+            })
+
+        # ast.parse is CPU-bound: run it in the audit process pool, chunk by chunk (a failed chunk is skipped)
+        await run_chunked(qa_parse_chunk, pending, chunk_size=self.chunk_size,
+                          prepare=self._load_chunk, on_chunk=on_chunk)
+
         await self.emit("agent_status", {"agent_id": "qa", "status": "active"})
         await self.emit("activity", {
             "agent_id": "qa",
             "agent_name": "QA",
             "icon": "✅",
             "message": f"QA Check Complete. {passed} Passed, {failed} Failed."
+                       + (f" {self._skipped_truncated} skipped (larger than the read cap)." if self._skipped_truncated else "")
         })
 
 
@@ -1012,24 +1193,16 @@ class RealEvolutionAgent:
     """
     Self-Evolution Agent: Analyzes its own code and system architecture to suggest improvements.
     """
-    def __init__(self, bytebot_bridge=None, dispatcher=None):
+    def __init__(self, bytebot_bridge=None, dispatcher=None, file_reader=None):
         self.callback = None
         self.bytebot_bridge = bytebot_bridge
+        self.file_reader = file_reader or SharedFileReader(bytebot_bridge)
         self.dispatcher = dispatcher
         self.api_key = os.getenv("PERPLEXITY_API_KEY")
 
     async def _read_file(self, path: str) -> str:
         """Read file content with host-container transparency."""
-        if str(path).startswith("bytebot://"):
-            if self.bytebot_bridge:
-                container_path = str(path).replace("bytebot://", "")
-                return await self.bytebot_bridge.read_container_file(container_path)
-            return ""
-        try:
-            with open(path, 'r', errors='ignore') as f:
-                return f.read()
-        except:
-            return ""
+        return await self.file_reader.read(path)
 
     def set_callback(self, callback):
         self.callback = callback
@@ -1159,6 +1332,11 @@ class AutoEvolveWatcher:
         self.orchestrator = orchestrator
         self.observer = None
         self.last_trigger = 0
+        self.debounce = 5.0
+        # Paths changed since the last trigger; all of them become the next run's hints
+        self.pending_paths: Set[str] = set()
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
         self._loop = None
         
     def start(self, paths: List[str]):
@@ -1175,16 +1353,7 @@ class AutoEvolveWatcher:
                     if event.is_directory: return
                     if not event.src_path.endswith(('.py', '.js', '.ts', '.html', '.css', '.json', '.md')): return
                     
-                    # Rate limiting: only trigger once every 5 seconds
-                    now = time.time()
-                    if now - self.watcher.last_trigger < 5: return
-                    self.watcher.last_trigger = now
-                    
-                    print(f"🧬 Change detected: {event.src_path}")
-                    if self.watcher._loop:
-                        self.watcher._loop.call_soon_threadsafe(
-                            lambda: asyncio.create_task(self.watcher.orchestrator.trigger_auto_evolution(event.src_path))
-                        )
+                    self.watcher._on_change(event.src_path)
             
             self.observer = Observer()
             handler = ChangeHandler(self)
@@ -1199,6 +1368,26 @@ class AutoEvolveWatcher:
             print(f"❌ Failed to start watcher: {e}")
             return False
 
+    def _on_change(self, path: str):
+        """Watchdog thread: collect the path; at most one trigger every `debounce` seconds."""
+        with self._pending_lock:
+            self.pending_paths.add(path)
+            if self._flush_scheduled or not self._loop:
+                return
+            self._flush_scheduled = True
+            delay = max(0.0, self.last_trigger + self.debounce - time.time())
+        print(f"🧬 Change detected: {path}")
+        self._loop.call_soon_threadsafe(self._loop.call_later, delay, self._flush)
+
+    def _flush(self):
+        """Event loop: hand every path collected during the window to one rescan."""
+        with self._pending_lock:
+            paths, self.pending_paths = sorted(self.pending_paths), set()
+            self._flush_scheduled = False
+            self.last_trigger = time.time()
+        if paths:
+            asyncio.create_task(self.orchestrator.trigger_auto_evolution(paths))
+
     def stop(self):
         if self.observer:
             self.observer.stop()
@@ -1240,6 +1429,9 @@ class ByteBotAsiremOverlay:
             "prodman": "150+450",
             "uiarch": "450+450"
         }
+
+        # Persistent renderer inside the container (see overlay_daemon.py)
+        self.daemon = OverlayDaemon(getattr(bytebot_bridge, "container", None) or os.getenv("BYTEBOT_CONTAINER", "bytebot-desktop"))
         
     async def show_state(self, state: str):
         """Overlay the primary aSiReM avatar state."""
@@ -1251,10 +1443,11 @@ class ByteBotAsiremOverlay:
         
         if os.path.exists(host_path):
             try:
-                subprocess.run(
-                    ["docker", "cp", host_path, f"bytebot-desktop:/tmp/{avatar_file}"],
-                    capture_output=True
-                )
+                # Copied once per file version, without blocking the event loop. A failed copy
+                # still falls through: an earlier copy may be in the container already.
+                await self.daemon.copy_once(host_path, f"/tmp/{avatar_file}")
+                if await self.daemon.image("avatar", f"/tmp/{avatar_file}"):
+                    return
                 await self.bridge.execute_command(
                     f"pkill -f asirem_avatar_; DISPLAY=:0 feh -x --geometry +0+0 /tmp/{avatar_file} &" 
                 )
@@ -1280,13 +1473,18 @@ class ByteBotAsiremOverlay:
                 "lime": "#00ff00", "teal": "#008080", "red": "#ff0000"
             }
             bg_color = color_map.get(color, color)
-            
-            # Create a label with ImageMagick
+            fg_color = 'black' if bg_color in ['#ffffff','#ffff00','#00ffff'] else 'white'
             label_text = f"{name}: {text}"
+
+            # One message to the in-container daemon: label cached by content, window replaced and expired there
+            if await self.daemon.bubble(agent_id, label_text, bg_color, fg_color, geom, ttl=7):
+                return
+
+            # Fallback: per-bubble commands (no python3 in the container, or docker exec unavailable)
             img_file = f"/tmp/speech_{agent_id}.png"
             
             # Use smaller font and box for agents
-            cmd = f"DISPLAY=:0 convert -background '{bg_color}' -fill '{'black' if bg_color in ['#ffffff','#ffff00','#00ffff'] else 'white'}' -pointsize 14 -border 2 -bordercolor white label:'{label_text}' {img_file}"
+            cmd = f"DISPLAY=:0 convert -background '{bg_color}' -fill '{fg_color}' -pointsize 14 -border 2 -bordercolor white label:'{label_text}' {img_file}"
             await self.bridge.execute_command(cmd)
             
             # Kill old bubble for THIS agent immediately before showing new one
@@ -1302,6 +1500,25 @@ class ByteBotAsiremOverlay:
         except Exception as e:
             print(f"⚠️ ByteBot Speech Overlay failed for {agent_id}: {e}")
 
+    async def close(self):
+        await self.daemon.close()
+
+
+# Fixed narration lines, pre-rendered into the TTS audio cache at startup
+PRERENDER_PHRASES = (
+    "Greetings. I am AZIREM. Activating Sovereign Control...",
+    "Initiating Sovereign Mission Protocol Alpha. Deploying the fleet.",
+    "Actually scanning your ByteBot folder, Desktop, UI, Ubuntu container, and Environment variables.",
+    "Directing Security and QA agents to audit the discovered architecture.",
+    "Organizing discoveries into functional categories. Identifying agentic entities.",
+    "Extracting semantic relationships and building the knowledge graph.",
+    "Synthesizing extracted knowledge into high-level strategic insights.",
+    "Engaging Autonomy Loop. Detecting system gaps and auto-generating solutions.",
+    "Sovereign mission alpha successful. System evolved. Awaiting next command.",
+    "Maestro Override: Initiating 100% System Synthesis. Stand by for mass generation.",
+    "Performing Deep Architectural Scan...",
+)
+
 
 class AsiremPresenter:
     """
@@ -1334,6 +1551,19 @@ class AsiremPresenter:
         # asyncio.create_task(self._init_speaking_engine())  # Removed - causes error
         self._speaking_engine_initialized = False
 
+        # Event-storm protection: post_state() keeps only the latest update per agent
+        # and applies them once per window; overlay actions and queued narration are
+        # rate capped (speech per agent, so one agent's storm cannot mute another).
+        self.coalesce_window = float(os.getenv("ASIREM_PRESENTER_WINDOW", "0.5"))
+        self.overlay_limit = TokenBucket(float(os.getenv("ASIREM_OVERLAY_RATE", "2")), capacity=4)
+        self.speech_rate = float(os.getenv("ASIREM_SPEECH_RATE", "0.5"))
+        self._speech_limits: Dict[str, TokenBucket] = {}
+        self.max_side_tasks = int(os.getenv("ASIREM_PRESENTER_MAX_TASKS", "16"))
+        self._latest: Dict[str, Tuple[str, Any]] = {}
+        self._flush_task = None
+        self._side_tasks: Set[asyncio.Task] = set()
+        self.presenter_stats = {"posted": 0, "coalesced": 0, "applied": 0, "overlay_skipped": 0, "speech_skipped": 0}
+
     async def engine_callback(self, event_type, data):
         """Relay events from speaking engine to dashboard."""
         await self.broadcast(event_type, data)
@@ -1348,10 +1578,27 @@ class AsiremPresenter:
                 print(f"⚠️ Failed to initialize speaking engine: {e}")
         return False
 
-    async def speak(self, text, agent_id="azirem"):
+    def _speech_limit(self, agent_id: str) -> TokenBucket:
+        limit = self._speech_limits.get(agent_id)
+        if limit is None:
+            limit = self._speech_limits[agent_id] = TokenBucket(self.speech_rate, capacity=2)
+        return limit
+
+    def _spawn(self, factory, limit: Optional[TokenBucket], kind: str) -> bool:
+        """Start a side task if the rate cap (when given) and the in-flight cap both allow it."""
+        if len(self._side_tasks) >= self.max_side_tasks or (limit is not None and not limit.try_acquire()):
+            self.presenter_stats[f"{kind}_skipped"] += 1
+            return False
+        task = asyncio.create_task(factory())
+        self._side_tasks.add(task)
+        task.add_done_callback(self._side_tasks.discard)
+        return True
+
+    async def speak(self, text, agent_id="azirem", priority=PRIORITY_NORMAL, interrupt=False, max_age=None, overlay=True):
         """Make a specific agent speak (visual + vocal if possible)."""
         if self.speaking_engine and agent_id == "azirem":
-            await self.speaking_engine.speak(text)
+            # Queued on the TTS worker thread; awaiting only waits for the outcome
+            await self.speaking_engine.speak(text, priority=priority, interrupt=interrupt, max_age=max_age)
         else:
             print(f"🗣️ {agent_id.upper()} says: {text}")
             await self.broadcast("activity", {
@@ -1362,12 +1609,43 @@ class AsiremPresenter:
             })
         
         # ByteBot Visual Feedback
-        if self.bytebot_overlay:
-            asyncio.create_task(self.bytebot_overlay.speak(text, agent_id))
+        if self.bytebot_overlay and overlay:
+            self._spawn(lambda: self.bytebot_overlay.speak(text, agent_id), self.overlay_limit, "overlay")
+
+    def post_state(self, state, message=None, agent_id="azirem"):
+        """
+        Queue a state update without awaiting it.
+
+        Updates for the same agent within one coalescing window collapse to
+        the latest; a single flusher task applies them, so an event storm
+        costs one pending entry per agent rather than one task per event.
+        """
+        self.presenter_stats["posted"] += 1
+        if agent_id in self._latest:
+            self.presenter_stats["coalesced"] += 1
+        self._latest[agent_id] = (state, message)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_states())
+
+    async def _flush_states(self):
+        while self._latest:
+            await asyncio.sleep(self.coalesce_window)
+            batch, self._latest = self._latest, {}
+            for agent_id, (state, message) in batch.items():
+                try:
+                    await self._apply_state(state, message, agent_id, queued=True)
+                except Exception as e:
+                    print(f"⚠️ Presenter update failed for {agent_id}: {e}")
 
     async def set_state(self, state, message=None, agent_id="azirem"):
         """Update agent's visual and vocal state."""
+        # A direct update supersedes anything still waiting in the coalescing window
+        self._latest.pop(agent_id, None)
+        await self._apply_state(state, message, agent_id)
+
+    async def _apply_state(self, state, message, agent_id, queued=False):
         self.state = state
+        self.presenter_stats["applied"] += 1
         
         # Ensure message is a string for .lower() check
         msg_str = str(message) if message else ""
@@ -1378,10 +1656,10 @@ class AsiremPresenter:
         # Update ByteBot Overlay
         if self.bytebot_overlay:
             if state in ["thinking", "talking", "online", "idle"]:
-                asyncio.create_task(self.bytebot_overlay.show_state(state))
+                self._spawn(lambda: self.bytebot_overlay.show_state(state), self.overlay_limit, "overlay")
             
             if deserve_bubble:
-                asyncio.create_task(self.bytebot_overlay.speak(message, agent_id))
+                self._spawn(lambda: self.bytebot_overlay.speak(message, agent_id), self.overlay_limit, "overlay")
 
         await self.broadcast("asirem_state", {
             "state": state,
@@ -1390,9 +1668,15 @@ class AsiremPresenter:
             "timestamp": datetime.now().isoformat()
         })
         
-        # If there's a message, speak it (voice synthesis only for main AZIREM)
+        # If there's a message, speak it (voice synthesis only for main AZIREM).
+        # State narration is low priority and goes stale quickly if speech falls behind;
+        # the bubble was already shown above. Only coalesced updates are rate capped:
+        # direct calls are the phase narration and must not lose to an event storm.
         if message:
-            asyncio.create_task(self.speak(message, agent_id))
+            self._spawn(
+                lambda: self.speak(message, agent_id, priority=PRIORITY_LOW, max_age=8.0, overlay=False),
+                self._speech_limit(agent_id) if queued else None, "speech"
+            )
 
 # =============================================================================
 # AUTONOMY WRAPPER
@@ -1440,15 +1724,33 @@ class RealMultiAgentOrchestrator:
         self.visual_engine = None
         self.live_capture = None
         self.stt_model = None  # Speech-to-Text Model
+        self.stt = None  # Pooled Whisper transcription service (stt_service.py)
         self.visual_operator = None
         self.mcp = None
         self.watcher = None
         self.bytebot_bridge = None
+        self.file_reader = None
         self.bytebot_overlay = None
         self.avatar_engine = None
         self.dispatcher = None
         
         self.ws_clients: Set = set()
+        # Per-client outbound queues (see ws_fanout.ClientChannel)
+        self.ws_channels: Dict[Any, ClientChannel] = {}
+        self.ws_queue_size = int(os.getenv("ASIREM_WS_QUEUE_SIZE", "256"))
+        self.ws_overflow_policy = os.getenv("ASIREM_WS_OVERFLOW", "coalesce")
+        if self.ws_overflow_policy not in OVERFLOW_POLICIES:
+            print(f"⚠️ Unknown ASIREM_WS_OVERFLOW '{self.ws_overflow_policy}' "
+                  f"(expected one of {', '.join(OVERFLOW_POLICIES)}) - using coalesce")
+            self.ws_overflow_policy = "coalesce"
+        # Concurrent pipeline phases allowed per resource (see phase_scheduler)
+        self.pipeline_limits = {
+            "cpu": int(os.getenv("ASIREM_PIPELINE_CPU_PHASES", "3")),
+            "network": int(os.getenv("ASIREM_PIPELINE_NETWORK_PHASES", "2")),
+        }
+        # Embedding ingestion (attached by the server once the vector index is loaded)
+        self.ingestion = None
+        self.ingest_in_pipeline = os.getenv("ASIREM_PIPELINE_INGEST", "0").lower() in ("1", "true", "yes")
         self.tasks: List[AgentTask] = []
         self.start_time = datetime.now()
         
@@ -1462,6 +1764,15 @@ class RealMultiAgentOrchestrator:
             "evolution_cycles": 0
         }
         self.scanned_files_count = 0
+
+        # Incremental scan index (content hashes + per-stage results across runs)
+        try:
+            index_path = os.getenv("ASIREM_SCAN_INDEX", str(PROJECT_ROOT / ".asirem_scan_index.db"))
+            self.scan_index = ScanIndex(index_path)
+            print(f"🗂️ Scan Index: {len(self.scan_index)} files tracked ({index_path})")
+        except Exception as e:
+            print(f"⚠️ Scan Index unavailable, falling back to full rescans: {e}")
+            self.scan_index = None
         
         # Avatar Engine
         if AVATAR_ENGINE_OK:
@@ -1480,6 +1791,9 @@ class RealMultiAgentOrchestrator:
                 print(f"⚠️ ByteBot Bridge failed: {e}")
                 self.bytebot_bridge = None
 
+            # One reader (thread-pool I/O + LRU) shared by every agent that reads files
+            self.file_reader = SharedFileReader(self.bytebot_bridge)
+
             # Initialize Agent Action Dispatcher with ByteBot mode (Host-Container transparency)
             self.dispatcher = get_dispatcher(use_bytebot=True)
             self.dispatcher.set_callback(self.broadcast_event)
@@ -1494,16 +1808,17 @@ class RealMultiAgentOrchestrator:
                     return DummyAgent(name=agent_class.__name__)
 
             self.scanner = init_agent(RealScannerAgent, self.broadcast_event, bytebot_bridge=self.bytebot_bridge)
-            if self.scanner: self.scanner.dispatcher = self.dispatcher
+            if self.scanner:
+                self.scanner.dispatcher = self.dispatcher
             
             self.classifier = init_agent(RealClassifierAgent, self.broadcast_event, bytebot_bridge=self.bytebot_bridge, dispatcher=self.dispatcher)
             self.extractor = init_agent(RealExtractorAgent, self.broadcast_event, bytebot_bridge=self.bytebot_bridge, dispatcher=self.dispatcher)
             self.memory = init_agent(RealMemoryAgent, self.broadcast_event, bytebot_bridge=self.bytebot_bridge, dispatcher=self.dispatcher)
             
-            self.security = init_agent(RealSecurityAgent, bytebot_bridge=self.bytebot_bridge, dispatcher=self.dispatcher)
+            self.security = init_agent(RealSecurityAgent, bytebot_bridge=self.bytebot_bridge, dispatcher=self.dispatcher, scan_index=self.scan_index, file_reader=self.file_reader)
             if self.security: self.security.set_callback(self.broadcast_event)
             
-            self.qa = init_agent(RealQAAgent, bytebot_bridge=self.bytebot_bridge, dispatcher=self.dispatcher)
+            self.qa = init_agent(RealQAAgent, bytebot_bridge=self.bytebot_bridge, dispatcher=self.dispatcher, scan_index=self.scan_index, file_reader=self.file_reader)
             if self.qa: self.qa.set_callback(self.broadcast_event)
             
             self.devops = init_agent(RealDevOpsAgent, bytebot_bridge=self.bytebot_bridge, dispatcher=self.dispatcher)
@@ -1512,7 +1827,7 @@ class RealMultiAgentOrchestrator:
             self.spectra = init_agent(RealSpectraAgent, bytebot_bridge=self.bytebot_bridge, dispatcher=self.dispatcher)
             if self.spectra: self.spectra.set_callback(self.broadcast_event)
             
-            self.evolution = init_agent(RealEvolutionAgent, bytebot_bridge=self.bytebot_bridge, dispatcher=self.dispatcher)
+            self.evolution = init_agent(RealEvolutionAgent, bytebot_bridge=self.bytebot_bridge, dispatcher=self.dispatcher, file_reader=self.file_reader)
             if self.evolution: self.evolution.set_callback(self.broadcast_event)
             
             self.searcher = init_agent(RealWebSearchAgent, self.broadcast_event, bytebot_bridge=self.bytebot_bridge, dispatcher=self.dispatcher)
@@ -1530,16 +1845,21 @@ class RealMultiAgentOrchestrator:
 
         # Speaking Engine (Voice Cloning + Lip Sync)
         try:
-            from asirem_speaking_engine import ASiREMSpeakingEngine
-            self.speaking_engine = ASiREMSpeakingEngine()
+            from asirem_speaking_engine import ASiREMSpeakingEngine, SpeakingConfig
+            # Rendered utterances live under outputs/ so the dashboard can play them via /outputs
+            self.speaking_engine = ASiREMSpeakingEngine(SpeakingConfig(
+                cache_dir=os.getenv("ASIREM_TTS_CACHE", str(PROJECT_ROOT / "sovereign-dashboard" / "outputs" / "tts_cache")),
+                cache_max_bytes=int(os.getenv("ASIREM_TTS_CACHE_MB", "256")) * 1024 * 1024,
+            ))
             self.speaking_engine.set_callback(self.broadcast_event)
             print("🔊 ASiREMSpeakingEngine initialized")
         except Exception as e:
             print(f"⚠️ Speaking Engine failed to load: {e}")
             self.speaking_engine = None
 
-        # aSiReM Avatar Presenter
+        # aSiReM Avatar Presenter (shares the speaking engine and its TTS worker)
         self.asirem = AsiremPresenter(self.broadcast_event, bytebot_bridge=self.bytebot_bridge)
+        self.asirem.speaking_engine = self.speaking_engine
         
         # 🧠 Nebula Sovereign Orchestrator
         self.nebula = NebulaOrchestrator(
@@ -1804,22 +2124,22 @@ class RealMultiAgentOrchestrator:
         if self.speaking_engine:
             try:
                 await self.speaking_engine.initialize()
+                queued = self.speaking_engine.prerender(PRERENDER_PHRASES)
+                if queued:
+                    print(f"🔊 Pre-rendering {queued} narration lines in the background")
             except Exception as e:
                 print(f"⚠️ Speaking Engine init failed: {e}")
 
         # 3.5 Speech-to-Text (Whisper)
-        if WHISPER_AVAILABLE and not self.stt_model:
+        if WHISPER_AVAILABLE and not self.stt:
             try:
-                print("🔊 Loading Whisper STT Model (faster-whisper)...")
-                # Run in thread to avoid blocking loop
-                def load_whisper():
-                    if USING_OPENAI_WHISPER:
-                        return whisper.load_model("base")
-                    else:
-                        return WhisperModel("base", device="cpu", compute_type="int8")
-                
-                self.stt_model = await asyncio.to_thread(load_whisper)
-                print(f"   ✅ Whisper STT Model Loaded ({'OpenAI' if USING_OPENAI_WHISPER else 'Faster-Whisper'})")
+                stt = create_stt_service(on_event=self.broadcast_event)
+                print(f"🔊 Loading Whisper STT pool ({stt.workers} workers)...")
+                # Model loads in a thread to avoid blocking the loop
+                await stt.start()
+                self.stt = stt
+                self.stt_model = stt.model
+                print(f"   ✅ Whisper STT Model Loaded ({stt.backend}, {stt.workers} workers x {stt.cpu_threads} threads)")
             except Exception as e:
                 print(f"⚠️ Whisper STT init failed: {e}")
 
@@ -2141,15 +2461,20 @@ agents:
             await asyncio.sleep(30) # Wait between missions
 
 
-    async def trigger_auto_evolution(self, file_path: str):
-        """Trigger evolution due to file change."""
+    async def trigger_auto_evolution(self, file_paths):
+        """Trigger evolution due to file changes (one path or a list collected by the watcher)."""
+        if isinstance(file_paths, str):
+            file_paths = [file_paths]
+        names = ", ".join(os.path.basename(p) for p in file_paths[:3])
+        if len(file_paths) > 3:
+            names += f" (+{len(file_paths) - 3} more)"
         await self.broadcast_event("activity", {
             "agent_id": "evolution",
             "agent_name": "Evolution",
             "icon": "🧬",
-            "message": f"AUTO-EVOLVE: Detected change in {os.path.basename(file_path)}. Rescanning..."
+            "message": f"AUTO-EVOLVE: Detected change in {names}. Rescanning..."
         })
-        await self.run_full_pipeline()
+        await self.run_full_pipeline(changed_paths=list(file_paths))
     
     async def broadcast_thought(self, agent_id: str, thought: str, phase: str = ""):
         """Broadcast an internal agent thought to the dashboard."""
@@ -2164,6 +2489,34 @@ agents:
     async def broadcast(self, event_type: str, data: dict):
         """Alias for broadcast_event to support legacy calls."""
         await self.broadcast_event(event_type, data)
+
+    def register_ws_client(self, ws) -> ClientChannel:
+        """Attach a bounded send queue and writer task to a new WebSocket client."""
+        channel = ClientChannel(
+            ws,
+            max_queue=self.ws_queue_size,
+            policy=self.ws_overflow_policy,
+            on_close=lambda ch: self.unregister_ws_client(ch.ws)
+        ).start()
+        self.ws_channels[ws] = channel
+        self.ws_clients.add(ws)
+        return channel
+
+    def unregister_ws_client(self, ws):
+        self.ws_clients.discard(ws)
+        channel = self.ws_channels.pop(ws, None)
+        if channel:
+            channel.close()
+
+    def fanout(self, message: dict):
+        """Encode a message once and enqueue it on every client channel; never waits on a socket."""
+        if not self.ws_channels:
+            return
+        payload = encode_message(message)
+        key = coalesce_key(message)
+        for ws, channel in list(self.ws_channels.items()):
+            if not channel.offer_encoded(payload, key):
+                self.unregister_ws_client(ws)
     
     async def broadcast_event(self, event_type: str, data: dict):
         """Broadcast event to all WebSocket clients."""
@@ -2196,14 +2549,7 @@ agents:
             "timestamp": datetime.now().isoformat()
         }
         
-        dead_clients = set()
-        for client in self.ws_clients:
-            try:
-                await client.send_json(message)
-            except:
-                dead_clients.add(client)
-        
-        self.ws_clients -= dead_clients
+        self.fanout(message)
 
         # LIVE STREAM UPDATES - SIGNAL DRIVEN
         if self.agent_streams:
@@ -2240,11 +2586,20 @@ agents:
             if self.asirem and event_type not in ["asirem_state", "heartbeat", "activity"] and (event_type in ["classification", "web_search_result", "scan_progress"] or "message" in data):
                 msg = data.get("message") or data.get("current_item") or f"Active: {event_type}"
                 # Use the real agent_id from the data
-                asyncio.create_task(self.asirem.set_state("thinking", msg, agent_id=agent_id or "azirem"))
+                # Coalesced per agent and rate capped: event storms must not fan out into tasks
+                self.asirem.post_state("thinking", msg, agent_id=agent_id or "azirem")
     
     @track(name="sovereign_pipeline_run")
-    async def run_full_pipeline(self):
-        """Run the complete multi-agent pipeline."""
+    async def run_full_pipeline(self, changed_paths: Optional[List[str]] = None):
+        """Run the complete multi-agent pipeline.
+
+        changed_paths is a hint from the file watcher: when the scan index is
+        warm only those paths (and newly discovered files) are re-fingerprinted.
+        Security and QA reuse per-file results for unchanged content. The
+        knowledge graph is a whole-corpus result: it is reused only when no
+        file changed, and any change re-runs extraction over every file,
+        since the extractor has no per-file output to merge.
+        """
         # Skip heavy operations in lightweight mode (silently to avoid spam)
         if os.environ.get("ASIREM_LIGHTWEIGHT_MODE"):
             return  # Silent return - no broadcast spam
@@ -2304,6 +2659,21 @@ agents:
         self.metrics["files_scanned"] = self.scanner.progress.scanned_files
         self.metrics["patterns_discovered"] = self.scanner.progress.patterns_found
         await self.broadcast_event("metrics_updated", self.metrics)
+
+        # Reconcile with the scan index so downstream agents only reprocess changed files
+        changed_files = discovered
+        if self.scan_index:
+            try:
+                changed_files = await asyncio.to_thread(self.scan_index.refresh, discovered, changed_paths)
+                await self.broadcast_event("activity", {
+                    "agent_id": "scanner",
+                    "agent_name": "Scanner",
+                    "icon": "🗂️",
+                    "message": f"Incremental index: {len(changed_files)} of {len(discovered)} files changed since last run."
+                })
+            except Exception as e:
+                print(f"⚠️ Scan index refresh failed: {e}")
+                changed_files = discovered
         
         # Stop Scanner stream
         if self.visual_engine:
@@ -2311,193 +2681,251 @@ agents:
         if self.agent_streams:
             await self.agent_streams.stop_agent_stream("scanner")
 
-        # Phase 1.5: Security & QA Audit (Parallel)
-        await self.asirem.set_state("commanding", "Directing Security and QA agents to audit the discovered architecture.")
-        await self.broadcast_event("phase_changed", {"phase": "auditing", "percent": 25})
-        
-        # Start Streams
-        if self.agent_streams:
-            await self.agent_streams.start_agent_stream("security", "auditing", {"progress": 0, "current_item": "Starting Audit"})
-            await self.agent_streams.start_agent_stream("qa", "testing", {"progress": 0, "current_item": "Static Analysis"})
+        # Container files: warm the shared reader in batched tar round trips instead of one exec per file
+        if self.file_reader:
+            container_paths = [str(f.path) for f in changed_files if str(f.path).startswith("bytebot://")]
+            if container_paths:
+                fetched = await self.file_reader.prefetch(container_paths)
+                print(f"🐳 Prefetched {fetched}/{len(container_paths)} container files")
+
+        # Everything after the scan runs as a dependency DAG: independent phases overlap
+        # and wall-clock time follows the critical path.
+        #   scan -> {security, qa, classify}; classify -> {architect, extract}
+        #   extract -> {spectra, summarizer}; {extract, research} -> evolution
+        classified_list = []
+        knowledge_graph = {}
+        search_results = []
 
-        # Run Real Tasks
-        # FIX: RealSecurityAgent and RealQAAgent expect List[DiscoveredFile/ScannedFile]
-        if self.security:
-            await self.security.scan_security(discovered)
-        if self.qa:
-            await self.qa.run_qa(discovered)
+        async def security_phase():
+            await self.asirem.set_state("commanding", "Directing Security and QA agents to audit the discovered architecture.")
+            await self.broadcast_event("phase_changed", {"phase": "auditing", "percent": 25})
+            if self.agent_streams:
+                await self.agent_streams.start_agent_stream("security", "auditing", {"progress": 0, "current_item": "Starting Audit"})
+            # FIX: RealSecurityAgent and RealQAAgent expect List[DiscoveredFile/ScannedFile]
+            if self.security:
+                await self.security.scan_security(discovered)
+            if self.agent_streams:
+                await self.agent_streams.stop_agent_stream("security")
 
-        # Stop Streams
-        if self.agent_streams:
-            await self.agent_streams.stop_agent_stream("security")
-            await self.agent_streams.stop_agent_stream("qa")
-        
-        # Phase 2: Classify
-        await self.asirem.set_state("thinking", "Organizing discoveries into functional categories. Identifying agentic entities.")
-        await self.broadcast_event("phase_changed", {"phase": "learning", "percent": 50})
-        
-        # Start visual stream for Classifier
-        if self.visual_engine:
-            await self.visual_engine.start_agent_work("classifier", "classifying", {
-                "files_count": len(discovered)
-            })
-        if self.agent_streams:
-            await self.agent_streams.start_agent_stream("classifier", "classifying", {
-                "progress": 0,
-                "current_item": f"Classifying {len(discovered)} files..."
-            })
-        
-        # classified_list is a List[ClassifiedFile]
-        classified_list = await self.classifier.classify_files(discovered)
-        
-        # Stop Classifier stream
-        if self.visual_engine:
-            await self.visual_engine.stop_agent_work("classifier")
-        if self.agent_streams:
-            await self.agent_streams.stop_agent_stream("classifier")
-            
-        # Architect Analysis (Semi-Active -> Active)
-        # Based on classification, architect proposes structure
-        agents_found = [c for c in classified_list if c.category == 'agent']
-        await self.asirem.set_state("analyzing", f"Architect analysis complete. I've identified {len(agents_found)} agents in the system mesh.")
-        await self.broadcast_event("activity", {
-            "agent_id": "architect",
-            "agent_name": "Architect",
-            "icon": "📐",
-            "message": f"Analyzing architecture of {len(agents_found)} identified agents..."
-        })
-        if self.agent_streams:
-             await self.agent_streams.start_agent_stream("architect", "designing", {
-                "progress": 50, "current_item": "System Blueprint", "details": f"Agents: {len(agents_found)}"
-            })
-        await asyncio.sleep(2) # Metric analysis time
-        if self.agent_streams:
-            await self.agent_streams.stop_agent_stream("architect")
-        
-        # Extraction phase
-        await self.asirem.set_state("thinking", "Extracting semantic relationships and building the knowledge graph.")
-        # Local extractor expects List[ScannedFile]
-        knowledge_graph = await self.extractor.extract_knowledge(discovered)
-        self.knowledge_graph = knowledge_graph
-        self.metrics["knowledge_items"] = len(knowledge_graph)
-        await self.broadcast_event("metrics_updated", self.metrics)
-        
-        if self.visual_engine:
-            await self.visual_engine.stop_agent_work("extractor")
-        if self.agent_streams:
-            await self.agent_streams.stop_agent_stream("extractor")
-            
-        # Spectra Phase - Knowledge Synthesis
-        await self.asirem.set_state("analyzing", "Synthesizing extracted knowledge into high-level strategic insights.")
-        if self.agent_streams:
-            await self.agent_streams.start_agent_stream("spectra", "synthesizing", {"progress": 0, "current_item": "Ingesting Graph"})
-        
-        if self.spectra:
-            await self.spectra.synthesize(knowledge_graph)
-        
-        if self.agent_streams:
-            await self.agent_streams.stop_agent_stream("spectra")
-        
-        # Phase 4: Web Search for cutting-edge patterns
-        await self.broadcast_event("phase_changed", {"phase": "evolving", "percent": 80})
-        await self.broadcast_event("activity", {
-            "agent_id": "researcher",
-            "agent_name": "Researcher",
-            "icon": "🌐",
-            "message": "Starting web search for 2026 agentic patterns..."
-        })
-        
-        # Start visual stream for Researcher
-        if self.visual_engine:
-            await self.visual_engine.start_agent_work("researcher", "searching", {})
-        if self.agent_streams:
-            await self.agent_streams.start_agent_stream("researcher", "searching", {
-                "progress": 0,
-                "current_item": "Searching cutting-edge AI patterns..."
-            })
-        
-        # Enable web research (uses Perplexity Pro if available)
-        search_results = []
-        if self.searcher:
-            try:
-                # Upgraded to deep research for the full pipeline
-                search_results = await self.searcher.search("Autonomous multi-agent orchestration patterns 2026", deep_research=True)
-                self.metrics["web_searches"] = len(search_results)
-            except Exception as e:
-                print(f"Web research failed: {e}")
-        
-        if self.visual_engine:
-            await self.visual_engine.stop_agent_work("researcher")
-        if self.agent_streams:
-            await self.agent_streams.stop_agent_stream("researcher")
+        async def qa_phase():
+            if self.agent_streams:
+                await self.agent_streams.start_agent_stream("qa", "testing", {"progress": 0, "current_item": "Static Analysis"})
+            if self.qa:
+                await self.qa.run_qa(discovered)
+            if self.agent_streams:
+                await self.agent_streams.stop_agent_stream("qa")
+
+        async def classify_phase():
+            nonlocal classified_list
+            await self.asirem.set_state("thinking", "Organizing discoveries into functional categories. Identifying agentic entities.")
+            await self.broadcast_event("phase_changed", {"phase": "learning", "percent": 50})
             
-        # Phase 5: Self-Evolution
-        await self.broadcast_event("activity", {
-            "agent_id": "evolution",
-            "agent_name": "Evolution",
-            "icon": "🧬",
-            "message": "Analyzing system metrics for self-evolve cycle..."
-        })
-        if self.agent_streams:
-             await self.agent_streams.start_agent_stream("evolution", "evolving", {"progress": 85, "current_item": "System Self-Audit"})
-        
-        # Trigger real Autonomy Loop
-        try:
-            from autonomy_loop import AutonomyLoop
+            # Start visual stream for Classifier
+            if self.visual_engine:
+                await self.visual_engine.start_agent_work("classifier", "classifying", {
+                    "files_count": len(discovered)
+                })
+            if self.agent_streams:
+                await self.agent_streams.start_agent_stream("classifier", "classifying", {
+                    "progress": 0,
+                    "current_item": f"Classifying {len(discovered)} files..."
+                })
             
-            # Initialize loop if needed
-            if not self.autonomy_loop:
-                self.autonomy_loop = AutonomyLoop(base_path=str(Path(__file__).parent / "sovereign-dashboard"))
+            # classified_list is a List[ClassifiedFile]
+            classified_list = await self.classifier.classify_files(discovered)
             
-            await self.asirem.set_state("evolving", "Engaging Autonomy Loop. Detecting system gaps and auto-generating solutions.")
+            # Stop Classifier stream
+            if self.visual_engine:
+                await self.visual_engine.stop_agent_work("classifier")
+            if self.agent_streams:
+                await self.agent_streams.stop_agent_stream("classifier")
+
+        async def architect_phase():
+            # Architect Analysis (Semi-Active -> Active)
+            # Based on classification, architect proposes structure
+            agents_found = [c for c in classified_list if c.category == 'agent']
+            await self.asirem.set_state("analyzing", f"Architect analysis complete. I've identified {len(agents_found)} agents in the system mesh.")
+            await self.broadcast_event("activity", {
+                "agent_id": "architect",
+                "agent_name": "Architect",
+                "icon": "📐",
+                "message": f"Analyzing architecture of {len(agents_found)} identified agents..."
+            })
+            if self.agent_streams:
+                 await self.agent_streams.start_agent_stream("architect", "designing", {
+                    "progress": 50, "current_item": "System Blueprint", "details": f"Agents: {len(agents_found)}"
+                })
+            await asyncio.sleep(2) # Metric analysis time
+            if self.agent_streams:
+                await self.agent_streams.stop_agent_stream("architect")
+
+        async def extract_phase():
+            nonlocal knowledge_graph
+            await self.asirem.set_state("thinking", "Extracting semantic relationships and building the knowledge graph.")
+            # Local extractor expects List[ScannedFile]
+            # The graph is a whole-corpus result: reuse it when no file content changed.
+            # Any change re-extracts everything; extract_knowledge has no per-file output to merge.
+            graph = None
+            graph_fingerprint = None
+            if self.scan_index:
+                graph_fingerprint = self.scan_index.fingerprint(str(f.path) for f in discovered)
+                if not changed_files:
+                    graph = self.scan_index.get_run_result("knowledge_graph", graph_fingerprint)
+            if graph is None:
+                graph = await self.extractor.extract_knowledge(discovered)
+                if self.scan_index and graph_fingerprint:
+                    self.scan_index.set_run_result("knowledge_graph", graph_fingerprint, graph)
+            knowledge_graph = graph
+            self.knowledge_graph = knowledge_graph
+            self.metrics["knowledge_items"] = len(knowledge_graph)
+            await self.broadcast_event("metrics_updated", self.metrics)
+            
+            if self.visual_engine:
+                await self.visual_engine.stop_agent_work("extractor")
+            if self.agent_streams:
+                await self.agent_streams.stop_agent_stream("extractor")
+
+        async def spectra_phase():
+            # Spectra Phase - Knowledge Synthesis
+            await self.asirem.set_state("analyzing", "Synthesizing extracted knowledge into high-level strategic insights.")
+            if self.agent_streams:
+                await self.agent_streams.start_agent_stream("spectra", "synthesizing", {"progress": 0, "current_item": "Ingesting Graph"})
             
-            # Run one iteration (Detect -> Generate -> Test -> Deploy)
-            await self.autonomy_loop._run_iteration()
+            if self.spectra:
+                await self.spectra.synthesize(knowledge_graph)
             
-            # Get status and broadcast
-            status = self.autonomy_loop.get_status()
+            if self.agent_streams:
+                await self.agent_streams.stop_agent_stream("spectra")
+
+        async def research_phase():
+            nonlocal search_results
+            # Web Search for cutting-edge patterns
             await self.broadcast_event("activity", {
-                "agent_id": "evolution",
-                "agent_name": "Autonomy Engine",
-                "icon": "🔄",
-                "message": f"Autonomy Cycle Complete: {status['gaps_fixed']} gaps fixed, {status['components_deployed']} deployed."
+                "agent_id": "researcher",
+                "agent_name": "Researcher",
+                "icon": "🌐",
+                "message": "Starting web search for 2026 agentic patterns..."
             })
             
-            # Also run standard evolution agent for proposal generation
-            if self.evolution:
-                await self.evolution.evolve(discovered, search_results if 'search_results' in locals() else [])
-                
-        except Exception as e:
-            print(f"Autonomy Loop failed: {e}")
+            # Start visual stream for Researcher
+            if self.visual_engine:
+                await self.visual_engine.start_agent_work("researcher", "searching", {})
+            if self.agent_streams:
+                await self.agent_streams.start_agent_stream("researcher", "searching", {
+                    "progress": 0,
+                    "current_item": "Searching cutting-edge AI patterns..."
+                })
+            
+            # Enable web research (uses Perplexity Pro if available)
+            if self.searcher:
+                try:
+                    # Upgraded to deep research for the full pipeline
+                    search_results = await self.searcher.search("Autonomous multi-agent orchestration patterns 2026", deep_research=True)
+                    self.metrics["web_searches"] = len(search_results)
+                except Exception as e:
+                    print(f"Web research failed: {e}")
+            
+            if self.visual_engine:
+                await self.visual_engine.stop_agent_work("researcher")
+            if self.agent_streams:
+                await self.agent_streams.stop_agent_stream("researcher")
+
+        async def evolution_phase():
+            # Self-Evolution
+            await self.broadcast_event("phase_changed", {"phase": "evolving", "percent": 80})
             await self.broadcast_event("activity", {
                 "agent_id": "evolution",
-                "agent_name": "Autonomy Engine",
-                "icon": "⚠️",
-                "message": f"Autonomy Cycle Error: {str(e)}"
+                "agent_name": "Evolution",
+                "icon": "🧬",
+                "message": "Analyzing system metrics for self-evolve cycle..."
             })
-        if self.agent_streams:
-            await self.agent_streams.stop_agent_stream("evolution")
+            if self.agent_streams:
+                 await self.agent_streams.start_agent_stream("evolution", "evolving", {"progress": 85, "current_item": "System Self-Audit"})
             
-        # Summarizer Phase - Actually using the REAL Summarizer agent
-        if self.summarizer:
+            # Trigger real Autonomy Loop
             try:
-                await self.summarizer.summarize_discovery(discovered, knowledge_graph)
+                from autonomy_loop import AutonomyLoop
+                
+                # Initialize loop if needed
+                if not self.autonomy_loop:
+                    self.autonomy_loop = AutonomyLoop(base_path=str(Path(__file__).parent / "sovereign-dashboard"))
+                
+                await self.asirem.set_state("evolving", "Engaging Autonomy Loop. Detecting system gaps and auto-generating solutions.")
+                
+                # Run one iteration (Detect -> Generate -> Test -> Deploy)
+                await self.autonomy_loop._run_iteration()
+                
+                # Get status and broadcast
+                status = self.autonomy_loop.get_status()
+                await self.broadcast_event("activity", {
+                    "agent_id": "evolution",
+                    "agent_name": "Autonomy Engine",
+                    "icon": "🔄",
+                    "message": f"Autonomy Cycle Complete: {status['gaps_fixed']} gaps fixed, {status['components_deployed']} deployed."
+                })
+                
+                # Also run standard evolution agent for proposal generation
+                if self.evolution:
+                    await self.evolution.evolve(discovered, search_results)
+                    
             except Exception as e:
-                print(f"Summarizer failed: {e}")
-        else:
-            await self.broadcast_event("activity", {
-                "agent_id": "summarizer",
-                "agent_name": "Summarizer",
-                "icon": "📝",
-                "message": "Summarizing mission findings..."
-            })
-            if self.agent_streams:
-                await self.agent_streams.start_agent_stream("summarizer", "summarizing", {
-                    "progress": 80, "current_item": "Mission Report", "details": "Compiling metrics"
+                print(f"Autonomy Loop failed: {e}")
+                await self.broadcast_event("activity", {
+                    "agent_id": "evolution",
+                    "agent_name": "Autonomy Engine",
+                    "icon": "⚠️",
+                    "message": f"Autonomy Cycle Error: {str(e)}"
                 })
-            await asyncio.sleep(1) # Processing time
             if self.agent_streams:
-                await self.agent_streams.stop_agent_stream("summarizer")
+                await self.agent_streams.stop_agent_stream("evolution")
+
+        async def summarizer_phase():
+            # Summarizer Phase - Actually using the REAL Summarizer agent
+            if self.summarizer:
+                try:
+                    await self.summarizer.summarize_discovery(discovered, knowledge_graph)
+                except Exception as e:
+                    print(f"Summarizer failed: {e}")
+            else:
+                await self.broadcast_event("activity", {
+                    "agent_id": "summarizer",
+                    "agent_name": "Summarizer",
+                    "icon": "📝",
+                    "message": "Summarizing mission findings..."
+                })
+                if self.agent_streams:
+                    await self.agent_streams.start_agent_stream("summarizer", "summarizing", {
+                        "progress": 80, "current_item": "Mission Report", "details": "Compiling metrics"
+                    })
+                await asyncio.sleep(1) # Processing time
+                if self.agent_streams:
+                    await self.agent_streams.stop_agent_stream("summarizer")
+
+        async def ingest_phase():
+            # Chunk, embed and index the discovered files (unchanged files are skipped)
+            if self.ingestion and not self.ingestion.running:
+                await self.ingestion.run(discovered, full=True)
+
+        async def on_phase(name, timing):
+            await self.broadcast_event("pipeline_phase", {"phase": name, **timing.to_dict()})
+
+        scheduler = PhaseScheduler(limits=self.pipeline_limits, on_phase=on_phase)
+        scheduler.add("security", security_phase, resources=("cpu",))
+        scheduler.add("qa", qa_phase, resources=("cpu",))
+        scheduler.add("classify", classify_phase, resources=("cpu",))
+        scheduler.add("architect", architect_phase, depends_on=("classify",))
+        scheduler.add("extract", extract_phase, depends_on=("classify",), resources=("cpu",))
+        scheduler.add("spectra", spectra_phase, depends_on=("extract",))
+        scheduler.add("research", research_phase, resources=("network",))
+        scheduler.add("evolution", evolution_phase, depends_on=("extract", "research"), resources=("network",))
+        scheduler.add("summarizer", summarizer_phase, depends_on=("extract",))
+        if self.ingest_in_pipeline and self.ingestion:
+            scheduler.add("ingest", ingest_phase, resources=("cpu",))
+        await scheduler.run()
+        phase_timings = scheduler.report()
+        await self.broadcast_event("pipeline_timings", phase_timings)
+        print(f"⏱️ Pipeline phases: {phase_timings['wall_time']}s wall / {phase_timings['serial_time']}s serial "
+              f"(critical path: {' -> '.join(phase_timings['critical_path'])})")
             
         # DevOps Final Check
         if self.agent_streams:
@@ -2513,6 +2941,12 @@ agents:
             await self.agent_streams.stop_agent_stream("azirem")
             await self.agent_streams.stop_agent_stream("bumblebee")
         
+        if self.scan_index:
+            try:
+                await asyncio.to_thread(self.scan_index.flush)
+            except Exception as e:
+                print(f"⚠️ Scan index flush failed: {e}")
+
         # Complete
         self.metrics["evolution_cycles"] += 1
         await self.broadcast_event("metrics_updated", self.metrics)
@@ -2535,7 +2969,8 @@ agents:
             "metrics": self.metrics,
             "discovered_files_count": len(discovered),
             "categories": {cat: len([c for c in classified_list if c.category == cat]) for cat in set(c.category for c in classified_list)},
-            "web_research_results": [r.__dict__ for r in search_results] if 'search_results' in locals() else [],
+            "web_research_results": [r.__dict__ for r in search_results],
+            "phase_timings": phase_timings,
             "knowledge_graph_summary": {
                 "categories_count": len(knowledge_graph),
                 "live_categories": list(knowledge_graph.keys())[:5] if knowledge_graph else []
@@ -2554,13 +2989,14 @@ agents:
             "discovered_files": len(discovered),
             "categories": {cat: len([c for c in classified_list if c.category == cat]) for cat in set(c.category for c in classified_list)},
             "knowledge_graph": knowledge_graph,
-            "pattern_counts": {}  # Using real agents instead
+            "pattern_counts": {},  # Using real agents instead
+            "phase_timings": phase_timings
         }
     
-    async def run_web_search(self, query: str = None):
+    async def run_web_search(self, query: str = None, hedged: bool = False):
         """Run web search for cutting-edge patterns."""
         if query:
-            return await self.searcher.search(query)
+            return await self.searcher.search(query, hedged=hedged)
         else:
             return await self.searcher.search_cutting_edge_patterns()
 
@@ -2584,6 +3020,11 @@ class RealAgentStreamingServer:
         self.dispatcher = None
         self.start_time = time.time()  # Use time.time() for consistency with handle_status
         self._heartbeat_task = None
+        self.vector_index = None
+        self.document_store = None  # text behind vector_index ids (DocumentStore)
+        self.memory_service = None
+        self.vector_index_dir = PROJECT_ROOT / ".asirem_vectors"
+        self._vector_snapshot_task = None
     
     async def handle_asirem_speak(self, request):
         """Make aSiReM speak a message via API. Responds with the AI message text directly."""
@@ -2604,7 +3045,7 @@ class RealAgentStreamingServer:
             
             # Also try asirem.speak if available
             if hasattr(self.orchestrator, 'asirem') and self.orchestrator.asirem:
-                asyncio.create_task(self.orchestrator.asirem.speak(ai_response))
+                asyncio.create_task(self.orchestrator.asirem.speak(ai_response, priority=PRIORITY_URGENT, interrupt=True))
             
             return web.json_response({"success": True, "status": "speaking", "message": ai_response})
         except Exception as e:
@@ -2670,18 +3111,9 @@ User query: {user_input}"""
     async def _broadcast_activity(self, data: dict):
         """Broadcast activity to all connected clients."""
         try:
-            if not hasattr(self.orchestrator, 'ws_clients'):
+            if not hasattr(self.orchestrator, 'ws_channels'):
                 return
-                
-            disconnected = set()
-            for ws in self.orchestrator.ws_clients:
-                try:
-                    await ws.send_json(data)
-                except:
-                    disconnected.add(ws)
-            
-            for ws in disconnected:
-                self.orchestrator.ws_clients.discard(ws)
+            self.orchestrator.fanout(data)
         except Exception as e:
             print(f"⚠️ Broadcast failed: {e}")
 
@@ -2690,9 +3122,6 @@ User query: {user_input}"""
         ws = web.WebSocketResponse()
         await ws.prepare(request)
         
-        self.orchestrator.ws_clients.add(ws)
-        print(f"🔌 Client connected. Total: {len(self.orchestrator.ws_clients)}")
-        
         # Send initial state
         await ws.send_json({
             "type": "connected",
@@ -2703,13 +3132,16 @@ User query: {user_input}"""
             }
         })
         
+        self.orchestrator.register_ws_client(ws)
+        print(f"🔌 Client connected. Total: {len(self.orchestrator.ws_clients)}")
+        
         try:
             async for msg in ws:
                 if msg.type == aiohttp.WSMsgType.TEXT:
                     data = json.loads(msg.data)
                     await self._handle_message(ws, data)
         finally:
-            self.orchestrator.ws_clients.discard(ws)
+            self.orchestrator.unregister_ws_client(ws)
             print(f"🔌 Client disconnected. Total: {len(self.orchestrator.ws_clients)}")
         
         return ws
@@ -3047,7 +3479,7 @@ User query: {user_input}"""
                     })
                     result = await self.orchestrator.speaking_engine.speak(response)
                     await self.orchestrator.broadcast_event("podcast_audio", {
-                        "audio_path": result.get("audio_path"),
+                        "audio_path": self._output_url(result.get("audio_path")),
                         "video_path": result.get("video_path")
                     })
                     
@@ -3238,7 +3670,11 @@ User query: {user_input}"""
             "status": "online",
             "mode": "REAL_AGENTS",
             "metrics": self.orchestrator.metrics,
-            "connected_clients": len(self.orchestrator.ws_clients)
+            "connected_clients": len(self.orchestrator.ws_clients),
+            "search_cache": self.orchestrator.searcher.cache.stats() if hasattr(self.orchestrator.searcher, "cache") else None,
+            "search_providers": self.orchestrator.searcher.latency.stats() if hasattr(self.orchestrator.searcher, "latency") else None,
+            "presenter": getattr(self.orchestrator.asirem, "presenter_stats", None),
+            "stt": self.orchestrator.stt.metrics() if self.orchestrator.stt else None
         })
     
     async def handle_run_pipeline(self, request):
@@ -3258,7 +3694,8 @@ User query: {user_input}"""
     async def handle_web_search(self, request):
         data = await request.json()
         query = data.get("query", "AI agents 2026")
-        asyncio.create_task(self.orchestrator.run_web_search(query))
+        # Interactive searches race providers: tail latency matters more than quota here
+        asyncio.create_task(self.orchestrator.run_web_search(query, hedged=data.get("hedged", True)))
         return web.json_response({"status": "search_started", "query": query})
     
     async def handle_discoveries(self, request):
@@ -3365,11 +3802,12 @@ User query: {user_input}"""
             response_audio_path = None
             response_text = "I'm sorry, I cannot speak right now."
             
-            if self.orchestrator.speaking_engine:
-                # This returns a dict with audio_path
-                result = await self.orchestrator.speaking_engine.podcast_conversation(question)
-                response_text = result.get("text", "")
-                response_audio_path = result.get("audio_path", "")
+            if question:
+                response_text = await self._generate_asirem_response(question)
+            if self.orchestrator.speaking_engine and question:
+                # Rendered once per distinct line; repeats are served straight from the audio cache
+                result = await self.orchestrator.speaking_engine.render(response_text, priority=PRIORITY_URGENT)
+                response_audio_path = self._output_url(result.get("audio_path"))
             
             return web.json_response({
                 "success": True, 
@@ -3379,15 +3817,33 @@ User query: {user_input}"""
         except Exception as e:
             return web.json_response({"success": False, "error": str(e)})
 
+    @staticmethod
+    def _output_url(path):
+        """Map a file under sovereign-dashboard/outputs to its /outputs URL (else return it as is)."""
+        if not path:
+            return None
+        outputs = PROJECT_ROOT / "sovereign-dashboard" / "outputs"
+        try:
+            return "/outputs/" + Path(path).resolve().relative_to(outputs.resolve()).as_posix()
+        except ValueError:
+            return path
+
     async def handle_podcast_audio(self, request):
-        """Handle raw audio blobs from the frontend (Voice S2S)."""
-        if not self.voice_service:
+        """Handle raw audio blobs from the frontend (Voice S2S).
+
+        Transcribed by the pooled Whisper service when it is loaded; partial
+        segments reach WebSocket clients as stt_partial events tagged with
+        request_id (a form field or query parameter the client may set).
+        """
+        stt = self.orchestrator.stt
+        if not stt and not self.voice_service:
              return web.json_response({"success": False, "error": "Voice Service not initialized"})
 
         try:
             # Read multipart data for file upload
             reader = await request.multipart()
             audio_data = None
+            fields = {}
             
             while True:
                 part = await reader.next()
@@ -3395,20 +3851,49 @@ User query: {user_input}"""
                     break
                 if part.name == 'audio':
                     audio_data = await part.read()
-                    break
+                elif part.name in ('request_id', 'language'):
+                    fields[part.name] = (await part.text()).strip() or None
             
             if not audio_data:
                 return web.json_response({"success": False, "error": "No audio file provided"})
 
-            # Process with Unified Voice Service
-            result = await self.voice_service.process_audio_blob(audio_data)
-            
-            return web.json_response(result)
+            if not stt:
+                # Process with Unified Voice Service
+                result = await self.voice_service.process_audio_blob(audio_data)
+                return web.json_response(result)
+
+            transcript = await stt.transcribe(
+                audio_data,
+                request_id=fields.get("request_id") or request.query.get("request_id"),
+                language=fields.get("language") or request.query.get("language"),
+            )
+            text = transcript["text"]
+            response_text, response_audio_path = None, None
+            if text:
+                response_text = await self.parse_voice_command(text) or await self._generate_asirem_response(text)
+                if self.orchestrator.speaking_engine:
+                    rendered = await self.orchestrator.speaking_engine.render(response_text, priority=PRIORITY_URGENT)
+                    response_audio_path = self._output_url(rendered.get("audio_path"))
+
+            return web.json_response({
+                "success": True,
+                "transcript": text,
+                "response": response_text,
+                "audio_path": response_audio_path,
+                "stt": transcript,
+            })
 
         except Exception as e:
             print(f"Podcast Audio Error: {e}")
             return web.json_response({"success": False, "error": str(e)})
 
+    async def handle_stt_metrics(self, request):
+        """Whisper pool metrics: queue depth, in-flight work, real-time factor."""
+        stt = self.orchestrator.stt
+        if not stt:
+            return web.json_response({"success": False, "error": "STT service not loaded"})
+        return web.json_response({"success": True, **stt.metrics()})
+
 
     
     async def handle_podcast_video(self, request):
@@ -3494,7 +3979,7 @@ User query: {user_input}"""
             # Then speak it
             result = await self.orchestrator.speaking_engine.speak(response)
             if result and 'audio_path' in result:
-                await self.broadcast_event('podcast_audio', {'audio_path': result['audio_path']})
+                await self.broadcast_event('podcast_audio', {'audio_path': self._output_url(result['audio_path'])})
         except Exception as e:
             print(f"Speaking error: {e}")
 
@@ -3563,86 +4048,208 @@ User query: {user_input}"""
             return web.json_response({"success": False, "error": str(e)}, status=200)
 
     async def handle_memory_store(self, request):
-        """Store content in memory agent."""
+        """Store content in the shared memory service."""
         try:
+            if self.memory_service is None:
+                return web.json_response({"success": False, "error": "Memory service unavailable"}, status=200)
             data = await request.json()
             content = data.get("content", "")
             metadata = data.get("metadata", {})
+            if not content:
+                return web.json_response({"success": False, "error": "No content provided"}, status=200)
             
-            import sys
-            from pathlib import Path
-            sys.path.insert(0, str(Path(__file__).parent.parent))
-            from azirem_agents.memory_agent import MemoryAgent
-            
-            agent = MemoryAgent()
-            memory_id = await agent.remember(content, metadata)
+            memory_id = await self.memory_service.remember(content, metadata)
             
             return web.json_response({
                 "success": True,
                 "memory_id": memory_id,
-                "status": agent.get_status()
+                "status": self.memory_service.get_status()
             })
         except Exception as e:
             return web.json_response({"success": False, "error": str(e)}, status=200)
     
     async def handle_memory_search(self, request):
-        """Search memory agent."""
+        """Search the shared memory service."""
         try:
+            if self.memory_service is None:
+                return web.json_response({"success": False, "error": "Memory service unavailable"}, status=200)
             query = request.query.get("q", "")
-            n = int(request.query.get("n", 5))
-            
-            sys.path.insert(0, str(Path(__file__).parent.parent))
-            from azirem_agents.memory_agent import MemoryAgent
-            
-            agent = MemoryAgent()
-            results = await agent.recall(query, n)
+            n = max(1, min(int(request.query.get("n", 5)), 100))
+            offset = max(0, int(request.query.get("offset", 0)))
+            if "page" in request.query:
+                offset = max(0, int(request.query["page"]) - 1) * n
+            mode = request.query.get("mode", "hybrid")
+            if mode not in ("hybrid", "lexical", "vector"):
+                mode = "hybrid"
+            # Metadata filters: ?filter={"type": "note"} and/or ?meta.type=note (repeatable)
+            filters = json.loads(request.query.get("filter") or "{}")
+            for key in {k for k in request.query if k.startswith("meta.")}:
+                filters[key[5:]] = request.query.getall(key)
+            
+            page = await self.memory_service.search(query, n, offset, filters, mode) if query else {"results": [], "candidates": 0}
+            results = page["results"]
             
             return web.json_response({
                 "query": query,
                 "results": results,
-                "count": len(results)
+                "count": len(results),
+                "offset": offset,
+                "limit": n,
+                "candidates": page["candidates"],
+                "next_offset": offset + n if offset + n < page["candidates"] else None
             })
         except Exception as e:
             return web.json_response({"success": False, "error": str(e)}, status=200)
     
+    # ==========================================================================
+    # VECTOR INDEX (server-owned, shared by every embedding request)
+    # ==========================================================================
+
+    def _load_vector_index(self) -> "VectorIndex":
+        """Restore the last snapshot, or start empty if there is none or the model changed."""
+        dim = self.orchestrator.embedding.engine.dim
+        self.vector_index_dir.mkdir(parents=True, exist_ok=True)
+        self.document_store = DocumentStore(str(self.vector_index_dir / "documents.db"))
+        if (self.vector_index_dir / "index.json").exists():
+            try:
+                index = VectorIndex.load(str(self.vector_index_dir))
+                if index.dim == dim:
+                    # Older snapshots kept text in the metadata: move it to the document store
+                    legacy = [(doc_id, meta.pop("text")) for doc_id, meta in index.metadata.items() if "text" in meta]
+                    self.document_store.put_many(legacy)
+                    return index
+                print(f"⚠️ Vector snapshot has dim {index.dim}, engine has {dim}: starting empty")
+            except Exception as e:
+                print(f"⚠️ Vector snapshot unreadable ({e}): starting empty")
+        return VectorIndex(dim)
+
+    def _schedule_vector_snapshot(self, delay: float = 30.0):
+        """Debounced snapshot: many writes in a burst produce one save."""
+        if self._vector_snapshot_task and not self._vector_snapshot_task.done():
+            return
+
+        async def snapshot():
+            await asyncio.sleep(delay)
+            try:
+                await asyncio.to_thread(self.vector_index.save, str(self.vector_index_dir))
+            except Exception as e:
+                print(f"⚠️ Vector snapshot failed: {e}")
+
+        self._vector_snapshot_task = asyncio.create_task(snapshot())
+
     async def handle_embedding_index(self, request):
-        """Index content with embedding agent."""
+        """Index content (one document, or a batch under "items") into the vector index."""
         try:
+            if self.vector_index is None:
+                return web.json_response({"success": False, "error": "Vector index unavailable"}, status=200)
             data = await request.json()
-            text = data.get("text", "")
-            doc_id = data.get("id", f"doc_{int(time.time())}")
-            metadata = data.get("metadata", {})
-            
-            sys.path.insert(0, str(Path(__file__).parent.parent))
-            from azirem_agents.embedding_agent import EmbeddingAgent
-            
-            agent = EmbeddingAgent()
-            result = await agent.index_text(doc_id, text, metadata)
-            
+            items = data.get("items") or [data]
+            docs = []
+            for n, item in enumerate(items):
+                text = item.get("text", "")
+                if not text:
+                    continue
+                doc_id = str(item.get("id") or f"doc_{int(time.time() * 1000)}_{n}")
+                docs.append((doc_id, text, item.get("metadata") or {}))
+            if not docs:
+                return web.json_response({"success": False, "error": "No text provided"}, status=200)
+
+            vectors = await self.orchestrator.embedding.engine.embed([text for _, text, _ in docs])
+            await asyncio.to_thread(
+                self.vector_index.add,
+                [doc_id for doc_id, _, _ in docs],
+                vectors,
+                [metadata for _, _, metadata in docs],
+            )
+            await asyncio.to_thread(self.document_store.put_many, [(doc_id, text) for doc_id, text, _ in docs])
+            self._schedule_vector_snapshot()
+
             return web.json_response({
-                "success": result is not None,
-                "id": doc_id,
-                "status": agent.get_status()
+                "success": True,
+                "id": docs[0][0],
+                "ids": [doc_id for doc_id, _, _ in docs],
+                "status": self.vector_index.stats()
             })
         except Exception as e:
             return web.json_response({"success": False, "error": str(e)}, status=200)
-    
+
+    async def handle_embedding_ingest(self, request):
+        """Start one bulk ingestion job over the scanned files (or an explicit "paths" list)."""
+        try:
+            ingestion = getattr(self.orchestrator, "ingestion", None)
+            if ingestion is None:
+                return web.json_response({"success": False, "error": "Ingestion unavailable"}, status=200)
+            data = await request.json() if request.can_read_body else {}
+            files = data.get("paths")
+            full = not files  # the scanned workspace is complete; an explicit list is not
+            if not files:
+                scanner = getattr(self.orchestrator, "scanner", None)
+                files = list(getattr(scanner, "scanned_files", None) or [])
+            if not files:
+                return web.json_response({"success": False, "error": "No files to ingest; run a scan first"}, status=200)
+            started = ingestion.start(files, full=full)
+            return web.json_response({
+                "success": started,
+                "files": len(files),
+                "error": None if started else "An ingestion job is already running",
+                "progress": ingestion.stats.to_dict()
+            })
+        except Exception as e:
+            return web.json_response({"success": False, "error": str(e)}, status=200)
+
+    async def handle_embedding_ingest_status(self, request):
+        """Progress of the current (or last) ingestion job."""
+        ingestion = getattr(self.orchestrator, "ingestion", None)
+        if ingestion is None:
+            return web.json_response({"success": False, "error": "Ingestion unavailable"}, status=200)
+        return web.json_response({
+            "running": ingestion.running,
+            "progress": ingestion.stats.to_dict(),
+            "index": self.vector_index.stats()
+        })
+
+    async def handle_embedding_delete(self, request):
+        """Remove documents from the vector index by id."""
+        try:
+            if self.vector_index is None:
+                return web.json_response({"success": False, "error": "Vector index unavailable"}, status=200)
+            data = await request.json()
+            ids = data.get("ids") or ([data["id"]] if data.get("id") else [])
+            ids = [str(i) for i in ids]
+            removed = await asyncio.to_thread(self.vector_index.delete, ids)
+            await asyncio.to_thread(self.document_store.delete, ids)
+            if removed:
+                self._schedule_vector_snapshot()
+            return web.json_response({"success": True, "removed": removed, "status": self.vector_index.stats()})
+        except Exception as e:
+            return web.json_response({"success": False, "error": str(e)}, status=200)
+
     async def handle_embedding_search(self, request):
-        """Semantic search via embedding agent."""
+        """Semantic search over the in-process vector index."""
         try:
+            if self.vector_index is None:
+                return web.json_response({"success": False, "error": "Vector index unavailable"}, status=200)
             query = request.query.get("q", "")
-            k = int(request.query.get("k", 5))
-            
-            sys.path.insert(0, str(Path(__file__).parent.parent))
-            from azirem_agents.embedding_agent import EmbeddingAgent
-            
-            agent = EmbeddingAgent()
-            results = await agent.search(query, k)
-            
+            k = max(1, min(int(request.query.get("k", 5)), 100))
+            if not query:
+                return web.json_response({"query": query, "results": [], "status": self.vector_index.stats()})
+
+            vectors = await self.orchestrator.embedding.engine.embed([query])
+            hits = await asyncio.to_thread(self.vector_index.search, vectors[0], k)
+            texts = await asyncio.to_thread(self.document_store.get_many, [doc_id for doc_id, _ in hits])
+            results = []
+            for doc_id, score in hits:
+                results.append({
+                    "id": doc_id,
+                    "score": round(score, 4),
+                    "text": texts.get(doc_id, ""),
+                    "metadata": self.vector_index.metadata.get(doc_id, {}),
+                })
+
             return web.json_response({
                 "query": query,
                 "results": results,
-                "status": agent.get_status()
+                "status": self.vector_index.stats()
             })
         except Exception as e:
             return web.json_response({"success": False, "error": str(e)}, status=200)
@@ -4916,6 +5523,9 @@ User query: {user_input}"""
         app.router.add_get("/api/memory/search", self.handle_memory_search)
         app.router.add_post("/api/embedding/index", self.handle_embedding_index)
         app.router.add_get("/api/embedding/search", self.handle_embedding_search)
+        app.router.add_post("/api/embedding/delete", self.handle_embedding_delete)
+        app.router.add_post("/api/embedding/ingest", self.handle_embedding_ingest)
+        app.router.add_get("/api/embedding/ingest", self.handle_embedding_ingest_status)
         app.router.add_post("/api/docgen/readme", self.handle_docgen_readme)
         app.router.add_post("/api/docgen/api", self.handle_docgen_api)
         app.router.add_post("/api/mcp/github", self.handle_mcp_github)
@@ -4929,6 +5539,7 @@ User query: {user_input}"""
         app.router.add_post("/api/workflow/zen-architect", self.handle_zen_architect)
         app.router.add_post("/api/podcast/ask", self.handle_podcast_ask)
         app.router.add_post("/api/podcast/audio", self.handle_podcast_audio)  # NEW Audio Blob Handler
+        app.router.add_get("/api/stt/metrics", self.handle_stt_metrics)
         app.router.add_post("/api/podcast/video", self.handle_podcast_video)
         app.router.add_get("/api/podcast/stream", self.handle_podcast_stream)
         
@@ -5085,6 +5696,34 @@ User query: {user_input}"""
             print("🔬 [DEBUG] About to call orchestrator.initialize()...")
             await self.orchestrator.initialize()
             print("✅ [DEBUG] Orchestrator initialization completed!")
+
+            # Long-lived vector index for /api/embedding/*
+            if self.orchestrator.embedding and VECTOR_INDEX_OK:
+                try:
+                    self.vector_index = await asyncio.to_thread(self._load_vector_index)
+                    print(f"🧭 Vector Index: {self.vector_index.stats()['vectors']} vectors loaded")
+                except Exception as e:
+                    print(f"⚠️ Vector Index failed: {e}")
+                if self.vector_index is not None:
+                    self.orchestrator.ingestion = IngestionPipeline(
+                        self.orchestrator.embedding.engine,
+                        self.vector_index,
+                        self.orchestrator.file_reader or SharedFileReader(self.bytebot_bridge),
+                        documents=self.document_store,
+                        on_progress=self.orchestrator.broadcast_event,
+                        on_complete=lambda summary: self._schedule_vector_snapshot(delay=1.0),
+                        batch_size=int(os.getenv("ASIREM_INGEST_BATCH", "128")),
+                    )
+                # Memory service: storage, model and index are opened once for the server's lifetime
+                try:
+                    self.memory_service = create_memory_service(
+                        str(PROJECT_ROOT / ".asirem_memory.db"), self.orchestrator.embedding.engine
+                    )
+                    await self.memory_service.start()
+                    print(f"🧠 Memory Service: {self.memory_service.get_status()['memories']} memories loaded")
+                except Exception as e:
+                    print(f"⚠️ Memory Service failed: {e}")
+                    self.memory_service = None
             
             self._heartbeat_task = asyncio.create_task(self.start_heartbeat())
             print("💓 Heartbeat task started")
@@ -5135,6 +5774,29 @@ User query: {user_input}"""
         async def on_cleanup(app):
             if self._heartbeat_task: self._heartbeat_task.cancel()
             self.orchestrator.watcher.stop()
+            for ws in list(self.orchestrator.ws_channels):
+                self.orchestrator.unregister_ws_client(ws)
+            shutdown_audit_pool()
+            if getattr(self.orchestrator, "file_reader", None):
+                self.orchestrator.file_reader.close()
+            if self.vector_index is not None:
+                if self._vector_snapshot_task:
+                    self._vector_snapshot_task.cancel()
+                try:
+                    await asyncio.to_thread(self.vector_index.save, str(self.vector_index_dir))
+                except Exception as e:
+                    print(f"⚠️ Vector snapshot failed: {e}")
+            if self.document_store is not None:
+                self.document_store.close()
+            if self.memory_service is not None:
+                await self.memory_service.close()
+            if getattr(self.orchestrator, "speaking_engine", None):
+                self.orchestrator.speaking_engine.close()
+            if self.orchestrator.stt:
+                await self.orchestrator.stt.close()
+            if getattr(self.orchestrator.asirem, "bytebot_overlay", None):
+                await self.orchestrator.asirem.bytebot_overlay.close()
+            await close_http_client()
             
         app.on_startup.append(on_startup)
         app.on_cleanup.append(on_cleanup)
@@ -1,4 +1,81 @@
+import asyncio
+import io
+import os
+import tarfile
+
+BYTEBOT_CONTAINER = os.getenv("BYTEBOT_CONTAINER", "bytebot-desktop")
+
+
 class ByteBotAgentBridge:
-    def __init__(self, *a, **kw): self.connected = False
+    def __init__(self, *a, **kw):
+        self.connected = False
+        self.container = kw.get("container", BYTEBOT_CONTAINER)
+
     async def connect(self): pass
     async def execute(self, cmd): return {'success': False, 'error': 'Bridge stub'}
+
+    async def read_container_file(self, path: str, max_bytes: int = None, sizes: dict = None) -> str:
+        """
+        Read one container file. With max_bytes only the first max_bytes cross
+        docker exec; sizes, if given, receives the file's full size in bytes.
+        """
+        if not max_bytes:
+            return (await self.read_container_files([path], sizes=sizes)).get(path, "")
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "docker", "exec", self.container,
+                "sh", "-c", 'stat -c %s -- "$1" && head -c "$2" -- "$1"', "sh", path, str(max_bytes),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            output, _ = await proc.communicate()
+        except Exception as e:
+            print(f"⚠️ ByteBot read failed: {e}")
+            return ""
+        size, _, data = output.partition(b"\n")
+        if proc.returncode != 0 or not size.strip().isdigit():
+            return ""
+        if sizes is not None:
+            sizes[path] = int(size)
+        return data.decode("utf-8", errors="ignore")
+
+    async def read_container_files(self, paths, batch_size: int = 200, max_bytes: int = None,
+                                   sizes: dict = None) -> dict:
+        """
+        Read many container files with one `docker exec tar` round trip per batch. Returns {path: text}.
+
+        max_bytes caps what is decoded per file; sizes, if given, receives
+        each file's full size in bytes so callers can tell a capped read.
+        """
+        results = {}
+        paths = list(dict.fromkeys(str(p) for p in paths))
+        for start in range(0, len(paths), batch_size):
+            batch = paths[start:start + batch_size]
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    "docker", "exec", "-i", self.container,
+                    "tar", "-cf", "-", "-P", "--ignore-failed-read", "--null", "-T", "-",
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                archive, _ = await proc.communicate("\0".join(batch).encode() + b"\0")
+            except Exception as e:
+                print(f"⚠️ ByteBot batch read failed: {e}")
+                continue
+            try:
+                with tarfile.open(fileobj=io.BytesIO(archive), mode="r|") as tar:
+                    for member in tar:
+                        if not member.isfile():
+                            continue
+                        f = tar.extractfile(member)
+                        data = f.read(max_bytes) if max_bytes else f.read()
+                        name = "/" + member.name.lstrip("/")
+                        results[name] = (data.decode("utf-8", errors="ignore"), member.size)
+            except tarfile.TarError as e:
+                print(f"⚠️ ByteBot batch read: bad archive ({e})")
+        # Callers may pass paths without a leading slash; answer under the name they asked for
+        found = {p: results["/" + p.lstrip("/")] for p in paths if ("/" + p.lstrip("/")) in results}
+        if sizes is not None:
+            sizes.update((p, size) for p, (_, size) in found.items())
+        return {p: text for p, (text, _) in found.items()}
@@ -0,0 +1,57 @@
+"""
+Document Store — SQLite home for the text behind vector index entries.
+
+The vector index snapshot keeps only ids and small metadata, so loading it
+stays cheap at large vector counts. The text itself lives here, keyed by
+the same ids, and is fetched only for the hits a search actually returns.
+"""
+
+import sqlite3
+import threading
+from typing import Dict, Iterable, Sequence, Tuple
+
+
+class DocumentStore:
+    """id -> text table in WAL mode, safe to call from worker threads."""
+
+    def __init__(self, db_path: str):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS documents (id TEXT PRIMARY KEY, text TEXT NOT NULL)")
+        self._conn.commit()
+
+    def put_many(self, items: Sequence[Tuple[str, str]]):
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO documents (id, text) VALUES (?, ?)", items)
+            self._conn.commit()
+
+    def get_many(self, ids: Iterable[str]) -> Dict[str, str]:
+        ids = list(ids)
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            rows = self._conn.execute(f"SELECT id, text FROM documents WHERE id IN ({placeholders})", ids).fetchall()
+        return dict(rows)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        ids = [(doc_id,) for doc_id in ids]
+        if not ids:
+            return 0
+        with self._lock:
+            removed = self._conn.executemany("DELETE FROM documents WHERE id = ?", ids).rowcount
+            self._conn.commit()
+        return removed
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
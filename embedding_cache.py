@@ -0,0 +1,119 @@
+"""
+Embedding Cache — content-addressed, persistent vector store per model.
+
+Vectors are keyed by (model id, SHA-1 of the chunk text). Each model gets
+two append-only files in the cache directory:
+
+    <model>.f32   raw float32 rows, memory-mapped for reads
+    <model>.keys  one hex digest per line, row i <-> line i
+
+Lookups are batched: get_many() returns the rows it has plus the positions
+it is missing, so only misses go to the model. A torn write (crash between
+the two appends) is healed on load by trusting the shorter of the two.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha1((text or "").encode("utf-8", errors="ignore")).hexdigest()
+
+
+class EmbeddingCache:
+    """Append-only memmapped float32 matrix plus an in-memory key -> row index."""
+
+    def __init__(self, directory: str, model_id: str, dim: int):
+        self.directory = str(directory)
+        self.model_id = model_id
+        self.dim = dim
+        os.makedirs(self.directory, exist_ok=True)
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_id)
+        self.vectors_path = os.path.join(self.directory, f"{safe}.f32")
+        self.keys_path = os.path.join(self.directory, f"{safe}.keys")
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._rows = 0
+        self._matrix: Optional[np.memmap] = None
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self):
+        keys: List[str] = []
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, "r") as f:
+                keys = [line.strip() for line in f if line.strip()]
+        row_bytes = self.dim * 4
+        vector_rows = os.path.getsize(self.vectors_path) // row_bytes if os.path.exists(self.vectors_path) else 0
+        rows = min(len(keys), vector_rows)
+        if rows != len(keys) or rows != vector_rows:
+            # Heal a torn append so both files describe the same rows
+            with open(self.keys_path, "w") as f:
+                f.writelines(k + "\n" for k in keys[:rows])
+            with open(self.vectors_path, "ab") as f:
+                f.truncate(rows * row_bytes)
+        self._index = {key: i for i, key in enumerate(keys[:rows])}
+        self._rows = rows
+        self._matrix = None
+
+    def _view(self) -> Optional[np.memmap]:
+        if self._rows == 0:
+            return None
+        if self._matrix is None or self._matrix.shape[0] != self._rows:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self._rows, self.dim))
+        return self._matrix
+
+    def __len__(self):
+        return self._rows
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def get_many(self, keys: Sequence[str]) -> Tuple[np.ndarray, List[int]]:
+        """Return (matrix with cached rows filled, positions that were not cached)."""
+        out = np.zeros((len(keys), self.dim), dtype=np.float32)
+        missing: List[int] = []
+        with self._lock:
+            rows = [self._index.get(k) for k in keys]
+            found = [(i, r) for i, r in enumerate(rows) if r is not None]
+            if found:
+                positions, source_rows = zip(*found)
+                # One fancy-indexed gather from the memmap instead of a row-by-row copy
+                out[list(positions)] = self._view()[list(source_rows)]
+            missing = [i for i, r in enumerate(rows) if r is None]
+            self.hits += len(found)
+            self.misses += len(missing)
+        return out, missing
+
+    def put_many(self, keys: Sequence[str], vectors: np.ndarray):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock:
+            new = [(k, i) for i, k in enumerate(keys) if k not in self._index]
+            seen = set()
+            new = [(k, i) for k, i in new if not (k in seen or seen.add(k))]
+            if not new:
+                return
+            with open(self.vectors_path, "ab") as f:
+                f.write(vectors[[i for _, i in new]].tobytes())
+            with open(self.keys_path, "a") as f:
+                f.writelines(k + "\n" for k, _ in new)
+            for k, _ in new:
+                self._index[k] = self._rows
+                self._rows += 1
+
+    def stats(self) -> Dict[str, object]:
+        total = self.hits + self.misses
+        return {
+            "model_id": self.model_id,
+            "rows": self._rows,
+            "bytes": self._rows * self.dim * 4,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
@@ -0,0 +1,198 @@
+"""
+Embedding Engine — pluggable local text embedding backends.
+
+Backends turn a batch of texts into an (n, dim) float32 NumPy matrix with
+L2-normalized rows, so cosine similarity is a plain dot product.
+
+- hashing: dependency-free (NumPy only) feature-hashing embedder over word
+  unigrams/bigrams and character trigrams. Deterministic across processes.
+- sentence-transformers: a small CPU sentence-transformer model, used when
+  the package is installed.
+
+EmbeddingEngine batches requests and runs the backend on a dedicated worker
+thread, so the event loop never blocks on vectorization.
+
+Configured via ASIREM_EMBEDDING_BACKEND (hashing | sentence-transformers),
+ASIREM_EMBEDDING_MODEL and ASIREM_EMBEDDING_DIM. ASIREM_EMBEDDING_CACHE points
+at the persistent content-addressed vector cache (see embedding_cache.py).
+"""
+
+import asyncio
+import math
+import os
+import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
+try:
+    import numpy as np
+    NUMPY_OK = True
+except ImportError:
+    NUMPY_OK = False
+
+try:
+    from embedding_cache import EmbeddingCache, text_key
+except ImportError:  # numpy missing
+    EmbeddingCache = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_OK = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_OK = False
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+
+class EmbeddingBackend:
+    """Base class: embed_batch(texts) -> float32 array of shape (len(texts), dim)."""
+
+    model_id = "base"
+    dim = 0
+
+    def embed_batch(self, texts: Sequence[str]) -> "np.ndarray":
+        raise NotImplementedError
+
+
+class HashingEmbedder(EmbeddingBackend):
+    """Signed feature hashing with sublinear term weights, L2-normalized."""
+
+    def __init__(self, dim: int = 384, char_ngrams: int = 3):
+        if not NUMPY_OK:
+            raise RuntimeError("HashingEmbedder requires numpy")
+        self.dim = dim
+        self.char_ngrams = char_ngrams
+        self.model_id = f"hashing-v1-{dim}-c{char_ngrams}"
+
+    def _features(self, text: str) -> dict:
+        tokens = _TOKEN_RE.findall(text.lower())
+        counts: dict = {}
+        for token in tokens:
+            counts["w:" + token] = counts.get("w:" + token, 0) + 1
+        for first, second in zip(tokens, tokens[1:]):
+            key = "b:" + first + " " + second
+            counts[key] = counts.get(key, 0) + 1
+        if self.char_ngrams:
+            n = self.char_ngrams
+            for token in tokens:
+                padded = f"<{token}>"
+                for i in range(len(padded) - n + 1):
+                    key = "c:" + padded[i:i + n]
+                    counts[key] = counts.get(key, 0) + 0.5
+        return counts
+
+    def embed_batch(self, texts: Sequence[str]) -> "np.ndarray":
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vec = out[row]
+            for feature, count in self._features(text or "").items():
+                h = zlib.crc32(feature.encode("utf-8"))
+                # Low bits pick the bucket, bit 31 the sign (keeps collisions unbiased)
+                vec[h % self.dim] += (1.0 + math.log(count)) * (1.0 if h & 0x80000000 else -1.0)
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+
+class SentenceTransformerEmbedder(EmbeddingBackend):
+    """CPU sentence-transformer backend (e.g. all-MiniLM-L6-v2)."""
+
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2", batch_size: int = 32):
+        if not (NUMPY_OK and SENTENCE_TRANSFORMERS_OK):
+            raise RuntimeError("sentence-transformers is not installed")
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.batch_size = batch_size
+        self.dim = int(self.model.get_sentence_embedding_dimension())
+        self.model_id = f"st-{model_name}"
+
+    def embed_batch(self, texts: Sequence[str]) -> "np.ndarray":
+        vectors = self.model.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class EmbeddingEngine:
+    """Batches texts through a backend on a single worker thread."""
+
+    def __init__(self, backend: EmbeddingBackend, batch_size: int = 64, cache_dir: str = None):
+        self.backend = backend
+        self.batch_size = max(1, batch_size)
+        # Content-addressed vectors from earlier runs: only unseen chunk texts reach the model
+        self.cache = EmbeddingCache(cache_dir, backend.model_id, backend.dim) if cache_dir else None
+        # One thread: the backends are CPU-bound and already vectorized
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
+
+    @property
+    def model_id(self) -> str:
+        return self.backend.model_id
+
+    @property
+    def dim(self) -> int:
+        return self.backend.dim
+
+    def zeros(self, n: int) -> "np.ndarray":
+        return np.zeros((n, self.dim), dtype=np.float32)
+
+    def _embed_uncached(self, texts: Sequence[str]) -> "np.ndarray":
+        parts = [
+            self.backend.embed_batch(texts[i:i + self.batch_size])
+            for i in range(0, len(texts), self.batch_size)
+        ]
+        return parts[0] if len(parts) == 1 else np.vstack(parts)
+
+    def embed_sync(self, texts: Sequence[str]) -> "np.ndarray":
+        texts = list(texts)
+        if not texts:
+            return self.zeros(0)
+        if self.cache is None:
+            return self._embed_uncached(texts)
+
+        keys = [text_key(t) for t in texts]
+        out, missing = self.cache.get_many(keys)
+        if missing:
+            # Embed each distinct missing text once, then scatter to every position that needs it
+            first_pos: dict = {}
+            for pos in missing:
+                first_pos.setdefault(keys[pos], pos)
+            unique_keys = list(first_pos)
+            vectors = self._embed_uncached([texts[first_pos[k]] for k in unique_keys])
+            self.cache.put_many(unique_keys, vectors)
+            row_of = {k: i for i, k in enumerate(unique_keys)}
+            out[missing] = vectors[[row_of[keys[pos]] for pos in missing]]
+        return out
+
+    async def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.embed_sync, list(texts))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+def create_embedding_engine(backend: str = None, cache_dir: str = None) -> EmbeddingEngine:
+    """Build the configured engine, falling back to the hashing backend."""
+    backend = (backend or os.getenv("ASIREM_EMBEDDING_BACKEND", "hashing")).lower()
+    batch_size = int(os.getenv("ASIREM_EMBEDDING_BATCH", "64"))
+    cache_dir = os.getenv("ASIREM_EMBEDDING_CACHE", cache_dir or "")
+    if cache_dir.lower() in ("off", "none", "0"):
+        cache_dir = ""
+    chosen = None
+    if backend in ("sentence-transformers", "sentence_transformers", "st"):
+        try:
+            model = os.getenv("ASIREM_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+            chosen = SentenceTransformerEmbedder(model)
+        except Exception as e:
+            print(f"⚠️ Sentence-transformer backend unavailable ({e}); using hashing embedder")
+    if chosen is None:
+        chosen = HashingEmbedder(dim=int(os.getenv("ASIREM_EMBEDDING_DIM", "384")))
+    try:
+        return EmbeddingEngine(chosen, batch_size=batch_size, cache_dir=cache_dir or None)
+    except OSError as e:
+        print(f"⚠️ Embedding cache unavailable ({e}); embedding without cache")
+        return EmbeddingEngine(chosen, batch_size=batch_size)
@@ -0,0 +1,260 @@
+"""
+Shared File Reader — one non-blocking, cached read path for every agent.
+
+Reads run on a small thread pool so the event loop never blocks on disk.
+Large files are read through mmap, everything is capped at max_bytes (with
+truncated() telling callers which reads were cut short), and binaries are
+detected from the first block and skipped. Recently read
+content is kept in an LRU keyed by (path, mtime_ns, size), so the security,
+QA and evolution passes over the same file cost a single read. Concurrent
+reads of the same path share one in-flight future.
+
+ByteBot container paths (bytebot://...) go through the bridge; they cannot
+be stat'ed from the host and are cached for a short TTL instead. prefetch()
+fetches many of them per round trip via the bridge's batched tar read.
+"""
+
+import asyncio
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BINARY_SNIFF_BYTES = 8192
+
+
+def looks_binary(block: bytes) -> bool:
+    return b"\x00" in block[:BINARY_SNIFF_BYTES]
+
+
+class SharedFileReader:
+    """Async file reader with thread-pool I/O, mmap for large files and an LRU cache."""
+
+    def __init__(self, bytebot_bridge=None,
+                 max_bytes: int = None,
+                 mmap_threshold: int = 256 * 1024,
+                 cache_entries: int = 512,
+                 cache_bytes: int = 64 * 1024 * 1024,
+                 container_ttl: float = 60.0,
+                 container_batch_size: int = 200,
+                 max_workers: int = 8):
+        self.bytebot_bridge = bytebot_bridge
+        self.max_bytes = max_bytes or int(os.getenv("ASIREM_READ_MAX_BYTES", str(2 * 1024 * 1024)))
+        self.mmap_threshold = mmap_threshold
+        self.cache_entries = cache_entries
+        self.cache_bytes = cache_bytes
+        self.container_ttl = container_ttl
+        self.container_batch_size = container_batch_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="file-reader")
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, Tuple[tuple, str]]" = OrderedDict()
+        self._cached_bytes = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.binary_skipped = 0
+        self.bytes_read = 0
+        self._truncated: set = set()  # paths whose cached content stops at max_bytes
+
+    # ------------------------------------------------------------------ cache
+
+    def _cache_get(self, path: str, key: tuple) -> Optional[str]:
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry is None or entry[0] != key:
+                return None
+            self._cache.move_to_end(path)
+            self.hits += 1
+            return entry[1]
+
+    def _cache_put(self, path: str, key: tuple, text: str):
+        with self._lock:
+            old = self._cache.pop(path, None)
+            if old is not None:
+                self._cached_bytes -= len(old[1])
+            self._cache[path] = (key, text)
+            self._cached_bytes += len(text)
+            while self._cache and (len(self._cache) > self.cache_entries or self._cached_bytes > self.cache_bytes):
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+
+    def _container_get(self, path: str) -> Optional[str]:
+        """Cached container content if it was fetched within container_ttl."""
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry is None or entry[0][0] != "container" or time.monotonic() - entry[0][1] > self.container_ttl:
+                return None
+            self._cache.move_to_end(path)
+            self.hits += 1
+            return entry[1]
+
+    def _note_truncated(self, path: str, truncated: bool):
+        with self._lock:
+            if truncated:
+                self._truncated.add(path)
+            else:
+                self._truncated.discard(path)
+
+    def _clip(self, text: str, size: int) -> Tuple[str, bool]:
+        """Cap decoded container text at max_bytes of UTF-8; size is the file's full byte size."""
+        data = text.encode("utf-8")
+        if len(data) > self.max_bytes:
+            text = data[:self.max_bytes].decode("utf-8", errors="ignore")
+        return text, max(size, len(data)) > self.max_bytes
+
+    def truncated(self, path) -> bool:
+        """True if the last read of path returned only its first max_bytes."""
+        return str(path) in self._truncated
+
+    def invalidate(self, path: str = None):
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+                self._cached_bytes = 0
+                return
+            old = self._cache.pop(str(path), None)
+            if old is not None:
+                self._cached_bytes -= len(old[1])
+
+    # ------------------------------------------------------------------ reads
+
+    def read_sync(self, path: str) -> str:
+        """Blocking local read (cached). Returns "" for missing or binary files."""
+        path = str(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return ""
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._cache_get(path, key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            self.misses += 1
+
+        text = ""
+        try:
+            with open(path, "rb") as f:
+                if st.st_size >= self.mmap_threshold:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if looks_binary(mm[:BINARY_SNIFF_BYTES]):
+                            data = None
+                        else:
+                            data = mm[:self.max_bytes]
+                else:
+                    data = f.read(self.max_bytes)
+                    if looks_binary(data):
+                        data = None
+            if data is None:
+                with self._lock:
+                    self.binary_skipped += 1
+            else:
+                with self._lock:
+                    self.bytes_read += len(data)
+                text = data.decode("utf-8", errors="ignore")
+        except (OSError, ValueError):
+            return ""
+        self._note_truncated(path, data is not None and st.st_size > self.max_bytes)
+        self._cache_put(path, key, text)
+        return text
+
+    async def _read_container(self, path: str) -> str:
+        cached = self._container_get(path)
+        if cached is not None:
+            return cached
+        if not self.bytebot_bridge:
+            return ""
+        with self._lock:
+            self.misses += 1
+        remote = path.replace("bytebot://", "", 1)
+        sizes: Dict[str, int] = {}
+        try:
+            text = await self.bytebot_bridge.read_container_file(remote, max_bytes=self.max_bytes, sizes=sizes) or ""
+        except Exception:
+            return ""
+        if "\x00" in text[:BINARY_SNIFF_BYTES]:
+            self.binary_skipped += 1
+            text = ""
+        text, truncated = self._clip(text, sizes.get(remote, 0))
+        self._note_truncated(path, bool(text) and truncated)
+        self.bytes_read += len(text)
+        self._cache_put(path, ("container", time.monotonic()), text)
+        return text
+
+    async def read(self, path) -> str:
+        """Read a host or container file without blocking the event loop."""
+        path = str(path)
+        pending = self._in_flight.get(path)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        loop = asyncio.get_running_loop()
+        if path.startswith("bytebot://"):
+            future = asyncio.ensure_future(self._read_container(path))
+        else:
+            future = loop.run_in_executor(self._executor, self.read_sync, path)
+        self._in_flight[path] = future
+        future.add_done_callback(lambda f: self._in_flight.pop(path, None) if self._in_flight.get(path) is f else None)
+        return await asyncio.shield(future)
+
+    async def prefetch(self, paths: Iterable[str]) -> int:
+        """
+        Warm the cache for container paths in batched round trips.
+
+        Uses the bridge's read_container_files (one tar stream per batch) when
+        available; host paths are left to the normal per-file reads.
+        """
+        wanted = [str(p) for p in paths if str(p).startswith("bytebot://")]
+        wanted = [p for p in dict.fromkeys(wanted) if self._container_get(p) is None]
+        batch_read = getattr(self.bytebot_bridge, "read_container_files", None)
+        if not wanted or batch_read is None:
+            return 0
+        sizes: Dict[str, int] = {}
+        try:
+            contents = await batch_read([p.replace("bytebot://", "", 1) for p in wanted],
+                                        batch_size=self.container_batch_size, max_bytes=self.max_bytes, sizes=sizes)
+        except Exception as e:
+            print(f"⚠️ Container prefetch failed: {e}")
+            return 0
+        fetched = 0
+        for path in wanted:
+            remote = path.replace("bytebot://", "", 1)
+            text = contents.get(remote)
+            if text is None:
+                continue
+            if "\x00" in text[:BINARY_SNIFF_BYTES]:
+                self.binary_skipped += 1
+                text = ""
+            # Compare the file's byte size with the cap, not decoded characters
+            text, truncated = self._clip(text, sizes.get(remote, 0))
+            self._note_truncated(path, bool(text) and truncated)
+            with self._lock:
+                self.misses += 1
+                self.bytes_read += len(text)
+            self._cache_put(path, ("container", time.monotonic()), text)
+            fetched += 1
+        return fetched
+
+    async def read_many(self, paths: Iterable[str]) -> List[str]:
+        paths = [str(p) for p in paths]
+        if any(p.startswith("bytebot://") for p in paths):
+            await self.prefetch(paths)
+        return list(await asyncio.gather(*(self.read(p) for p in paths)))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "cached_files": len(self._cache),
+                "cached_bytes": self._cached_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "binary_skipped": self.binary_skipped,
+                "truncated": len(self._truncated),
+                "bytes_read": self.bytes_read,
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,127 @@
+"""
+Hedging — race several providers for one request, first good answer wins.
+
+LatencyTracker keeps a rolling window of per-provider latencies and
+failures. hedged_race() starts the fastest-looking provider immediately and
+launches each next one only if no good result has arrived after a hedge
+delay (derived from the leader's recent p90). As soon as any attempt returns
+a result that passes the quality check, everything still running is
+cancelled.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class LatencyTracker:
+    """Rolling per-provider latency samples and failure counts."""
+
+    def __init__(self, window: int = 100, default_latency: float = 1.0):
+        self.window = window
+        self.default_latency = default_latency
+        self._samples: Dict[str, deque] = {}
+        self.failures: Dict[str, int] = {}
+        self.wins: Dict[str, int] = {}
+
+    def record(self, provider: str, seconds: float, ok: bool = True):
+        if ok:
+            self._samples.setdefault(provider, deque(maxlen=self.window)).append(seconds)
+        else:
+            self.failures[provider] = self.failures.get(provider, 0) + 1
+
+    def record_win(self, provider: str):
+        self.wins[provider] = self.wins.get(provider, 0) + 1
+
+    def percentile(self, provider: str, pct: float) -> float:
+        samples = self._samples.get(provider)
+        if not samples:
+            return self.default_latency
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def rank(self, providers: Sequence[str]) -> List[str]:
+        """Order providers by median latency, penalizing recent failures."""
+        def score(name: str) -> float:
+            samples = self._samples.get(name)
+            failure_rate = self.failures.get(name, 0) / max(1, len(samples or ()) + self.failures.get(name, 0))
+            return self.percentile(name, 0.5) * (1.0 + 4.0 * failure_rate)
+        return sorted(providers, key=score)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        names = set(self._samples) | set(self.failures)
+        return {
+            name: {
+                "samples": len(self._samples.get(name, ())),
+                "p50": round(self.percentile(name, 0.5), 3),
+                "p90": round(self.percentile(name, 0.9), 3),
+                "p99": round(self.percentile(name, 0.99), 3),
+                "failures": self.failures.get(name, 0),
+                "wins": self.wins.get(name, 0),
+            }
+            for name in sorted(names)
+        }
+
+
+async def hedged_race(attempts: Sequence[Tuple[str, Callable[[], Awaitable[Any]]]],
+                      is_good: Callable[[Any], bool],
+                      tracker: Optional[LatencyTracker] = None,
+                      min_delay: float = 0.15,
+                      max_delay: float = 2.0,
+                      record_latency: bool = True) -> Tuple[Optional[str], Any]:
+    """
+    Run attempts in order with staggered starts; return (provider, result) of the first good one.
+
+    If none is good, the best-effort answer is the last non-empty result (or
+    (None, None) when every attempt failed). With record_latency=False the
+    tracker only steers hedge delays and counts wins; the attempts record
+    their own latencies (e.g. to leave cache hits out).
+    """
+    pending: Dict[asyncio.Task, Tuple[str, float]] = {}
+    fallback: Tuple[Optional[str], Any] = (None, None)
+    queue = list(attempts)
+
+    def launch():
+        name, factory = queue.pop(0)
+        task = asyncio.ensure_future(factory())
+        pending[task] = (name, time.perf_counter())
+        return name
+
+    try:
+        leader = launch()
+        while pending:
+            delay = None
+            if queue:
+                p90 = tracker.percentile(leader, 0.9) if tracker else max_delay
+                delay = min(max_delay, max(min_delay, p90))
+            done, _ = await asyncio.wait(list(pending), timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                # Hedge: the leader is slower than it usually is, start the next provider
+                leader = launch()
+                continue
+            for task in done:
+                name, started = pending.pop(task)
+                elapsed = time.perf_counter() - started
+                try:
+                    result = task.result()
+                except Exception:
+                    if tracker and record_latency:
+                        tracker.record(name, elapsed, ok=False)
+                    continue
+                if tracker and record_latency:
+                    tracker.record(name, elapsed, ok=True)
+                if is_good(result):
+                    if tracker:
+                        tracker.record_win(name)
+                    return name, result
+                if result:
+                    fallback = (name, result)
+            if not pending and queue:
+                # Everything in flight finished without a good answer: go straight to the next one
+                leader = launch()
+        return fallback
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,118 @@
+"""
+HTTP Client — one pooled aiohttp session for all outbound HTTP.
+
+Connections are kept alive and reused across requests (no per-query TLS
+handshake or curl subprocess), capped globally and per host, and DNS
+lookups are cached. The session is created lazily on first use and closed
+by the server's cleanup hook.
+
+Tuning via environment:
+    ASIREM_HTTP_LIMIT           total pooled connections (default 100)
+    ASIREM_HTTP_LIMIT_PER_HOST  connections per host (default 10)
+    ASIREM_HTTP_TIMEOUT         total request timeout in seconds (default 30)
+    ASIREM_HTTP_CONNECT_TIMEOUT connect timeout in seconds (default 5)
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+
+class SharedHTTPClient:
+    """Lifecycle-managed pooled ClientSession with JSON helpers."""
+
+    def __init__(self, limit: int = None, limit_per_host: int = None,
+                 total_timeout: float = None, connect_timeout: float = None,
+                 ttl_dns_cache: int = 300, keepalive_timeout: float = 30.0):
+        self.limit = limit or int(os.getenv("ASIREM_HTTP_LIMIT", "100"))
+        self.limit_per_host = limit_per_host or int(os.getenv("ASIREM_HTTP_LIMIT_PER_HOST", "10"))
+        self.total_timeout = total_timeout or float(os.getenv("ASIREM_HTTP_TIMEOUT", "30"))
+        self.connect_timeout = connect_timeout or float(os.getenv("ASIREM_HTTP_CONNECT_TIMEOUT", "5"))
+        self.ttl_dns_cache = ttl_dns_cache
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.requests = 0
+        self.errors = 0
+
+    async def session(self) -> aiohttp.ClientSession:
+        if self._session is not None and not self._session.closed:
+            return self._session
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    ttl_dns_cache=self.ttl_dns_cache,
+                    keepalive_timeout=self.keepalive_timeout,
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.total_timeout, connect=self.connect_timeout),
+                    headers={"User-Agent": "Sovereign-Ecosystem/1.0"},
+                )
+        return self._session
+
+    def _timeout(self, timeout: Optional[float]):
+        if timeout is None:
+            return None
+        return aiohttp.ClientTimeout(total=timeout, connect=min(self.connect_timeout, timeout))
+
+    async def get_json(self, url: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None,
+                       timeout: float = None) -> Tuple[int, Any]:
+        """GET and decode JSON regardless of the declared content type. Returns (status, data)."""
+        session = await self.session()
+        self.requests += 1
+        try:
+            async with session.get(url, params=params, headers=headers, timeout=self._timeout(timeout)) as resp:
+                data = await resp.json(content_type=None) if resp.status == 200 else None
+                return resp.status, data
+        except Exception:
+            self.errors += 1
+            raise
+
+    async def post_json(self, url: str, payload: Any, headers: Dict[str, str] = None,
+                        timeout: float = None) -> Tuple[int, Any]:
+        session = await self.session()
+        self.requests += 1
+        try:
+            async with session.post(url, json=payload, headers=headers, timeout=self._timeout(timeout)) as resp:
+                data = await resp.json(content_type=None) if resp.status == 200 else None
+                return resp.status, data
+        except Exception:
+            self.errors += 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "open": self._session is not None and not self._session.closed,
+            "requests": self.requests,
+            "errors": self.errors,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+        }
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_client: Optional[SharedHTTPClient] = None
+
+
+def get_http_client() -> SharedHTTPClient:
+    """Process-wide shared HTTP client."""
+    global _client
+    if _client is None:
+        _client = SharedHTTPClient()
+    return _client
+
+
+async def close_http_client():
+    if _client is not None:
+        await _client.close()
@@ -0,0 +1,220 @@
+"""
+Hybrid Retriever — BM25 lexical search fused with vector search.
+
+BM25Index is an append-only inverted index whose postings are compact
+array('I') doc numbers and array('H') term frequencies, one pair per term.
+Queries copy the postings they touch into NumPy under the lock and score
+with one bincount per term, so cost grows with the postings touched, not
+with Python objects. No NumPy view outlives the lock: an array exporting
+its buffer cannot be appended to, so a live view would break add().
+Deletes are tombstones. Document frequencies include tombstoned docs until
+a rebuild, which only slightly skews IDF.
+
+HybridRetriever runs BM25 and the VectorIndex side by side and merges
+their rankings with reciprocal rank fusion (RRF). RRF is scale-free, so raw
+BM25 scores and cosine scores never need calibrating against each other.
+Metadata filters are applied inside both retrievers, before fusion.
+Pagination is an offset/limit window over the fused list.
+"""
+
+import re
+import threading
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from vector_index import VectorIndex, _top_k
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def metadata_filter(filters: Optional[Dict[str, Any]]) -> Optional[Callable[[str, Dict[str, Any]], bool]]:
+    """Build a filter_fn from {key: value | [values]} equality filters (None when empty)."""
+    if not filters:
+        return None
+    wanted = {
+        key: {str(v) for v in value} if isinstance(value, (list, tuple, set)) else {str(value)}
+        for key, value in filters.items()
+    }
+
+    def matches(doc_id: str, metadata: Dict[str, Any]) -> bool:
+        return all(str(metadata.get(key)) in values for key, values in wanted.items())
+    return matches
+
+
+class BM25Index:
+    """Okapi BM25 over an append-only inverted index with array-backed postings."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._docs: Dict[str, Tuple[array, array]] = {}  # term -> (doc numbers, term frequencies)
+        self._lengths = array("I")
+        self._alive = bytearray()
+        self._ids: List[Optional[str]] = []
+        self._num_of: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._num_of)
+
+    def add(self, ids: Sequence[str], texts: Sequence[str]):
+        """Index documents; re-adding an id replaces the earlier version."""
+        # Tokenize everything before touching shared state
+        prepared = []
+        for doc_id, text in zip(ids, texts):
+            tokens = tokenize(text)
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            prepared.append((doc_id, counts, len(tokens)))
+        with self._lock:
+            self.delete([doc_id for doc_id, _, _ in prepared if doc_id in self._num_of])
+            for doc_id, counts, length in prepared:
+                num = len(self._ids)
+                touched = []
+                try:
+                    for term, tf in counts.items():
+                        postings = self._docs.get(term)
+                        if postings is None:
+                            postings = self._docs[term] = (array("I"), array("H"))
+                        touched.append((postings, len(postings[0])))
+                        postings[0].append(num)
+                        postings[1].append(min(tf, 0xFFFF))
+                except BaseException:
+                    # Roll back this document's postings so no orphan is credited to a later doc
+                    for postings, size in touched:
+                        del postings[0][size:]
+                        del postings[1][size:]
+                    raise
+                self._ids.append(doc_id)
+                self._num_of[doc_id] = num
+                self._lengths.append(length)
+                self._alive.append(1)
+                self._total_length += length
+
+    def delete(self, ids: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for doc_id in ids:
+                num = self._num_of.pop(doc_id, None)
+                if num is None:
+                    continue
+                self._alive[num] = 0
+                self._ids[num] = None
+                self._total_length -= self._lengths[num]
+                removed += 1
+        return removed
+
+    def search(self, query: str, k: int = 10,
+               filter_fn: Optional[Callable[[str], bool]] = None) -> List[Tuple[str, float]]:
+        """Return up to k (id, BM25 score) pairs, best first."""
+        terms = set(tokenize(query))
+        with self._lock:
+            live = len(self._num_of)
+            if not terms or not live:
+                return []
+            n_docs = len(self._ids)
+            lengths = np.array(self._lengths, dtype=np.uint32)
+            avg_length = max(1.0, self._total_length / live)
+            scores = np.zeros(n_docs, dtype=np.float32)
+            for term in terms:
+                postings = self._docs.get(term)
+                if postings is None:
+                    continue
+                nums = np.array(postings[0], dtype=np.uint32)
+                tf = np.array(postings[1], dtype=np.float32)
+                df = len(nums)
+                idf = np.log(1.0 + (live - df + 0.5) / (df + 0.5))
+                norm = self.k1 * (1.0 - self.b + self.b * lengths[nums] / avg_length)
+                scores += np.bincount(nums, weights=idf * tf * (self.k1 + 1.0) / (tf + norm), minlength=n_docs).astype(np.float32)
+            scores[np.frombuffer(bytes(self._alive), dtype=np.uint8) == 0] = 0.0
+            matched = int(np.count_nonzero(scores))
+            if not matched:
+                return []
+            # With a filter, widen the window until k hits pass it or every match was seen
+            fetch = min(matched, k if filter_fn is None else max(k * 4, k + 32))
+            while True:
+                results = []
+                for num in _top_k(scores, fetch):
+                    if scores[num] <= 0:
+                        break
+                    doc_id = self._ids[num]
+                    if doc_id is None or (filter_fn is not None and not filter_fn(doc_id)):
+                        continue
+                    results.append((doc_id, float(scores[num])))
+                    if len(results) >= k:
+                        break
+                if len(results) >= k or fetch >= matched:
+                    return results
+                fetch = min(matched, fetch * 4)
+
+    def stats(self) -> Dict[str, Any]:
+        postings = sum(len(nums) for nums, _ in self._docs.values())
+        return {
+            "documents": len(self._num_of),
+            "tombstones": len(self._ids) - len(self._num_of),
+            "terms": len(self._docs),
+            "postings": postings,
+            "postings_bytes": postings * 6,
+        }
+
+
+class HybridRetriever:
+    """Reciprocal rank fusion of a BM25Index and a VectorIndex over the same ids."""
+
+    def __init__(self, vectors: VectorIndex, lexical: Optional[BM25Index] = None, rrf_k: int = 60):
+        self.vectors = vectors
+        self.lexical = lexical if lexical is not None else BM25Index()
+        self.rrf_k = rrf_k
+
+    def add(self, ids: Sequence[str], texts: Sequence[str], vectors: np.ndarray,
+            metadata: Optional[Sequence[Dict[str, Any]]] = None):
+        self.vectors.add(ids, vectors, metadata)
+        self.lexical.add(ids, texts)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        ids = list(ids)
+        self.lexical.delete(ids)
+        return self.vectors.delete(ids)
+
+    def search(self, query: str, query_vector: Optional[np.ndarray], limit: int = 10, offset: int = 0,
+               filters: Optional[Dict[str, Any]] = None, mode: str = "hybrid") -> Dict[str, Any]:
+        """
+        Return {"results": [(id, fused score, {"bm25": rank, "vector": rank})], "candidates": n}.
+
+        mode is hybrid, lexical or vector. Each retriever contributes its top
+        (offset + limit) * 2 (at least 50) candidates to the fusion.
+        """
+        depth = max(50, (offset + limit) * 2)
+        filter_fn = metadata_filter(filters)
+        rankings: Dict[str, List[Tuple[str, float]]] = {}
+        if mode in ("hybrid", "lexical"):
+            lexical_filter = None
+            if filter_fn is not None:
+                lexical_filter = lambda doc_id: filter_fn(doc_id, self.vectors.metadata.get(doc_id, {}))
+            rankings["bm25"] = self.lexical.search(query, depth, lexical_filter)
+        if mode in ("hybrid", "vector") and query_vector is not None:
+            rankings["vector"] = self.vectors.search(query_vector, depth, filter_fn)
+
+        fused: Dict[str, float] = {}
+        ranks: Dict[str, Dict[str, int]] = {}
+        for name, hits in rankings.items():
+            for rank, (doc_id, _) in enumerate(hits, start=1):
+                fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (self.rrf_k + rank)
+                ranks.setdefault(doc_id, {})[name] = rank
+        ordered = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+        page = ordered[offset:offset + limit]
+        return {
+            "results": [(doc_id, score, ranks[doc_id]) for doc_id, score in page],
+            "candidates": len(ordered),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {"vector": self.vectors.stats(), "lexical": self.lexical.stats(), "rrf_k": self.rrf_k}
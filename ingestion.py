@@ -0,0 +1,350 @@
+"""
+Ingestion — stream scanned files into the vector index as one bulk job.
+
+    read (SharedFileReader, grouped) -> chunk -> dedupe -> [bounded queue]
+        -> embed (EmbeddingEngine, batched) -> commit (VectorIndex.add)
+
+The queue between chunking and embedding holds at most `queue_batches`
+batches. A slow embedder therefore pauses file reading instead of
+buffering the whole workspace in memory.
+
+Chunking is language-aware. Code is split at top-level definitions
+(def/class, function/export, fn/impl, ...), Markdown at headings and
+everything else at blank lines. Segments are then packed into chunks of at
+most `max_chars`. Chunk ids are "<path>#L<start>-<end>". A file whose
+content hash is unchanged since the last ingest is skipped. A changed file
+has the chunks it no longer produces removed, and a file that is now empty
+loses all of its chunks. A full run (the whole scanned workspace) also
+removes the chunks of every file it did not see, i.e. files deleted since.
+A chunk whose exact text is already indexed, from any file, is not embedded
+again. It is still indexed under its own file, reusing the stored vector,
+so every file keeps its coverage when the other copy changes. Chunk text
+goes to the optional document store, not the index metadata.
+"""
+
+import asyncio
+import hashlib
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+_BOUNDARIES = {
+    "python": re.compile(r"^(?:@|def\s|async\s+def\s|class\s)"),
+    "javascript": re.compile(r"^(?:export\s|function\s|async\s+function\s|class\s|const\s+\w+\s*=\s*(?:async\s*)?\()"),
+    "typescript": re.compile(r"^(?:export\s|function\s|async\s+function\s|class\s|interface\s|type\s+\w+\s*=|const\s+\w+\s*=\s*(?:async\s*)?\()"),
+    "go": re.compile(r"^(?:func\s|type\s)"),
+    "rust": re.compile(r"^(?:pub\s|fn\s|impl\s|struct\s|enum\s|trait\s|mod\s)"),
+    "java": re.compile(r"^\s{0,4}(?:public|private|protected|class|interface|@)\b"),
+    "markdown": re.compile(r"^#{1,6}\s"),
+}
+
+_EXTENSIONS = {
+    ".py": "python", ".js": "javascript", ".jsx": "javascript", ".mjs": "javascript",
+    ".ts": "typescript", ".tsx": "typescript", ".go": "go", ".rs": "rust",
+    ".java": "java", ".kt": "java", ".md": "markdown", ".mdx": "markdown",
+}
+
+
+@dataclass
+class Chunk:
+    start_line: int
+    end_line: int
+    text: str
+
+
+@dataclass
+class IngestionStats:
+    files: int = 0
+    files_skipped: int = 0
+    chunks: int = 0
+    duplicates: int = 0
+    committed: int = 0
+    removed: int = 0
+    errors: int = 0
+    started: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["elapsed"] = round((self.finished or time.time()) - self.started, 2)
+        return data
+
+
+def detect_language(path: str, hint: str = "") -> str:
+    hint = (hint or "").lower()
+    if hint in _BOUNDARIES:
+        return hint
+    return _EXTENSIONS.get(Path(path).suffix.lower(), hint or "text")
+
+
+def chunk_text(text: str, language: str = "text", max_chars: int = 1500) -> List[Chunk]:
+    """Split text at language-specific boundaries, then pack segments up to max_chars."""
+    lines = text.splitlines()
+    boundary = _BOUNDARIES.get(language)
+    segments: List[Tuple[int, int]] = []  # [start, end) line ranges
+    start = 0
+    for i, line in enumerate(lines):
+        if i == start:
+            continue
+        if boundary is not None:
+            is_boundary = bool(boundary.match(line)) and not (lines[i - 1].startswith("@") and language == "python")
+        else:
+            is_boundary = not line.strip() and lines[i - 1].strip() != ""
+        if is_boundary:
+            segments.append((start, i))
+            start = i
+    if start < len(lines):
+        segments.append((start, len(lines)))
+
+    chunks: List[Chunk] = []
+    current_start, current_end, size = None, None, 0
+
+    def emit(a: int, b: int):
+        body = "\n".join(lines[a:b]).strip()
+        if body:
+            chunks.append(Chunk(a + 1, b, body))
+
+    for a, b in segments:
+        seg_size = sum(len(l) + 1 for l in lines[a:b])
+        if seg_size > max_chars:
+            if current_start is not None:
+                emit(current_start, current_end)
+                current_start, size = None, 0
+            # Oversized definition: fall back to line windows
+            window_start, window_size = a, 0
+            for i in range(a, b):
+                window_size += len(lines[i]) + 1
+                if window_size >= max_chars:
+                    emit(window_start, i + 1)
+                    window_start, window_size = i + 1, 0
+            if window_start < b:
+                emit(window_start, b)
+            continue
+        if current_start is not None and size + seg_size > max_chars:
+            emit(current_start, current_end)
+            current_start, size = None, 0
+        if current_start is None:
+            current_start = a
+        current_end, size = b, size + seg_size
+    if current_start is not None:
+        emit(current_start, current_end)
+    return chunks
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest()
+
+
+class IngestionPipeline:
+    """Bulk, incremental file -> chunk -> embedding -> index job with backpressure."""
+
+    def __init__(self, engine, index, file_reader, documents=None,
+                 on_progress: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None,
+                 on_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 batch_size: int = 128, queue_batches: int = 4, read_group: int = 64,
+                 max_chars: int = 1500, progress_interval: float = 1.0):
+        self.engine = engine
+        self.index = index
+        self.file_reader = file_reader
+        self.documents = documents  # DocumentStore for chunk text, if any
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+        self.batch_size = max(1, batch_size)
+        self.queue_batches = max(1, queue_batches)
+        self.read_group = max(1, read_group)
+        self.max_chars = max_chars
+        self.progress_interval = progress_interval
+        self.stats = IngestionStats(finished=0.0)
+        self._task: Optional[asyncio.Task] = None
+        self._file_hashes: Optional[Dict[str, str]] = None
+        self._file_chunks: Dict[str, List[str]] = {}
+        self._ids_by_hash: Dict[str, set] = {}  # chunk text hash -> every chunk id with that text
+        self._hash_of: Dict[str, str] = {}  # chunk id -> chunk text hash
+        self._last_progress = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, files: Iterable[Any], full: bool = False) -> bool:
+        """Run a job in the background; False if one is already running."""
+        if self.running:
+            return False
+        self._task = asyncio.create_task(self.run(list(files), full=full))
+        return True
+
+    def _load_state(self):
+        """Rebuild the per-file bookkeeping from the metadata stored in the index."""
+        self._file_hashes = {}
+        for chunk_id, meta in list(self.index.metadata.items()):
+            path = meta.get("path")
+            if not path or meta.get("source") != "ingest":
+                continue
+            self._file_hashes[path] = meta.get("file_hash", "")
+            self._file_chunks.setdefault(path, []).append(chunk_id)
+            self._ids_by_hash.setdefault(meta.get("chunk_hash", ""), set()).add(chunk_id)
+            self._hash_of[chunk_id] = meta.get("chunk_hash", "")
+
+    async def _emit(self, force: bool = False):
+        now = time.monotonic()
+        if self.on_progress and (force or now - self._last_progress >= self.progress_interval):
+            self._last_progress = now
+            try:
+                await self.on_progress("ingestion_progress", self.stats.to_dict())
+            except Exception:
+                pass
+
+    async def run(self, files: List[Any], full: bool = False) -> Dict[str, Any]:
+        """Ingest files; with full=True they are the whole workspace and unseen files are dropped."""
+        self.stats = IngestionStats()
+        if self._file_hashes is None:
+            await asyncio.to_thread(self._load_state)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_batches)
+        consumer = asyncio.create_task(self._consume(queue))
+        try:
+            await self._produce(files, queue, full)
+            await queue.put(None)
+            await consumer
+        except BaseException:
+            consumer.cancel()
+            raise
+        finally:
+            self.stats.finished = time.time()
+        summary = self.stats.to_dict()
+        await self._emit(force=True)
+        if self.on_complete:
+            self.on_complete(summary)
+        return summary
+
+    async def _produce(self, files: List[Any], queue: asyncio.Queue, full: bool = False):
+        batch: List[Tuple[str, Chunk, Dict[str, Any]]] = []
+        seen = set()
+        for i in range(0, len(files), self.read_group):
+            group = files[i:i + self.read_group]
+            paths = [str(getattr(f, "path", f)) for f in group]
+            seen.update(paths)
+            try:
+                contents = await self.file_reader.read_many(paths)
+            except Exception:
+                self.stats.errors += len(paths)
+                continue
+            stale: List[str] = []
+            for file, path, content in zip(group, paths, contents):
+                self.stats.files += 1
+                file_hash = _hash(content) if content else ""
+                if not content:
+                    # Empty (or now unreadable/binary): whatever it indexed before is gone
+                    self._file_hashes.pop(path, None)
+                    stale.extend(self._file_chunks.pop(path, []))
+                    self.stats.files_skipped += 1
+                    continue
+                if self._file_hashes.get(path) == file_hash:
+                    self.stats.files_skipped += 1
+                    continue
+                old = set(self._file_chunks.pop(path, []))
+                self._file_hashes[path] = file_hash
+                language = detect_language(path, getattr(file, "language", ""))
+                for chunk in chunk_text(content, language, self.max_chars):
+                    self.stats.chunks += 1
+                    chunk_hash = _hash(chunk.text)
+                    chunk_id = f"{path}#L{chunk.start_line}-{chunk.end_line}"
+                    old.discard(chunk_id)  # same id is replaced in place by the add
+                    previous = self._hash_of.get(chunk_id)
+                    if previous is not None and previous != chunk_hash:
+                        self._forget(chunk_id)
+                    self._ids_by_hash.setdefault(chunk_hash, set()).add(chunk_id)
+                    self._hash_of[chunk_id] = chunk_hash
+                    self._file_chunks.setdefault(path, []).append(chunk_id)
+                    batch.append((chunk_id, chunk, {
+                        "source": "ingest",
+                        "path": path,
+                        "language": language,
+                        "start_line": chunk.start_line,
+                        "end_line": chunk.end_line,
+                        "file_hash": file_hash,
+                        "chunk_hash": chunk_hash,
+                    }))
+                    if len(batch) >= self.batch_size:
+                        await queue.put(batch)  # blocks while the embedder is behind
+                        batch = []
+                stale.extend(old)
+            await self._drop(stale)
+            await self._emit()
+        if batch:
+            await queue.put(batch)
+        if full:
+            # Files indexed earlier but absent from the workspace were deleted
+            stale = []
+            for path in [p for p in self._file_chunks if p not in seen]:
+                self._file_hashes.pop(path, None)
+                stale.extend(self._file_chunks.pop(path))
+            await self._drop(stale)
+
+    async def _drop(self, chunk_ids: List[str]):
+        """Remove chunks from the index and the document store."""
+        if not chunk_ids:
+            return
+        for chunk_id in chunk_ids:
+            self._forget(chunk_id)
+        self.stats.removed += await asyncio.to_thread(self.index.delete, chunk_ids)
+        if self.documents is not None:
+            await asyncio.to_thread(self.documents.delete, chunk_ids)
+
+    def _forget(self, chunk_id: str):
+        chunk_hash = self._hash_of.pop(chunk_id, None)
+        ids = self._ids_by_hash.get(chunk_hash)
+        if ids is not None:
+            ids.discard(chunk_id)
+            if not ids:
+                del self._ids_by_hash[chunk_hash]
+
+    def _stored_vector(self, chunk_hash: str):
+        """Vector already in the index for this exact text, under any id, or None."""
+        for chunk_id in self._ids_by_hash.get(chunk_hash, ()):
+            # The id may still hold an older text until its pending batch lands
+            if self.index.metadata.get(chunk_id, {}).get("chunk_hash") == chunk_hash:
+                vector = self.index.get_vector(chunk_id)
+                if vector is not None:
+                    return vector
+        return None
+
+    async def _consume(self, queue: asyncio.Queue):
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+            try:
+                # Embed each distinct text once; text already in the index reuses its vector
+                vectors: List[Any] = [None] * len(batch)
+                to_embed: Dict[str, List[int]] = {}
+                for i, (chunk_id, chunk, meta) in enumerate(batch):
+                    vectors[i] = self._stored_vector(meta["chunk_hash"])
+                    if vectors[i] is None:
+                        to_embed.setdefault(meta["chunk_hash"], []).append(i)
+                self.stats.duplicates += len(batch) - len(to_embed)
+                if to_embed:
+                    embedded = await self.engine.embed([batch[slots[0]][1].text for slots in to_embed.values()])
+                    for vector, slots in zip(embedded, to_embed.values()):
+                        for i in slots:
+                            vectors[i] = vector
+                await asyncio.to_thread(
+                    self.index.add,
+                    [chunk_id for chunk_id, _, _ in batch],
+                    vectors,
+                    [meta for _, _, meta in batch],
+                )
+                if self.documents is not None:
+                    await asyncio.to_thread(self.documents.put_many,
+                                            [(chunk_id, chunk.text) for chunk_id, chunk, _ in batch])
+                self.stats.committed += len(batch)
+            except Exception as e:
+                print(f"⚠️ Ingestion batch failed: {e}")
+                self.stats.errors += len(batch)
+                # Forget the file hashes so the next job retries these files
+                for chunk_id, _, meta in batch:
+                    self._file_hashes.pop(meta["path"], None)
+                    if chunk_id not in self.index:
+                        self._forget(chunk_id)
+            await self._emit()
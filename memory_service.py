@@ -0,0 +1,269 @@
+"""
+Memory Service — one warm, server-lifetime store behind /api/memory/*.
+
+Memories (content, metadata, embedding) live in a SQLite database in WAL
+mode. The service is created once at startup, so the embedding backend and
+the vector index are loaded once instead of on every request.
+
+- remember(): writes are queued and committed in batches (one embedding
+  call and one transaction per batch); each caller still gets its id only
+  after its batch is durable.
+- search()/recall(): hot queries are answered from a TTL cache that is
+  cleared on every committed write. Misses run the hybrid retriever (BM25
+  plus vector search with reciprocal rank fusion, see hybrid_retriever.py)
+  and fetch rows through a small pool of read connections.
+"""
+
+import asyncio
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from hybrid_retriever import HybridRetriever
+from search_cache import TTLCache, normalize_query
+from vector_index import VectorIndex
+
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections for concurrent readers."""
+
+    def __init__(self, db_path: str, size: int = 4):
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(max(1, size)):
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn.execute("PRAGMA query_only=ON")
+            self._pool.put(conn)
+        self.size = max(1, size)
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+class MemoryService:
+    """Batched writes, cached reads, one embedding engine and one vector index."""
+
+    def __init__(self, db_path: str, engine, read_pool_size: int = 4, batch_size: int = 64,
+                 flush_interval: float = 0.02, cache_size: int = 256, cache_ttl: float = 30.0):
+        self.db_path = str(db_path)
+        self.engine = engine
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._write_lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS memories (
+                id TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                metadata TEXT,
+                created_at REAL NOT NULL,
+                model_id TEXT,
+                vector BLOB
+            )
+        """)
+        self._conn.commit()
+        self.readers = ConnectionPool(self.db_path, read_pool_size)
+        self.retriever = HybridRetriever(VectorIndex(engine.dim))
+        self.cache = TTLCache(max_entries=cache_size, ttl=cache_ttl)
+        self._generation = 0  # bumped on every committed write
+        self._pending: List[Tuple[str, str, Dict[str, Any], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flushes: set = set()  # size-triggered flushes still running
+        self.batches = 0
+        self.index_errors = 0
+        self.writes = 0
+
+    # ------------------------------------------------------------------ lifecycle
+
+    async def start(self):
+        """Load stored vectors into the index; re-embed rows written by another model."""
+        rows = await asyncio.to_thread(self._load_rows)
+        current = [row for row in rows if row[3] == self.engine.model_id and row[4]]
+        stale = [row for row in rows if not (row[3] == self.engine.model_id and row[4])]
+        if current:
+            vectors = np.vstack([np.frombuffer(row[4], dtype=np.float32) for row in current])
+            await asyncio.to_thread(self._index_rows, current, vectors)
+        if stale:
+            vectors = await self.engine.embed([row[1] for row in stale])
+            await asyncio.to_thread(self._update_vectors, [row[0] for row in stale], vectors)
+            await asyncio.to_thread(self._index_rows, stale, vectors)
+
+    def _load_rows(self) -> List[Tuple[str, str, str, str, bytes]]:
+        with self.readers.connection() as conn:
+            return conn.execute("SELECT id, content, metadata, model_id, vector FROM memories").fetchall()
+
+    def _index_rows(self, rows, vectors: np.ndarray):
+        self.retriever.add(
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+            vectors,
+            [json.loads(row[2]) if row[2] else {} for row in rows],
+        )
+
+    def _update_vectors(self, ids: Sequence[str], vectors: np.ndarray):
+        with self._write_lock, self._conn:
+            self._conn.executemany(
+                "UPDATE memories SET model_id = ?, vector = ? WHERE id = ?",
+                [(self.engine.model_id, np.asarray(v, dtype=np.float32).tobytes(), mid) for mid, v in zip(ids, vectors)]
+            )
+
+    async def close(self):
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        # Every queued write gets committed (and its caller answered), one batch at a time
+        while self._pending:
+            await self._flush()
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()  # re-armed by the loop above; nothing is left for it
+        self.readers.close()
+        self._conn.close()
+
+    # ------------------------------------------------------------------ writes
+
+    async def remember(self, content: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Queue a memory and return its id once the batch holding it is committed."""
+        memory_id = f"mem_{uuid.uuid4().hex[:16]}"
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((memory_id, content, dict(metadata or {}), future))
+        if len(self._pending) >= self.batch_size:
+            task = asyncio.ensure_future(self._flush())
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush_later())
+        return await future
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        await self._flush()
+
+    async def _flush(self):
+        batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+        if not batch:
+            return
+        if self._pending and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.ensure_future(self._flush_later())
+        try:
+            vectors = await self.engine.embed([content for _, content, _, _ in batch])
+            await asyncio.to_thread(self._write_batch, batch, vectors)
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        try:
+            await asyncio.to_thread(
+                self.retriever.add,
+                [mid for mid, _, _, _ in batch],
+                [content for _, content, _, _ in batch],
+                vectors,
+                [metadata for _, _, metadata, _ in batch],
+            )
+        except Exception as e:
+            # The rows are durable: callers still get their ids, and start() re-indexes them next time
+            self.index_errors += 1
+            print(f"⚠️ Memory index update failed for {len(batch)} stored memories: {e}")
+        self._generation += 1
+        self.cache.clear()
+        self.batches += 1
+        self.writes += len(batch)
+        for memory_id, _, _, future in batch:
+            if not future.done():
+                future.set_result(memory_id)
+
+    def _write_batch(self, batch, vectors: np.ndarray):
+        now = time.time()
+        with self._write_lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO memories (id, content, metadata, created_at, model_id, vector) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (mid, content, json.dumps(metadata, default=str), now, self.engine.model_id,
+                     np.asarray(vector, dtype=np.float32).tobytes())
+                    for (mid, content, metadata, _), vector in zip(batch, vectors)
+                ]
+            )
+
+    # ------------------------------------------------------------------ reads
+
+    async def search(self, query: str, limit: int = 5, offset: int = 0,
+                     filters: Optional[Dict[str, Any]] = None, mode: str = "hybrid") -> Dict[str, Any]:
+        """One page of memories ranked by hybrid (BM25 + vector) relevance."""
+        key = (normalize_query(query), limit, offset, json.dumps(filters or {}, sort_keys=True, default=str), mode)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        generation = self._generation
+        query_vector = (await self.engine.embed([query]))[0] if mode != "lexical" else None
+        page = await asyncio.to_thread(self.retriever.search, query, query_vector, limit, offset, filters, mode)
+        rows = await asyncio.to_thread(self._fetch, [mid for mid, _, _ in page["results"]])
+        results = []
+        for memory_id, score, ranks in page["results"]:
+            row = rows.get(memory_id)
+            if row is not None:
+                results.append({**row, "score": round(score, 6), "ranks": ranks})
+        answer = {"results": results, "candidates": page["candidates"], "offset": offset, "limit": limit}
+        if generation == self._generation:
+            # A write landed while we were searching: do not cache a possibly stale answer
+            self.cache.set(key, answer)
+        return answer
+
+    async def recall(self, query: str, n: int = 5) -> List[Dict[str, Any]]:
+        """Top-n memories for a query."""
+        return (await self.search(query, limit=n))["results"]
+
+    def _fetch(self, ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        with self.readers.connection() as conn:
+            rows = conn.execute(
+                f"SELECT id, content, metadata, created_at FROM memories WHERE id IN ({placeholders})", list(ids)
+            ).fetchall()
+        return {
+            mid: {"id": mid, "content": content, "metadata": json.loads(metadata) if metadata else {}, "created_at": created_at}
+            for mid, content, metadata, created_at in rows
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "memories": len(self.retriever.vectors),
+            "pending_writes": len(self._pending),
+            "batches": self.batches,
+            "writes": self.writes,
+            "index_errors": self.index_errors,
+            "read_pool": self.readers.size,
+            "model_id": self.engine.model_id,
+            "cache": self.cache.stats(),
+            "index": self.retriever.stats(),
+        }
+
+
+def create_memory_service(default_db_path: str, engine) -> MemoryService:
+    """MemoryService configured from ASIREM_MEMORY_* environment variables."""
+    return MemoryService(
+        os.getenv("ASIREM_MEMORY_DB", default_db_path),
+        engine,
+        read_pool_size=int(os.getenv("ASIREM_MEMORY_READERS", "4")),
+        batch_size=int(os.getenv("ASIREM_MEMORY_BATCH", "64")),
+        cache_ttl=float(os.getenv("ASIREM_MEMORY_CACHE_TTL", "30")),
+    )
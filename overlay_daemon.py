@@ -0,0 +1,257 @@
+"""
+Overlay Daemon — one long-lived renderer for ByteBot desktop overlays.
+
+Instead of a `convert` + `pkill` + `feh` + `pkill` round trip per speech
+bubble, a small Python daemon runs inside the container (started once over
+`docker exec -i`) and reads JSON commands from stdin:
+
+    {"op": "bubble", "slot": "scanner", "key": "...", "text": "...", "bg": "#..", "fg": "white", "geom": "450+50", "ttl": 7}
+    {"op": "image", "slot": "avatar", "path": "/tmp/asirem_avatar_thinking.png", "geom": "+0+0"}
+    {"op": "close", "slot": "scanner"}
+
+Label PNGs are rendered once per content hash and reused; the directory is
+an LRU of at most `max_labels` files, since progress bubbles carry file names
+and counts that rarely repeat. Each slot owns at
+most one feh window, which the daemon replaces or expires itself, so no
+pkill is needed. The host side sends one line per bubble and never waits on
+it; replies are only read to surface errors.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+
+DAEMON_SCRIPT = r'''
+import collections, json, os, select, subprocess, sys, time
+ROOT = "/tmp/asirem_overlay"
+MAX_LABELS = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+os.makedirs(ROOT, exist_ok=True)
+ENV = dict(os.environ, DISPLAY=os.environ.get("DISPLAY") or ":0")
+QUIET = dict(stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+slots = {}
+# Label cache, least recently used first (mtime order survives daemon restarts)
+for name in os.listdir(ROOT):
+    if name.endswith(".tmp.png"):
+        os.remove(os.path.join(ROOT, name))  # interrupted render
+labels = collections.OrderedDict(
+    (p, None) for p in sorted((os.path.join(ROOT, n) for n in os.listdir(ROOT) if n.endswith(".png")),
+                              key=os.path.getmtime))
+
+def close(slot):
+    entry = slots.pop(slot, None)
+    if entry and entry[0].poll() is None:
+        entry[0].terminate()
+        try:
+            entry[0].wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            entry[0].kill()
+
+def show(slot, path, geom, ttl):
+    close(slot)
+    proc = subprocess.Popen(["feh", "-x", "--geometry", geom, path], env=ENV, **QUIET)
+    slots[slot] = (proc, time.time() + ttl if ttl else None)
+
+def evict():
+    showing = {proc.args[-1] for proc, _ in slots.values()}
+    for old in list(labels):
+        if len(labels) <= MAX_LABELS:
+            return
+        if old in showing:
+            continue
+        del labels[old]
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+
+def label(msg):
+    path = os.path.join(ROOT, msg["key"] + ".png")
+    if path in labels and os.path.exists(path):
+        labels.move_to_end(path)
+        os.utime(path)
+    else:
+        text = msg["text"]
+        if text.startswith("@"):
+            text = "\\" + text  # label:@file would read a file
+        tmp = path + ".tmp.png"
+        subprocess.run(["convert", "-background", msg["bg"], "-fill", msg["fg"],
+                        "-pointsize", str(msg.get("pointsize", 14)), "-border", "2",
+                        "-bordercolor", "white", "label:" + text, tmp], env=ENV, check=True, **QUIET)
+        os.replace(tmp, path)
+        labels.pop(path, None)
+        labels[path] = None
+        evict()
+    return path
+
+def reply(obj):
+    sys.stdout.write(json.dumps(obj) + "\n")
+    sys.stdout.flush()
+
+buf = b""
+while True:
+    deadlines = [exp for _, exp in slots.values() if exp]
+    timeout = max(0.0, min(deadlines) - time.time()) if deadlines else None
+    ready, _, _ = select.select([0], [], [], timeout)
+    now = time.time()
+    for slot, (proc, exp) in list(slots.items()):
+        if exp and exp <= now:
+            close(slot)
+    if not ready:
+        continue
+    data = os.read(0, 65536)
+    if not data:
+        break
+    buf += data
+    while b"\n" in buf:
+        line, buf = buf.split(b"\n", 1)
+        msg = {}
+        try:
+            msg = json.loads(line)
+            op = msg.get("op")
+            if op == "bubble":
+                show(msg["slot"], label(msg), "+" + msg["geom"], msg.get("ttl", 7))
+            elif op == "image":
+                show(msg["slot"], msg["path"], msg.get("geom", "+0+0"), msg.get("ttl"))
+            elif op == "close":
+                close(msg["slot"])
+            reply({"id": msg.get("id"), "ok": True})
+        except Exception as e:
+            reply({"id": msg.get("id"), "ok": False, "error": str(e)})
+for slot in list(slots):
+    close(slot)
+'''
+
+
+def label_key(text: str, bg: str, fg: str, pointsize: int = 14) -> str:
+    return hashlib.sha1(f"{bg}|{fg}|{pointsize}|{text}".encode("utf-8", errors="ignore")).hexdigest()
+
+
+class OverlayDaemon:
+    """Host-side handle on the in-container overlay daemon (lazy start, auto restart)."""
+
+    def __init__(self, container: str, python: str = "python3", retry_after: float = 30.0,
+                 max_labels: int = 256):
+        self.container = container
+        self.python = python
+        self.retry_after = retry_after
+        self.max_labels = max_labels
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._failed_at = 0.0
+        self._copied: Dict[str, Tuple[float, int]] = {}  # container path -> (mtime, size) already copied
+        self._seq = 0
+        self.stats = {"sent": 0, "errors": 0, "starts": 0, "copies": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    async def start(self) -> bool:
+        if self.running:
+            return True
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.running:
+                return True
+            loop = asyncio.get_running_loop()
+            if self._failed_at and loop.time() - self._failed_at < self.retry_after:
+                return False
+            try:
+                self._proc = await asyncio.create_subprocess_exec(
+                    "docker", "exec", "-i", self.container, self.python, "-u", "-c", DAEMON_SCRIPT,
+                    str(self.max_labels),
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                # Handshake: a no-op command must come back before we trust the channel
+                self._proc.stdin.write(b'{"op": "ping", "id": 0}\n')
+                await self._proc.stdin.drain()
+                line = await asyncio.wait_for(self._proc.stdout.readline(), timeout=5.0)
+                if not line or not json.loads(line).get("ok"):
+                    raise RuntimeError("overlay daemon did not answer")
+            except Exception as e:
+                print(f"⚠️ Overlay daemon unavailable ({e}); using per-bubble commands")
+                self._failed_at = loop.time()
+                await self._kill()
+                return False
+            self._failed_at = 0.0
+            self.stats["starts"] += 1
+            self._reader = asyncio.create_task(self._read_replies(self._proc))
+            return True
+
+    async def _read_replies(self, proc):
+        while True:
+            line = await proc.stdout.readline()
+            if not line:
+                return
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                continue
+            if not reply.get("ok"):
+                self.stats["errors"] += 1
+                print(f"⚠️ Overlay daemon: {reply.get('error')}")
+
+    async def send(self, message: Dict[str, Any]) -> bool:
+        """Write one command; False if the daemon could not be reached."""
+        if not await self.start():
+            return False
+        self._seq += 1
+        message = {**message, "id": self._seq}
+        try:
+            self._proc.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+            await self._proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError, RuntimeError):
+            await self._kill()
+            return False
+        self.stats["sent"] += 1
+        return True
+
+    async def bubble(self, slot: str, text: str, bg: str, fg: str, geom: str, ttl: float = 7.0) -> bool:
+        return await self.send({
+            "op": "bubble", "slot": slot, "key": label_key(text, bg, fg),
+            "text": text, "bg": bg, "fg": fg, "geom": geom, "ttl": ttl,
+        })
+
+    async def image(self, slot: str, path: str, geom: str = "+0+0") -> bool:
+        return await self.send({"op": "image", "slot": slot, "path": path, "geom": geom})
+
+    async def copy_once(self, host_path: str, container_path: str) -> bool:
+        """docker cp a host file unless this exact version was already copied."""
+        try:
+            st = os.stat(host_path)
+        except OSError:
+            return False
+        version = (st.st_mtime, st.st_size)
+        if self._copied.get(container_path) == version:
+            return True
+        proc = await asyncio.create_subprocess_exec(
+            "docker", "cp", host_path, f"{self.container}:{container_path}",
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+        )
+        if await proc.wait() != 0:
+            return False
+        self._copied[container_path] = version
+        self.stats["copies"] += 1
+        return True
+
+    async def _kill(self):
+        proc, self._proc = self._proc, None
+        if self._reader:
+            self._reader.cancel()
+            self._reader = None
+        if proc is not None and proc.returncode is None:
+            try:
+                proc.stdin.close()
+                proc.kill()
+                await proc.wait()
+            except Exception:
+                pass
+
+    async def close(self):
+        await self._kill()
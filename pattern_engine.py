@@ -1,4 +1,16 @@
-"""Pattern Engine stub — provides analyze_content and AGENTIC_PATTERNS."""
+"""Pattern Engine — provides analyze_content, analyze_many and AGENTIC_PATTERNS.
+
+Keyword dictionaries are compiled once into a single trie-shaped regular
+expression and cached, so analyzing a document is one pass over the content
+no matter how many keywords are loaded.
+"""
+
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 AGENTIC_PATTERNS = {
     "orchestration": ["orchestrat", "coordinate", "delegate", "pipeline"],
@@ -7,22 +19,217 @@ AGENTIC_PATTERNS = {
     "communication": ["speak", "broadcast", "notify", "report", "message"],
 }
 
-def analyze_content(content: str, patterns: dict = None) -> dict:
-    """Analyze content for agentic patterns. Returns detected pattern categories."""
+# Offsets reported per keyword; counts are always exact
+DEFAULT_MAX_OFFSETS = 100
+# Characters read per step when streaming files / file-like inputs
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def _trie_regex(words) -> str:
+    """Build a prefix-sharing regex that matches the longest keyword at a position."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != ""]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 and not terminal else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if terminal else body
+
+    return build(trie)
+
+
+class PatternMatcher:
+    """Compiled multi-keyword matcher for one pattern dictionary."""
+
+    def __init__(self, patterns: Dict[str, List[str]]):
+        self.categories: Dict[str, List[str]] = {}
+        self.keyword_categories: Dict[str, List[str]] = {}
+        for category, keywords in patterns.items():
+            normalized = [kw.lower() for kw in keywords if kw]
+            self.categories[category] = normalized
+            for kw in dict.fromkeys(normalized):
+                self.keyword_categories.setdefault(kw, []).append(category)
+
+        self.lengths = sorted({len(kw) for kw in self.keyword_categories})
+        self.max_keyword_length = self.lengths[-1] if self.lengths else 0
+        # Zero-width lookahead so overlapping keywords at every position are found
+        self._regex = (
+            re.compile(f"(?=({_trie_regex(self.keyword_categories)}))", re.IGNORECASE)
+            if self.keyword_categories else None
+        )
+
+    def scan(self, content: str, max_offsets: int = DEFAULT_MAX_OFFSETS) -> Tuple[Dict[str, int], Dict[str, List[int]]]:
+        """Return per-keyword occurrence counts and (capped) start offsets."""
+        counts: Dict[str, int] = {}
+        offsets: Dict[str, List[int]] = {}
+        self._scan_into(content, counts, offsets, max_offsets)
+        return counts, offsets
+
+    def _scan_into(self, content: str, counts: Dict[str, int], offsets: Dict[str, List[int]],
+                   max_offsets: int, stop: int = None, base: int = 0):
+        """Accumulate matches starting before `stop`; offsets are shifted by `base`."""
+        if self._regex is None:
+            return
+        keyword_categories = self.keyword_categories
+        lengths = self.lengths
+        for match in self._regex.finditer(content):
+            position = match.start()
+            if stop is not None and position >= stop:
+                break
+            longest = match.group(1)
+            # The trie returns the longest keyword here; shorter keywords that are its prefixes match too
+            for length in lengths:
+                if length > len(longest):
+                    break
+                kw = longest[:length].lower()
+                if kw in keyword_categories:
+                    counts[kw] = counts.get(kw, 0) + 1
+                    hits = offsets.setdefault(kw, [])
+                    if len(hits) < max_offsets:
+                        hits.append(base + position)
+
+    def analyze_stream(self, stream, max_offsets: int = DEFAULT_MAX_OFFSETS,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+        """Analyze a text stream chunk by chunk, carrying a keyword-length overlap across chunks."""
+        counts: Dict[str, int] = {}
+        offsets: Dict[str, List[int]] = {}
+        overlap = max(self.max_keyword_length - 1, 0)
+        carry = ""
+        base = 0
+        total = 0
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            total += len(chunk)
+            buffer = carry + chunk
+            # Only positions whose longest possible keyword fits in the buffer are final
+            stop = len(buffer) - overlap
+            if stop > 0:
+                self._scan_into(buffer, counts, offsets, max_offsets, stop=stop, base=base)
+                carry = buffer[stop:]
+                base += stop
+            else:
+                carry = buffer
+        if carry:
+            self._scan_into(carry, counts, offsets, max_offsets, base=base)
+        return self.build_result(counts, offsets, total)
+
+    def build_result(self, counts: Dict[str, int], offsets: Dict[str, List[int]], content_length: int) -> dict:
+        detected: Dict[str, List[str]] = {}
+        match_counts: Dict[str, Dict[str, int]] = {}
+        match_offsets: Dict[str, Dict[str, List[int]]] = {}
+        for category, keywords in self.categories.items():
+            matches = [kw for kw in keywords if kw in counts]
+            if matches:
+                detected[category] = matches
+                match_counts[category] = {kw: counts[kw] for kw in matches}
+                match_offsets[category] = {kw: offsets.get(kw, []) for kw in matches}
+
+        return {
+            "detected_patterns": detected,
+            "pattern_count": len(detected),
+            "content_length": content_length,
+            "is_agentic": len(detected) > 0,
+            "match_counts": match_counts,
+            "match_offsets": match_offsets,
+        }
+
+    def analyze(self, content: str, max_offsets: int = DEFAULT_MAX_OFFSETS) -> dict:
+        counts, offsets = self.scan(content, max_offsets)
+        return self.build_result(counts, offsets, len(content))
+
+
+@lru_cache(maxsize=32)
+def _compiled(signature: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> PatternMatcher:
+    return PatternMatcher({category: list(keywords) for category, keywords in signature})
+
+
+def get_matcher(patterns: dict = None) -> PatternMatcher:
+    """Return the cached compiled matcher for a pattern dictionary."""
+    if isinstance(patterns, PatternMatcher):
+        return patterns
     if patterns is None:
         patterns = AGENTIC_PATTERNS
-    
-    results = {}
-    content_lower = content.lower()
-    
-    for category, keywords in patterns.items():
-        matches = [kw for kw in keywords if kw in content_lower]
-        if matches:
-            results[category] = matches
-    
-    return {
-        "detected_patterns": results,
-        "pattern_count": len(results),
-        "content_length": len(content),
-        "is_agentic": len(results) > 0
-    }
+    signature = tuple((category, tuple(keywords)) for category, keywords in patterns.items())
+    return _compiled(signature)
+
+
+def analyze_content(content: str, patterns: dict = None, max_offsets: int = DEFAULT_MAX_OFFSETS) -> dict:
+    """Analyze content for agentic patterns. Returns detected pattern categories."""
+    return get_matcher(patterns).analyze(content, max_offsets)
+
+
+def _analyze_item(matcher: PatternMatcher, item: Any, max_offsets: int, chunk_size: int) -> dict:
+    if isinstance(item, os.PathLike):
+        with open(item, "r", errors="ignore") as f:
+            return matcher.analyze_stream(f, max_offsets, chunk_size)
+    if hasattr(item, "read"):
+        return matcher.analyze_stream(item, max_offsets, chunk_size)
+    if len(item) > chunk_size:
+        # Large in-memory strings: scan windows so match state stays bounded
+        counts: Dict[str, int] = {}
+        offsets: Dict[str, List[int]] = {}
+        overlap = max(matcher.max_keyword_length - 1, 0)
+        for start in range(0, len(item), chunk_size):
+            window = item[start:start + chunk_size + overlap]
+            matcher._scan_into(window, counts, offsets, max_offsets, stop=chunk_size, base=start)
+        return matcher.build_result(counts, offsets, len(item))
+    return matcher.analyze(item, max_offsets)
+
+
+_worker_matcher: PatternMatcher = None
+
+
+def _init_worker(signature):
+    global _worker_matcher
+    _worker_matcher = _compiled(signature)
+
+
+def _analyze_batch(batch: List[Any], max_offsets: int, chunk_size: int) -> List[dict]:
+    return [_analyze_item(_worker_matcher, item, max_offsets, chunk_size) for item in batch]
+
+
+def analyze_many(contents: Iterable[Any], patterns: dict = None, workers: int = None,
+                 max_offsets: int = DEFAULT_MAX_OFFSETS, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 batch_size: int = 32) -> Iterator[dict]:
+    """
+    Analyze many documents, yielding one analyze_content-style dict per input, in order.
+
+    Inputs may be strings, os.PathLike paths (streamed from disk) or text
+    file-like objects. With workers > 1 the documents are fanned out across a
+    process pool in batches, with a bounded number of batches in flight so the
+    input iterable is consumed lazily.
+    """
+    matcher = get_matcher(patterns)
+    if not workers or workers <= 1:
+        for item in contents:
+            yield _analyze_item(matcher, item, max_offsets, chunk_size)
+        return
+
+    signature = tuple((category, tuple(keywords)) for category, keywords in matcher.categories.items())
+    max_in_flight = workers * 4
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(signature,)) as pool:
+        in_flight: deque = deque()
+        batch: List[Any] = []
+        for item in contents:
+            if hasattr(item, "read") and not isinstance(item, os.PathLike):
+                # Open file handles cannot cross process boundaries
+                item = item.read()
+            batch.append(item)
+            if len(batch) >= batch_size:
+                in_flight.append(pool.submit(_analyze_batch, batch, max_offsets, chunk_size))
+                batch = []
+                if len(in_flight) >= max_in_flight:
+                    yield from in_flight.popleft().result()
+        if batch:
+            in_flight.append(pool.submit(_analyze_batch, batch, max_offsets, chunk_size))
+        while in_flight:
+            yield from in_flight.popleft().result()
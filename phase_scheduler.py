@@ -0,0 +1,166 @@
+"""
+Phase Scheduler — runs pipeline phases as a dependency DAG.
+
+Each phase declares the phases it depends on and the shared resources it
+holds while running (e.g. "cpu", "network"). A phase starts as soon as all of
+its dependencies have finished and a slot is free for each of its resources,
+so independent phases overlap and wall-clock time approaches the critical
+path. When a phase fails, everything downstream of it is skipped.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+
+@dataclass
+class Phase:
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    depends_on: Sequence[str] = ()
+    resources: Sequence[str] = ()
+
+
+@dataclass
+class PhaseTiming:
+    status: str = "pending"  # pending | running | done | failed | skipped
+    started: Optional[float] = None  # seconds since the scheduler started
+    finished: Optional[float] = None
+    waited: float = 0.0  # time spent ready but waiting for a resource slot
+    error: str = ""
+
+    @property
+    def duration(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "started": round(self.started, 3) if self.started is not None else None,
+            "finished": round(self.finished, 3) if self.finished is not None else None,
+            "duration": round(self.duration, 3),
+            "waited": round(self.waited, 3),
+            "error": self.error,
+        }
+
+
+class PhaseScheduler:
+    """Dependency-ordered, resource-limited concurrent phase runner."""
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None,
+                 on_phase: Optional[Callable[[str, PhaseTiming], Awaitable[None]]] = None):
+        self.limits = dict(limits or {})
+        self.on_phase = on_phase
+        self.phases: Dict[str, Phase] = {}
+        self.timings: Dict[str, PhaseTiming] = {}
+        self.results: Dict[str, Any] = {}
+        self.wall_time = 0.0
+
+    def add(self, name: str, run: Callable[[], Awaitable[Any]],
+            depends_on: Sequence[str] = (), resources: Sequence[str] = ()):
+        if name in self.phases:
+            raise ValueError(f"Duplicate phase '{name}'")
+        self.phases[name] = Phase(name, run, tuple(depends_on), tuple(resources))
+        return self
+
+    def _validate(self):
+        for phase in self.phases.values():
+            for dep in phase.depends_on:
+                if dep not in self.phases:
+                    raise ValueError(f"Phase '{phase.name}' depends on unknown phase '{dep}'")
+        # Kahn's algorithm: anything left over sits on a cycle
+        indegree = {name: len(p.depends_on) for name, p in self.phases.items()}
+        ready = [name for name, n in indegree.items() if n == 0]
+        visited = 0
+        while ready:
+            current = ready.pop()
+            visited += 1
+            for phase in self.phases.values():
+                if current in phase.depends_on:
+                    indegree[phase.name] -= 1
+                    if indegree[phase.name] == 0:
+                        ready.append(phase.name)
+        if visited != len(self.phases):
+            raise ValueError("Phase graph contains a cycle")
+
+    async def run(self) -> Dict[str, PhaseTiming]:
+        self._validate()
+        semaphores = {name: asyncio.Semaphore(max(1, limit)) for name, limit in self.limits.items()}
+        done = {name: asyncio.Event() for name in self.phases}
+        self.timings = {name: PhaseTiming() for name in self.phases}
+        t0 = time.perf_counter()
+
+        async def notify(name: str):
+            if self.on_phase:
+                try:
+                    await self.on_phase(name, self.timings[name])
+                except Exception as e:
+                    print(f"⚠️ Phase callback failed for {name}: {e}")
+
+        async def execute(phase: Phase):
+            timing = self.timings[phase.name]
+            try:
+                for dep in phase.depends_on:
+                    await done[dep].wait()
+                failed = [dep for dep in phase.depends_on if self.timings[dep].status != "done"]
+                if failed:
+                    timing.status = "skipped"
+                    timing.error = f"upstream failed: {', '.join(failed)}"
+                    return
+
+                ready_at = time.perf_counter()
+                held: List[asyncio.Semaphore] = []
+                try:
+                    # Fixed acquisition order avoids deadlock between multi-resource phases
+                    for resource in sorted(phase.resources):
+                        sem = semaphores.get(resource)
+                        if sem is not None:
+                            await sem.acquire()
+                            held.append(sem)
+                    timing.started = time.perf_counter() - t0
+                    timing.waited = timing.started - (ready_at - t0)
+                    timing.status = "running"
+                    await notify(phase.name)
+                    try:
+                        self.results[phase.name] = await phase.run()
+                        timing.status = "done"
+                    except Exception as e:
+                        timing.status = "failed"
+                        timing.error = str(e)
+                        print(f"❌ Phase '{phase.name}' failed: {e}")
+                    finally:
+                        timing.finished = time.perf_counter() - t0
+                finally:
+                    for sem in held:
+                        sem.release()
+            finally:
+                done[phase.name].set()
+                await notify(phase.name)
+
+        await asyncio.gather(*(execute(p) for p in self.phases.values()))
+        self.wall_time = time.perf_counter() - t0
+        return self.timings
+
+    def critical_path(self) -> List[str]:
+        """Chain of phases that determined the finish time (following the latest-finishing dependency)."""
+        finished = {n: t.finished for n, t in self.timings.items() if t.finished is not None}
+        if not finished:
+            return []
+        path = [max(finished, key=finished.get)]
+        while True:
+            deps = [d for d in self.phases[path[-1]].depends_on if d in finished]
+            if not deps:
+                break
+            path.append(max(deps, key=finished.get))
+        return list(reversed(path))
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "wall_time": round(self.wall_time, 3),
+            "serial_time": round(sum(t.duration for t in self.timings.values()), 3),
+            "critical_path": self.critical_path(),
+            "phases": {name: t.to_dict() for name, t in self.timings.items()},
+        }
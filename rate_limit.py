@@ -0,0 +1,55 @@
+"""
+Rate Limiting — token buckets for outbound calls and noisy side effects.
+
+A bucket refills at `rate` tokens per second up to `capacity`. try_acquire()
+is the non-blocking check (drop or defer when empty); acquire() waits for
+the next token, with waiters served in arrival order. A rate of 0 or less
+means unlimited.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Token bucket rate limiter usable from asyncio code."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        if self.rate <= 0:
+            return True  # unlimited
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Seconds until `tokens` would be available."""
+        self._refill()
+        if self._tokens >= tokens or self.rate <= 0:
+            return 0.0
+        return (tokens - self._tokens) / self.rate
+
+    async def acquire(self, tokens: float = 1.0):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while not self.try_acquire(tokens):
+                await asyncio.sleep(self.wait_time(tokens))
@@ -0,0 +1,263 @@
+"""
+Scan Index — persistent per-file fingerprints for incremental pipeline runs.
+
+Keeps (path, mtime, size, content hash, language) for every discovered file
+plus the per-stage results (security, qa, ...) computed for that exact
+content. A pipeline run only re-reads files whose stat or hash changed and
+reuses stored stage results for everything else.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+
+@dataclass
+class IndexEntry:
+    """Fingerprint of a single file as of its last scan."""
+    path: str
+    mtime_ns: int
+    size: int
+    content_hash: str
+    language: str = ""
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def hash_file(path: str, block_size: int = 1 << 20) -> str:
+    """Stream a local file through SHA-1 without loading it whole."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ScanIndex:
+    """
+    SQLite-backed scan index with an in-memory mirror for fast lookups.
+
+    Reads are served from memory; writes are buffered and committed in a
+    single transaction by flush().
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = str(db_path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                language TEXT
+            );
+            CREATE TABLE IF NOT EXISTS stage_results (
+                path TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                result TEXT,
+                PRIMARY KEY (path, stage)
+            );
+            CREATE TABLE IF NOT EXISTS run_results (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                result TEXT,
+                updated_at REAL
+            );
+        """)
+        self._entries: Dict[str, IndexEntry] = {}
+        self._stages: Dict[str, Dict[str, tuple]] = {}  # path -> stage -> (content_hash, result)
+        self._dirty_entries: Dict[str, IndexEntry] = {}
+        self._dirty_stages: Dict[tuple, tuple] = {}
+        self._deleted: set = set()
+        self._load()
+
+    def _load(self):
+        with self._lock:
+            for path, mtime_ns, size, content_hash, language in self._conn.execute(
+                "SELECT path, mtime_ns, size, content_hash, language FROM files"
+            ):
+                self._entries[path] = IndexEntry(path, mtime_ns, size, content_hash, language or "")
+            for path, stage, content_hash, result in self._conn.execute(
+                "SELECT path, stage, content_hash, result FROM stage_results"
+            ):
+                self._stages.setdefault(path, {})[stage] = (content_hash, json.loads(result) if result else None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, path: str) -> Optional[IndexEntry]:
+        return self._entries.get(str(path))
+
+    def refresh(self, files: Iterable[Any], hint_paths: Optional[Iterable[str]] = None) -> List[Any]:
+        """
+        Reconcile discovered files against the index and return the changed ones.
+
+        A file is unchanged when its (mtime, size) match the stored entry, or
+        when its stat changed but the content hash did not. With hint_paths
+        (e.g. from the file watcher) only hinted and never-seen files are
+        re-checked; everything else is trusted from the index.
+        """
+        hints = {str(p) for p in hint_paths} if hint_paths is not None else None
+        changed = []
+        seen = set()
+        with self._lock:
+            for file in files:
+                path = str(file.path)
+                seen.add(path)
+                entry = self._entries.get(path)
+                if hints is not None and entry is not None and path not in hints:
+                    continue
+                language = getattr(file, "language", "") or ""
+
+                if path.startswith("bytebot://"):
+                    # Container files cannot be stat'ed from the host; size is the only cheap signal
+                    size = getattr(file, "size_bytes", None) or getattr(file, "size", 0) or 0
+                    if entry is not None and entry.size == size:
+                        continue
+                    self._put_entry(IndexEntry(path, 0, size, "", language))
+                    changed.append(file)
+                    continue
+
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                    continue
+                try:
+                    content_hash = hash_file(path)
+                except OSError:
+                    continue
+                if entry is not None and entry.content_hash == content_hash:
+                    # Touched but identical: keep stage results, only refresh the stat
+                    self._put_entry(IndexEntry(path, st.st_mtime_ns, st.st_size, content_hash, language))
+                    continue
+                self._put_entry(IndexEntry(path, st.st_mtime_ns, st.st_size, content_hash, language))
+                changed.append(file)
+
+            if hints is None:
+                for path in list(self._entries.keys()):
+                    if path not in seen:
+                        self._remove(path)
+        return changed
+
+    def note_content(self, path: str, content: str):
+        """Record the hash of content read through a non-stat'able channel (ByteBot)."""
+        path = str(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return
+            content_hash = hash_bytes(content.encode("utf-8", errors="ignore"))
+            if entry.content_hash != content_hash:
+                self._put_entry(IndexEntry(path, entry.mtime_ns, entry.size, content_hash, entry.language))
+
+    def get_stage(self, path: str, stage: str) -> Optional[Any]:
+        """Return the stored result of a stage if it was computed for the current content."""
+        path = str(path)
+        entry = self._entries.get(path)
+        if entry is None or not entry.content_hash:
+            return None
+        stored = self._stages.get(path, {}).get(stage)
+        if stored is None or stored[0] != entry.content_hash:
+            return None
+        return stored[1]
+
+    def has_stage(self, path: str, stage: str) -> bool:
+        path = str(path)
+        entry = self._entries.get(path)
+        stored = self._stages.get(path, {}).get(stage)
+        return bool(entry and entry.content_hash and stored and stored[0] == entry.content_hash)
+
+    def set_stage(self, path: str, stage: str, result: Any):
+        path = str(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or not entry.content_hash:
+                return
+            value = (entry.content_hash, result)
+            self._stages.setdefault(path, {})[stage] = value
+            self._dirty_stages[(path, stage)] = value
+
+    def fingerprint(self, paths: Iterable[str]) -> str:
+        """Hash of the current content hashes of a file set (order independent)."""
+        digest = hashlib.sha1()
+        for path in sorted(str(p) for p in paths):
+            entry = self._entries.get(path)
+            digest.update(path.encode("utf-8", errors="ignore"))
+            digest.update(((entry.content_hash or str(entry.size)) if entry else "-").encode())
+        return digest.hexdigest()
+
+    def get_run_result(self, key: str, fingerprint: str) -> Optional[Any]:
+        """Return a whole-run result (e.g. the knowledge graph) stored for this fingerprint."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, result FROM run_results WHERE key = ?", (key,)
+            ).fetchone()
+        if not row or row[0] != fingerprint or row[1] is None:
+            return None
+        return json.loads(row[1])
+
+    def set_run_result(self, key: str, fingerprint: str, result: Any):
+        try:
+            payload = json.dumps(result, default=str)
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO run_results (key, fingerprint, result, updated_at) VALUES (?, ?, ?, ?)",
+                (key, fingerprint, payload, time.time())
+            )
+            self._conn.commit()
+
+    def flush(self):
+        """Commit buffered entry and stage updates in one transaction."""
+        with self._lock:
+            if not (self._dirty_entries or self._dirty_stages or self._deleted):
+                return
+            with self._conn:
+                if self._deleted:
+                    self._conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in self._deleted])
+                    self._conn.executemany("DELETE FROM stage_results WHERE path = ?", [(p,) for p in self._deleted])
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO files (path, mtime_ns, size, content_hash, language) VALUES (?, ?, ?, ?, ?)",
+                    [(e.path, e.mtime_ns, e.size, e.content_hash, e.language) for e in self._dirty_entries.values()]
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO stage_results (path, stage, content_hash, result) VALUES (?, ?, ?, ?)",
+                    [(p, s, h, json.dumps(r, default=str)) for (p, s), (h, r) in self._dirty_stages.items()]
+                )
+            self._dirty_entries.clear()
+            self._dirty_stages.clear()
+            self._deleted.clear()
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def _put_entry(self, entry: IndexEntry):
+        self._entries[entry.path] = entry
+        self._dirty_entries[entry.path] = entry
+        self._deleted.discard(entry.path)
+
+    def _remove(self, path: str):
+        self._entries.pop(path, None)
+        self._dirty_entries.pop(path, None)
+        for stage in self._stages.pop(path, {}):
+            self._dirty_stages.pop((path, stage), None)
+        self._deleted.add(path)
@@ -0,0 +1,186 @@
+"""
+Search Cache — TTL + LRU caching for expensive lookups.
+
+TTLCache is a small in-memory LRU whose entries also expire after a TTL.
+SearchCache layers an optional SQLite tier under it so cached web search
+results survive restarts, and keys entries by (normalized query, provider,
+deep flag). Both keep hit/miss counters for the status endpoint.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Size-bounded LRU whose entries expire ttl seconds after being stored."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600.0):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float = None, expires_at: float = None):
+        with self._lock:
+            if expires_at is None:
+                expires_at = time.time() + (self.ttl if ttl is None else ttl)
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+            return default if entry is _MISSING else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] >= time.time()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query."""
+    return re.sub(r"\s+", " ", (query or "").strip().lower())
+
+
+class SearchCache:
+    """
+    Two-tier cache for web search results.
+
+    Memory tier: TTLCache. Disk tier (optional): SQLite table of JSON payloads
+    with an absolute expiry, consulted on a memory miss and promoted on hit.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 6 * 3600.0, disk_path: Optional[str] = None):
+        self.memory = TTLCache(max_entries=max_entries, ttl=ttl)
+        self.ttl = ttl
+        self.disk_hits = 0
+        self._conn = None
+        self._lock = threading.Lock()
+        if disk_path:
+            try:
+                self._conn = sqlite3.connect(str(disk_path), check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS search_cache (
+                        key TEXT PRIMARY KEY,
+                        expires_at REAL NOT NULL,
+                        payload TEXT NOT NULL
+                    )
+                """)
+                self._conn.execute("DELETE FROM search_cache WHERE expires_at < ?", (time.time(),))
+                self._conn.commit()
+            except Exception as e:
+                print(f"⚠️ Search cache disk tier unavailable: {e}")
+                self._conn = None
+
+    @staticmethod
+    def make_key(query: str, provider: str, deep: bool = False) -> Tuple[str, str, bool]:
+        return (normalize_query(query), provider, bool(deep))
+
+    def get(self, query: str, provider: str, deep: bool = False) -> Optional[Any]:
+        key = self.make_key(query, provider, deep)
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, payload FROM search_cache WHERE key = ?", (json.dumps(key),)
+            ).fetchone()
+        if not row or row[0] < time.time():
+            return None
+        value = json.loads(row[1])
+        self.disk_hits += 1
+        self.memory.set(key, value, expires_at=row[0])
+        return value
+
+    def set(self, query: str, provider: str, deep: bool, value: Any, ttl: float = None):
+        key = self.make_key(query, provider, deep)
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self.memory.set(key, value, expires_at=expires_at)
+        if self._conn is None:
+            return
+        try:
+            payload = json.dumps(value, default=str)
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, expires_at, payload) VALUES (?, ?, ?)",
+                (json.dumps(key), expires_at, payload)
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        stats["disk_hits"] = self.disk_hits
+        stats["disk_enabled"] = self._conn is not None
+        return stats
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def default_search_cache(default_disk_path: Optional[str] = None) -> SearchCache:
+    """SearchCache configured from ASIREM_SEARCH_CACHE_* (set ASIREM_SEARCH_CACHE_DB=off for memory only)."""
+    disk_path = os.getenv("ASIREM_SEARCH_CACHE_DB", default_disk_path or "")
+    if disk_path.lower() in ("off", "none", "0"):
+        disk_path = ""
+    return SearchCache(
+        max_entries=int(os.getenv("ASIREM_SEARCH_CACHE_SIZE", "512")),
+        ttl=float(os.getenv("ASIREM_SEARCH_CACHE_TTL", str(6 * 3600))),
+        disk_path=disk_path or None,
+    )
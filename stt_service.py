@@ -0,0 +1,272 @@
+"""
+STT Service — pooled, asynchronous Whisper transcription.
+
+One Whisper model is shared by a pool of worker threads. faster-whisper
+runs concurrent transcribe() calls in parallel when the model is built with
+num_workers, and cpu_threads is split across the pool so it never asks for
+more threads than there are cores. openai-whisper is not safe to call
+concurrently, so with it the pool has a single worker.
+
+Requests are decoded to 16 kHz PCM off the event loop and wait in a bounded
+asyncio queue. Each worker slot takes one request at a time, so concurrent
+speakers are transcribed in parallel up to the pool size. Long clips go
+through faster-whisper's BatchedInferencePipeline when it is available,
+which batches the clip's 30 s windows through the encoder; short clips fit
+in one window and use the plain model.
+
+Segments are streamed as `transcribe` yields them: each one is published as
+an "stt_partial" event through `on_event` (the WebSocket broadcast) and the
+complete transcript as "stt_final". metrics() reports queue depth, in-flight
+work and the real-time factor (processing seconds per second of audio).
+"""
+
+import asyncio
+import io
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+SAMPLE_RATE = 16000
+
+
+@dataclass
+class STTJob:
+    request_id: str
+    audio: Any                 # float32 PCM at SAMPLE_RATE, or a file-like object if it could not be decoded
+    duration: float            # seconds of audio (0.0 when unknown)
+    language: Optional[str]
+    future: asyncio.Future
+    queued: float = field(default_factory=time.monotonic)
+
+
+def _field(obj: Any, name: str, default: Any = None) -> Any:
+    """Read a field from a faster-whisper object or an openai-whisper dict."""
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+class STTService:
+    """Whisper transcription behind an asyncio queue and a thread pool."""
+
+    def __init__(self, model_name: str = "base", workers: Optional[int] = None,
+                 on_event: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None,
+                 short_clip_seconds: float = 30.0, batch_size: int = 8,
+                 max_queue: int = 64, compute_type: str = "int8"):
+        cores = os.cpu_count() or 1
+        self.model_name = model_name
+        self.workers = max(1, workers or max(1, cores // 2))
+        self.cpu_threads = max(1, cores // self.workers)
+        self.on_event = on_event
+        self.short_clip_seconds = short_clip_seconds
+        self.batch_size = max(1, batch_size)
+        self.compute_type = compute_type
+        self.backend: Optional[str] = None
+        self.model = None
+        self._batched = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight = 0
+        # Only touched on the event loop thread; workers hand their numbers back with the result
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "segments": 0,
+                      "audio_seconds": 0.0, "processing_seconds": 0.0, "wait_seconds": 0.0}
+        self._last_rtf = 0.0
+
+    # -- lifecycle ----------------------------------------------------------
+
+    def _load_model(self):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            import whisper
+            self.backend = "openai-whisper"
+            self.workers = 1
+            self.cpu_threads = os.cpu_count() or 1
+            return whisper.load_model(self.model_name)
+        self.backend = "faster-whisper"
+        model = WhisperModel(self.model_name, device="cpu", compute_type=self.compute_type,
+                             cpu_threads=self.cpu_threads, num_workers=self.workers)
+        try:
+            from faster_whisper import BatchedInferencePipeline
+            self._batched = BatchedInferencePipeline(model=model)
+        except ImportError:
+            self._batched = None
+        return model
+
+    async def start(self):
+        """Load the model off the event loop and start the worker slots."""
+        if self.model is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self.model = await asyncio.to_thread(self._load_model)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="asirem-stt")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            if not job.future.done():
+                job.future.set_exception(RuntimeError("STT service stopped"))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # -- requests -----------------------------------------------------------
+
+    @staticmethod
+    def _decode(data: bytes):
+        """Decode an uploaded blob (webm/ogg/wav/...) to mono float32 PCM and its duration."""
+        try:
+            from faster_whisper import decode_audio
+            audio = decode_audio(io.BytesIO(data), sampling_rate=SAMPLE_RATE)
+            return audio, len(audio) / SAMPLE_RATE
+        except ImportError:
+            pass
+        try:
+            import whisper
+        except ImportError:
+            return io.BytesIO(data), 0.0
+        with tempfile.NamedTemporaryFile(suffix=".audio") as tmp:
+            tmp.write(data)
+            tmp.flush()
+            audio = whisper.load_audio(tmp.name)
+        return audio, len(audio) / SAMPLE_RATE
+
+    async def transcribe(self, data: bytes, request_id: Optional[str] = None,
+                         language: Optional[str] = None) -> Dict[str, Any]:
+        """Queue an audio blob and wait for its transcript; partial segments are broadcast meanwhile."""
+        if self.model is None:
+            raise RuntimeError("STT service not started")
+        audio, duration = await asyncio.to_thread(self._decode, data)
+        job = STTJob(request_id or uuid.uuid4().hex[:12], audio, duration, language,
+                     asyncio.get_running_loop().create_future())
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            raise RuntimeError("STT queue is full, try again shortly")
+        self.stats["submitted"] += 1
+        return await job.future
+
+    def _is_short(self, job: STTJob) -> bool:
+        return 0.0 < job.duration <= self.short_clip_seconds
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            started = time.monotonic()
+            self.stats["wait_seconds"] += started - job.queued
+            self._in_flight += 1
+            try:
+                result = await loop.run_in_executor(self._executor, self._run_job, job, started)
+            except Exception as e:
+                self.stats["failed"] += 1
+                print(f"⚠️ STT transcription failed: {e}")
+                if not job.future.done():
+                    job.future.set_exception(e)
+                continue
+            finally:
+                self._in_flight -= 1
+            self.stats["completed"] += 1
+            self.stats["segments"] += len(result["segments"])
+            if result["rtf"] is not None:
+                self._last_rtf = result["rtf"]
+                self.stats["audio_seconds"] += result["duration"]
+                self.stats["processing_seconds"] += result["processing"]
+            await self._emit("stt_final", {k: v for k, v in result.items() if k != "segments"})
+            if not job.future.done():
+                job.future.set_result(result)
+
+    async def _emit(self, event_type: str, data: Dict[str, Any]):
+        if self.on_event is not None:
+            try:
+                await self.on_event(event_type, data)
+            except Exception:
+                pass
+
+    # -- worker threads -----------------------------------------------------
+
+    def _publish(self, event_type: str, data: Dict[str, Any]):
+        if self.on_event is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(
+                lambda: asyncio.ensure_future(self._emit(event_type, data)))
+
+    def _segments(self, job: STTJob):
+        """Yield segments as the model produces them, plus the detected language."""
+        if self.backend == "openai-whisper":
+            result = self.model.transcribe(job.audio, language=job.language)
+            return result.get("segments", []), result.get("language")
+        if self._batched is not None and not self._is_short(job):
+            segments, info = self._batched.transcribe(job.audio, language=job.language, batch_size=self.batch_size)
+        else:
+            segments, info = self.model.transcribe(job.audio, language=job.language, beam_size=1)
+        return segments, _field(info, "language")
+
+    def _run_job(self, job: STTJob, started: float) -> Dict[str, Any]:
+        segments, language = self._segments(job)
+        parts = []
+        for index, segment in enumerate(segments):
+            part = {
+                "request_id": job.request_id,
+                "index": index,
+                "start": round(float(_field(segment, "start", 0.0)), 2),
+                "end": round(float(_field(segment, "end", 0.0)), 2),
+                "text": (_field(segment, "text", "") or "").strip(),
+            }
+            parts.append(part)
+            self._publish("stt_partial", part)
+        elapsed = time.monotonic() - started
+        duration = job.duration or (parts[-1]["end"] if parts else 0.0)
+        return {
+            "request_id": job.request_id,
+            "text": " ".join(p["text"] for p in parts if p["text"]),
+            "segments": parts,
+            "language": language,
+            "duration": round(duration, 2),
+            "processing": round(elapsed, 3),
+            "waited": round(started - job.queued, 3),
+            "rtf": round(elapsed / duration, 3) if duration else None,
+        }
+
+    # -- metrics ------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Any]:
+        stats = self.stats
+        done = stats["completed"] + stats["failed"]
+        return {
+            "backend": self.backend,
+            "model": self.model_name,
+            "workers": self.workers,
+            "cpu_threads": self.cpu_threads,
+            "batched_pipeline": self._batched is not None,
+            "queue_depth": self._queue.qsize(),
+            "in_flight": self._in_flight,
+            "rtf": round(stats["processing_seconds"] / stats["audio_seconds"], 3) if stats["audio_seconds"] else None,
+            "last_rtf": self._last_rtf or None,
+            "avg_wait": round(stats["wait_seconds"] / done, 3) if done else 0.0,
+            **{k: round(v, 2) if isinstance(v, float) else v for k, v in stats.items()},
+        }
+
+
+def create_stt_service(on_event=None) -> STTService:
+    """STTService configured from ASIREM_STT_* environment variables."""
+    workers = os.getenv("ASIREM_STT_WORKERS")
+    return STTService(
+        os.getenv("ASIREM_STT_MODEL", "base"),
+        workers=int(workers) if workers else None,
+        on_event=on_event,
+        short_clip_seconds=float(os.getenv("ASIREM_STT_SHORT_SECONDS", "30")),
+        batch_size=int(os.getenv("ASIREM_STT_BATCH_SIZE", "8")),
+        max_queue=int(os.getenv("ASIREM_STT_QUEUE", "64")),
+    )
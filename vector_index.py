@@ -0,0 +1,322 @@
+"""
+Vector Index — long-lived in-process nearest-neighbour index.
+
+Vectors live in one growable float32 matrix (rows L2-normalized, so inner
+product == cosine). Small collections are searched exactly with a single
+matrix-vector product and argpartition. Past `ann_threshold` live vectors an
+approximate structure takes over:
+
+- hnsw: hnswlib graph, when hnswlib is installed
+- ivf:  NumPy inverted file (k-means coarse quantizer, nprobe lists scanned)
+
+Adds are incremental and deletes are tombstones (compact() reclaims them).
+save()/load() snapshot to a directory with np.save; load() memory-maps the
+matrix so a restart does not copy it until the first write. Metadata should
+stay small (ids, paths, hashes); document text belongs in a separate store
+(see document_store.py).
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import hnswlib
+    HNSWLIB_OK = True
+except ImportError:
+    HNSWLIB_OK = False
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    idx = np.argpartition(-scores, k - 1)[:k] if k < scores.shape[0] else np.arange(scores.shape[0])
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+class _IVF:
+    """Coarse k-means quantizer with per-centroid row lists."""
+
+    def __init__(self, vectors: np.ndarray, rows: np.ndarray, nlist: int, iterations: int = 8, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        sample = rows if len(rows) <= nlist * 64 else rng.choice(rows, nlist * 64, replace=False)
+        data = vectors[sample]
+        self.centroids = data[rng.choice(len(data), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(data @ self.centroids.T, axis=1)
+            for c in range(nlist):
+                members = data[assign == c]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    self.centroids[c] = centroid / norm if norm > 0 else centroid
+        self.lists: List[List[int]] = [[] for _ in range(nlist)]
+        self._arrays: List[Optional[np.ndarray]] = [None] * nlist
+        self.trained_size = len(rows)
+        self.add(vectors[rows], rows)
+
+    def add(self, vectors: np.ndarray, rows: Sequence[int]):
+        assign = np.argmax(vectors @ self.centroids.T, axis=1)
+        for row, c in zip(rows, assign):
+            self.lists[c].append(int(row))
+            self._arrays[c] = None
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        probe = _top_k(self.centroids @ query, nprobe)
+        parts = []
+        for c in probe:
+            if self._arrays[c] is None:
+                self._arrays[c] = np.asarray(self.lists[c], dtype=np.int64)
+            parts.append(self._arrays[c])
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+
+class VectorIndex:
+    """Cosine top-k index with string ids, metadata, tombstones and snapshots."""
+
+    def __init__(self, dim: int, ann: str = "auto", ann_threshold: int = 50_000,
+                 nprobe: int = 8, hnsw_m: int = 16, hnsw_ef: int = 64):
+        self.dim = dim
+        self.ann = ann  # auto | flat | hnsw | ivf
+        self.ann_threshold = ann_threshold
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef = hnsw_ef
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()  # one snapshot writer at a time; never blocks search/add
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0  # rows used (live + tombstoned)
+        self._ids: List[Optional[str]] = []
+        self._row_of: Dict[str, int] = {}
+        self.metadata: Dict[str, Dict[str, Any]] = {}
+        self._hnsw = None
+        self._ivf: Optional[_IVF] = None
+
+    # ------------------------------------------------------------------ size
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._row_of
+
+    def _ensure_capacity(self, extra: int):
+        needed = self._size + extra
+        if needed <= self._vectors.shape[0] and self._vectors.flags.writeable:
+            return
+        capacity = max(needed, int(self._vectors.shape[0] * 1.5) + 1024)
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[:self._size] = self._vectors[:self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._vectors, self._alive = grown, alive
+
+    def _mode(self) -> str:
+        if self.ann in ("flat", "hnsw", "ivf"):
+            return self.ann
+        if len(self._row_of) < self.ann_threshold:
+            return "flat"
+        return "hnsw" if HNSWLIB_OK else "ivf"
+
+    # ------------------------------------------------------------------ writes
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray, metadata: Optional[Sequence[Dict[str, Any]]] = None):
+        """Insert or replace vectors by id."""
+        vectors = _normalize(vectors)
+        if vectors.shape != (len(ids), self.dim):
+            raise ValueError(f"Expected {len(ids)} vectors of dim {self.dim}, got {vectors.shape}")
+        last = {doc_id: pos for pos, doc_id in enumerate(ids)}
+        if len(last) != len(ids):
+            # Same id twice in one batch: the later vector wins
+            keep = sorted(last.values())
+            ids = [ids[p] for p in keep]
+            vectors = vectors[keep]
+            metadata = [metadata[p] for p in keep] if metadata is not None else None
+        with self._lock:
+            self.delete([i for i in ids if i in self._row_of])
+            self._ensure_capacity(len(ids))
+            start = self._size
+            rows = np.arange(start, start + len(ids))
+            self._vectors[start:start + len(ids)] = vectors
+            self._alive[start:start + len(ids)] = True
+            self._size += len(ids)
+            for offset, doc_id in enumerate(ids):
+                self._ids.append(doc_id)
+                self._row_of[doc_id] = start + offset
+                if metadata is not None:
+                    self.metadata[doc_id] = dict(metadata[offset] or {})
+            if self._hnsw is not None:
+                self._hnsw_add(vectors, rows)
+            if self._ivf is not None:
+                self._ivf.add(vectors, rows)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for doc_id in ids:
+                row = self._row_of.pop(doc_id, None)
+                if row is None:
+                    continue
+                self._alive[row] = False
+                self._ids[row] = None
+                self.metadata.pop(doc_id, None)
+                if self._hnsw is not None:
+                    try:
+                        self._hnsw.mark_deleted(row)
+                    except RuntimeError:
+                        pass
+                removed += 1
+        return removed
+
+    def compact(self):
+        """Drop tombstoned rows and rebuild any ANN structure."""
+        with self._lock:
+            live = np.flatnonzero(self._alive[:self._size])
+            ids = [self._ids[r] for r in live]
+            vectors = self._vectors[live].copy()
+            self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+            self._alive = np.zeros(0, dtype=bool)
+            self._size = 0
+            self._ids, self._row_of = [], {}
+            self._hnsw = self._ivf = None
+            metadata = self.metadata
+            self.metadata = {}
+            self.add(ids, vectors, [metadata.get(i, {}) for i in ids])
+
+    # ------------------------------------------------------------------ ANN
+
+    def _hnsw_add(self, vectors: np.ndarray, rows: np.ndarray):
+        if self._hnsw.get_current_count() + len(rows) > self._hnsw.get_max_elements():
+            self._hnsw.resize_index(max(self._hnsw.get_max_elements() * 2, self._hnsw.get_current_count() + len(rows)))
+        self._hnsw.add_items(vectors, rows)
+
+    def _build_ann(self, mode: str):
+        live = np.flatnonzero(self._alive[:self._size])
+        if mode == "hnsw" and self._hnsw is None:
+            index = hnswlib.Index(space="ip", dim=self.dim)
+            index.init_index(max_elements=max(1024, len(live) * 2), ef_construction=200, M=self.hnsw_m)
+            index.set_ef(max(self.hnsw_ef, 2 * self.nprobe))
+            self._hnsw = index
+            if len(live):
+                self._hnsw_add(self._vectors[live], live)
+        elif mode == "ivf" and (self._ivf is None or len(live) > 2 * self._ivf.trained_size):
+            nlist = max(1, int(np.sqrt(len(live))))
+            self._ivf = _IVF(self._vectors, live, nlist)
+
+    # ------------------------------------------------------------------ reads
+
+    def search(self, query: np.ndarray, k: int = 10,
+               filter_fn: Optional[Callable[[str, Dict[str, Any]], bool]] = None) -> List[Tuple[str, float]]:
+        """Return up to k (id, cosine score) pairs, best first."""
+        q = _normalize(query)[0]
+        with self._lock:
+            if not self._row_of:
+                return []
+            mode = self._mode()
+            # Over-fetch when filtering so filtered-out hits do not starve the result
+            fetch = k if filter_fn is None else min(len(self._row_of), max(k * 4, k + 32))
+            if mode == "flat":
+                scores = self._vectors[:self._size] @ q
+                scores[~self._alive[:self._size]] = -np.inf
+                rows = _top_k(scores, fetch)
+                pairs = [(int(r), float(scores[r])) for r in rows if np.isfinite(scores[r])]
+            else:
+                self._build_ann(mode)
+                if mode == "hnsw":
+                    labels, distances = self._hnsw.knn_query(q, k=min(fetch, len(self._row_of)))
+                    pairs = [(int(r), 1.0 - float(d)) for r, d in zip(labels[0], distances[0])]
+                else:
+                    candidates = self._ivf.candidates(q, self.nprobe)
+                    candidates = candidates[self._alive[candidates]]
+                    scores = self._vectors[candidates] @ q
+                    order = _top_k(scores, fetch)
+                    pairs = [(int(candidates[i]), float(scores[i])) for i in order]
+
+            results = []
+            for row, score in pairs:
+                doc_id = self._ids[row]
+                if doc_id is None:
+                    continue
+                if filter_fn is not None and not filter_fn(doc_id, self.metadata.get(doc_id, {})):
+                    continue
+                results.append((doc_id, score))
+                if len(results) >= k:
+                    break
+            return results
+
+    def get_vector(self, doc_id: str) -> Optional[np.ndarray]:
+        row = self._row_of.get(doc_id)
+        return None if row is None else np.array(self._vectors[row])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "vectors": len(self._row_of),
+            "tombstones": self._size - len(self._row_of),
+            "dim": self.dim,
+            "mode": self._mode(),
+            "bytes": int(self._size * self.dim * 4),
+        }
+
+    # ------------------------------------------------------------------ snapshots
+
+    def save(self, directory: str):
+        """
+        Snapshot live vectors, ids and metadata (tombstones are dropped).
+
+        Only the copy is taken under the lock; files are written after it is
+        released. Each snapshot writes a new vectors-<stamp>.npy, then
+        atomically replaces index.json, which names that file. A reader
+        therefore always sees a matching pair. Older matrices are removed
+        afterwards.
+        """
+        with self._save_lock:
+            os.makedirs(directory, exist_ok=True)
+            with self._lock:
+                live = np.flatnonzero(self._alive[:self._size])
+                vectors = self._vectors[live]  # fancy indexing copies
+                ids = [self._ids[r] for r in live]
+                metadata = {i: self.metadata.get(i, {}) for i in ids}
+            vectors_name = f"vectors-{time.time_ns():x}.npy"
+            tmp = os.path.join(directory, vectors_name + ".tmp")
+            with open(tmp, "wb") as f:
+                np.save(f, vectors)
+            os.replace(tmp, os.path.join(directory, vectors_name))
+            with open(os.path.join(directory, "index.json.tmp"), "w") as f:
+                json.dump({"dim": self.dim, "vectors": vectors_name, "ids": ids, "metadata": metadata}, f)
+            os.replace(os.path.join(directory, "index.json.tmp"), os.path.join(directory, "index.json"))
+            for old in glob.glob(os.path.join(directory, "vectors*.npy")):
+                if os.path.basename(old) != vectors_name:
+                    try:
+                        os.remove(old)  # a memory-mapped old matrix stays readable until unmapped
+                    except OSError:
+                        pass
+
+    @classmethod
+    def load(cls, directory: str, **kwargs) -> "VectorIndex":
+        """Restore a snapshot; the matrix is memory-mapped until the first write."""
+        with open(os.path.join(directory, "index.json")) as f:
+            state = json.load(f)
+        vectors = np.load(os.path.join(directory, state.get("vectors", "vectors.npy")), mmap_mode="r")
+        index = cls(state["dim"], **kwargs)
+        index._vectors = vectors
+        index._size = vectors.shape[0]
+        index._alive = np.ones(index._size, dtype=bool)
+        index._ids = list(state["ids"])
+        index._row_of = {doc_id: row for row, doc_id in enumerate(index._ids)}
+        index.metadata = state.get("metadata", {})
+        return index
@@ -0,0 +1,168 @@
+"""
+WebSocket Fan-out — per-client bounded outbound queues.
+
+Every dashboard connection gets its own queue and writer task, so emitting
+an event is a non-blocking enqueue and a slow tab only ever delays itself.
+When a queue is full the configured overflow policy applies:
+
+- drop_oldest: discard the oldest queued message
+- coalesce:    replace a queued progress event of the same kind in place,
+               falling back to drop_oldest for everything else
+- disconnect:  close the lagging client
+
+Messages are serialized once per broadcast (orjson when installed) and the
+same encoded text frame is queued for every client.
+"""
+
+import asyncio
+import json
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_json_encoder = json.JSONEncoder(default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+def encode_message(message: Any) -> str:
+    """Serialize a broadcast message to a JSON text frame."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(message, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return _json_encoder.encode(message)
+
+
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+# High-frequency events where only the latest value per agent matters
+COALESCE_EVENTS = {
+    "scan_progress",
+    "classification_progress",
+    "extraction_progress",
+    "metrics_updated",
+    "heartbeat",
+}
+
+
+def coalesce_key(message: Dict[str, Any]) -> Optional[tuple]:
+    """Key under which queued copies of a progress event replace each other."""
+    event_type = message.get("type")
+    if event_type not in COALESCE_EVENTS:
+        return None
+    data = message.get("data")
+    agent_id = data.get("agent_id") if isinstance(data, dict) else None
+    return (event_type, agent_id)
+
+
+class ClientChannel:
+    """Bounded outbound queue plus writer task for one WebSocket client."""
+
+    def __init__(self, ws, max_queue: int = 256, policy: str = "coalesce",
+                 on_close: Optional[Callable[["ClientChannel"], None]] = None):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}' (expected one of {OVERFLOW_POLICIES})")
+        self.ws = ws
+        self.max_queue = max(1, max_queue)
+        self.policy = policy
+        self.on_close = on_close
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self._queue: deque = deque()  # entries are [coalesce_key, encoded_payload]
+        self._pending: Dict[tuple, list] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._writer())
+        return self
+
+    def offer(self, message: Dict[str, Any]) -> bool:
+        """Encode and enqueue a single message (use offer_encoded when fanning out)."""
+        return self.offer_encoded(encode_message(message), coalesce_key(message))
+
+    def offer_encoded(self, payload: str, key: Optional[tuple] = None) -> bool:
+        """Enqueue a pre-encoded frame without blocking. Returns False once the client is gone."""
+        if self.closed:
+            return False
+        if self.policy != "coalesce":
+            key = None
+        if key is not None:
+            entry = self._pending.get(key)
+            if entry is not None:
+                entry[1] = payload
+                self.coalesced += 1
+                return True
+        if len(self._queue) >= self.max_queue:
+            if self.policy == "disconnect":
+                print(f"⚠️ WebSocket client lagging ({len(self._queue)} queued) - disconnecting")
+                self.close(message=b"send queue overflow")
+                return False
+            self._drop_oldest()
+        entry = [key, payload]
+        self._queue.append(entry)
+        if key is not None:
+            self._pending[key] = entry
+        self._wakeup.set()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._queue),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "policy": self.policy,
+        }
+
+    def close(self, message: bytes = b""):
+        """Stop the writer and close the socket; message is the close frame's reason."""
+        if self.closed:
+            return
+        self.closed = True
+        self._wakeup.set()
+        if self._task and not self._task.done() and self._task is not asyncio.current_task():
+            self._task.cancel()
+        if not getattr(self.ws, "closed", True):
+            asyncio.create_task(self._close_ws(message))
+
+    def _drop_oldest(self):
+        key, _ = entry = self._queue.popleft()
+        if key is not None and self._pending.get(key) is entry:
+            del self._pending[key]
+        self.dropped += 1
+
+    async def _close_ws(self, message: bytes):
+        try:
+            await self.ws.close(message=message)
+        except Exception:
+            pass
+
+    async def _writer(self):
+        try:
+            while not self.closed:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                entry = self._queue.popleft()
+                key, payload = entry
+                if key is not None and self._pending.get(key) is entry:
+                    del self._pending[key]
+                await self.ws.send_str(payload)
+                self.sent += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # Send failed: the socket is dead, the handler will clean up
+            pass
+        finally:
+            self.closed = True
+            self._queue.clear()
+            self._pending.clear()
+            if self.on_close:
+                self.on_close(self)